@@ -1,114 +1,214 @@
 // Cannabis Legislation Tracker - Progressive Enhancement Version
 // Works with pre-rendered HTML, adds filtering and sorting functionality
 
-let allBillCards = [];
+// Milliseconds of quiet typing before the search box re-filters
+const SEARCH_DEBOUNCE_MS = 150;
+
+// search-index.json sits next to app.js, also when app.js is loaded from a page/state shard
+const APP_SCRIPT_URL = document.currentScript.src;
+const SEARCH_INDEX_URL = new URL('search-index.json', APP_SCRIPT_URL).href;
+
+// One entry per pre-rendered card, with sort keys parsed once at init
+let billEntries = [];
+let entriesById = new Map();
+let renderedEntries = [];
+let searchIndex = null;
+let searchIndexReady = Promise.resolve(null);
+let virtualList = null;
+
+const collator = new Intl.Collator();
 
 // Initialize the app when DOM is ready
 document.addEventListener('DOMContentLoaded', () => {
     // Get all pre-rendered bill cards
-    allBillCards = Array.from(document.querySelectorAll('.bill-card'));
-    
+    billEntries = Array.from(document.querySelectorAll('.bill-card'), createEntry);
+    entriesById = new Map(billEntries.map(entry => [entry.id, entry]));
+    renderedEntries = billEntries;
+
     // Setup event listeners for filters
     setupEventListeners();
-    
-    console.log(`✅ Tracker initialized with ${allBillCards.length} pre-rendered bills`);
+
+    console.log(`✅ Tracker initialized with ${billEntries.length} pre-rendered bills`);
+
+    // Until the index arrives (or if it is missing), filtering falls back to scanning card text
+    if (typeof SearchIndex !== 'undefined') {
+        searchIndexReady = SearchIndex.load(SEARCH_INDEX_URL)
+            .then(index => {
+                searchIndex = index;
+                console.log(`✅ Search index loaded with ${index.size} bills and ${index.tokens.length} tokens`);
+                return index;
+            })
+            .catch(error => {
+                console.warn('Search index unavailable, using text search:', error);
+                return null;
+            });
+    }
+
+    // Virtual mode: only the first cards are pre-rendered, the rest come from the card payload
+    const container = document.getElementById('billsContainer');
+    if (container.dataset.virtual) {
+        startVirtualList(container)
+            .catch(error => console.warn('Virtual list unavailable, showing pre-rendered bills only:', error));
+    }
+
+    // ?bench loads the filter/sort benchmark harness
+    if (new URLSearchParams(window.location.search).has('bench')) {
+        loadScript(new URL('benchmarks/filter_bench.js', APP_SCRIPT_URL).href);
+    }
 });
 
+function loadScript(src) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = () => reject(new Error(`Could not load ${src}`));
+        document.body.appendChild(script);
+    });
+}
+
+// Swap the pre-rendered cards for a windowed list over every bill in the payload
+async function startVirtualList(container) {
+    const payloadUrl = new URL(container.dataset.virtual, document.baseURI).href;
+    const [response] = await Promise.all([
+        fetch(payloadUrl),
+        loadScript(new URL('virtual.js', APP_SCRIPT_URL).href)
+    ]);
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status} loading ${payloadUrl}`);
+    }
+    const payload = await response.json();
+
+    // Reuse the pre-rendered cards so the first viewport is not rebuilt
+    const renderedCards = new Map(billEntries.map(entry => [entry.id, entry.card]));
+    billEntries = payloadRows(payload).map(row => {
+        const entry = entryFromRow(row);
+        entry.card = renderedCards.get(entry.id) || null;
+        return entry;
+    });
+    entriesById = new Map(billEntries.map(entry => [entry.id, entry]));
+
+    virtualList = new VirtualList(container);
+    renderedEntries = [];
+    applyFilters();
+
+    console.log(`✅ Virtual list enabled for ${billEntries.length} bills (${renderedCards.size} pre-rendered)`);
+}
+
+// Parse everything the filters and comparators need from a card once
+function createEntry(card) {
+    const numberEl = card.querySelector('.bill-number');
+    return {
+        card,
+        id: card.dataset.id,
+        stateCode: card.dataset.stateCode,
+        state: card.dataset.state,
+        status: card.dataset.status.toLowerCase(),
+        date: Date.parse(card.dataset.date) || 0,
+        number: numberEl ? numberEl.textContent : '',
+        text: null  // lowercased textContent, read lazily by the fallback search
+    };
+}
+
 // Setup event listeners for filters and search
 function setupEventListeners() {
     const searchInput = document.getElementById('searchInput');
     const stateFilter = document.getElementById('stateFilter');
     const statusFilter = document.getElementById('statusFilter');
     const sortOrder = document.getElementById('sortOrder');
-    
-    searchInput.addEventListener('input', applyFilters);
+
+    searchInput.addEventListener('input', debounce(applyFilters, SEARCH_DEBOUNCE_MS));
     stateFilter.addEventListener('change', applyFilters);
     statusFilter.addEventListener('change', applyFilters);
     sortOrder.addEventListener('change', applyFilters);
 }
 
-// Apply filters and sorting
-function applyFilters() {
-    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-    const stateFilter = document.getElementById('stateFilter').value;
-    const statusFilter = document.getElementById('statusFilter').value;
-    const sortOrder = document.getElementById('sortOrder').value;
-    
-    const billsContainer = document.getElementById('billsContainer');
-    const noResults = document.getElementById('noResults');
-    
-    // Filter bills
-    let visibleBills = allBillCards.filter(card => {
-        const cardText = card.textContent.toLowerCase();
-        const matchesSearch = cardText.includes(searchTerm);
-        
-        const stateCode = card.dataset.stateCode;
-        const stateName = card.dataset.state;
-        const matchesState = 
-            stateFilter === 'all' || 
-            (stateFilter === 'US' && stateCode === 'US') ||
-            stateName === stateFilter;
-        
-        const cardStatus = card.dataset.status.toLowerCase();
-        const matchesStatus = 
-            statusFilter === 'all' || 
-            cardStatus.includes(statusFilter);
-        
-        return matchesSearch && matchesState && matchesStatus;
-    });
-    
-    // Sort bills
-    switch (sortOrder) {
-        case 'recent':
-            visibleBills.sort((a, b) => {
-                const dateA = new Date(a.dataset.date || 0);
-                const dateB = new Date(b.dataset.date || 0);
-                return dateB - dateA;
-            });
-            break;
-        case 'oldest':
-            visibleBills.sort((a, b) => {
-                const dateA = new Date(a.dataset.date || 0);
-                const dateB = new Date(b.dataset.date || 0);
-                return dateA - dateB;
-            });
-            break;
-        case 'state':
-            visibleBills.sort((a, b) => {
-                const stateA = a.dataset.state;
-                const stateB = b.dataset.state;
-                if (stateA === stateB) {
-                    const dateA = new Date(a.dataset.date || 0);
-                    const dateB = new Date(b.dataset.date || 0);
-                    return dateB - dateA;
-                }
-                return stateA.localeCompare(stateB);
-            });
-            break;
-        case 'alphabetical':
-            visibleBills.sort((a, b) => {
-                const billA = a.querySelector('.bill-number').textContent;
-                const billB = b.querySelector('.bill-number').textContent;
-                return billA.localeCompare(billB);
-            });
-            break;
+function debounce(fn, wait) {
+    let timer = null;
+    return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), wait);
+    };
+}
+
+// Current values of the filter controls
+function readCriteria() {
+    return {
+        query: document.getElementById('searchInput').value.toLowerCase(),
+        state: document.getElementById('stateFilter').value,
+        status: document.getElementById('statusFilter').value,
+        sort: document.getElementById('sortOrder').value
+    };
+}
+
+// Entries matching the search, state and status filters
+function filterEntries({ query, state, status }) {
+    if (searchIndex) {
+        const matches = [];
+        for (const id of searchIndex.filter({ query, state, status })) {
+            const entry = entriesById.get(id);
+            if (entry) matches.push(entry);
+        }
+        return matches;
     }
-    
-    // Hide all cards first
-    allBillCards.forEach(card => {
-        card.style.display = 'none';
+
+    return billEntries.filter(entry => {
+        if (query) {
+            if (entry.text === null) entry.text = entry.card.textContent.toLowerCase();
+            if (!entry.text.includes(query)) return false;
+        }
+
+        const matchesState =
+            state === 'all' ||
+            (state === 'US' && entry.stateCode === 'US') ||
+            entry.state === state;
+
+        const matchesStatus =
+            status === 'all' ||
+            entry.status.includes(status);
+
+        return matchesState && matchesStatus;
     });
-    
-    // Show and reorder filtered bills
-    if (visibleBills.length === 0) {
-        noResults.style.display = 'block';
+}
+
+const COMPARATORS = {
+    recent: (a, b) => b.date - a.date,
+    oldest: (a, b) => a.date - b.date,
+    state: (a, b) => collator.compare(a.state, b.state) || b.date - a.date,
+    alphabetical: (a, b) => collator.compare(a.number, b.number)
+};
+
+// Sort entries in place using the precomputed keys
+function sortEntries(entries, order) {
+    const comparator = COMPARATORS[order];
+    if (comparator) entries.sort(comparator);
+    return entries;
+}
+
+// Replace the list in one DOM commit, skipped when nothing changed
+function renderEntries(entries) {
+    const noResults = document.getElementById('noResults');
+    noResults.style.display = entries.length === 0 ? 'block' : 'none';
+
+    if (entries.length === renderedEntries.length &&
+        entries.every((entry, i) => entry === renderedEntries[i])) {
+        return;
+    }
+
+    if (virtualList) {
+        virtualList.setEntries(entries);
     } else {
-        noResults.style.display = 'none';
-        
-        // Reorder visible bills
-        visibleBills.forEach(card => {
-            card.style.display = 'block';
-            billsContainer.appendChild(card); // Moves to end in new order
-        });
+        const fragment = document.createDocumentFragment();
+        for (const entry of entries) {
+            fragment.appendChild(entry.card);
+        }
+        document.getElementById('billsContainer').replaceChildren(fragment);
     }
+    renderedEntries = entries;
+}
+
+// Apply filters and sorting
+function applyFilters() {
+    const criteria = readCriteria();
+    renderEntries(sortEntries(filterEntries(criteria), criteria.sort));
 }
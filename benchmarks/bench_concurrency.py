@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: wall-clock time of a full 51-state scan at different concurrency levels.
+
+Usage: python benchmarks/bench_concurrency.py [--latency 0.05] [--bills 10] [--backend dataset]
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import tempfile
+import time
+
+from mock_legiscan import MockLegiScan, use_mock
+
+import legiscan_datasets
+import scraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.05, help='simulated per-request latency (s)')
+    parser.add_argument('--bills', type=int, default=10, help='search hits per state')
+    parser.add_argument('--rate-limit', type=float, default=0, help='token bucket rate, 0 for unlimited')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--backend', choices=['search', 'dataset'], default='search')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    args = parser.parse_args()
+
+    mock = MockLegiScan(latency=args.latency, bills_per_state=args.bills, error_rate=args.error_rate)
+    use_mock(mock)
+    if args.backend == 'dataset':
+        requests_per_scan = len(scraper.STATES) * 2
+    else:
+        requests_per_scan = len(scraper.STATES) * (args.bills + 1)
+
+    print(f"{len(scraper.STATES)} states, {requests_per_scan} requests per scan, "
+          f"{args.latency * 1000:.0f} ms latency, rate limit {args.rate_limit or 'none'}")
+    print(f"{'workers':>8} {'seconds':>9} {'req/s':>8} {'bills':>6}")
+    try:
+        for workers in args.workers:
+            cache_dir = tempfile.mkdtemp()
+            legiscan_datasets.DATASET_CACHE_DIR = cache_dir
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                bills = scraper.fetch_all_bills(max_workers=workers, rate_limit=args.rate_limit,
+                                                backend=args.backend)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {elapsed:>9.2f} {requests_per_scan / elapsed:>8.1f} {len(bills):>6}")
+            shutil.rmtree(cache_dir)
+    finally:
+        mock.stop()
+
+
+if __name__ == '__main__':
+    main()
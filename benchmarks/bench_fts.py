@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the bill store's FTS5 index at scale - time to sync bills.json
+repeated up to ~100k bills into an empty store, time to re-sync after 1% of
+the bills changed (only those rows are re-indexed), and median latency of a
+few search_bills.py style queries.
+
+Usage: python benchmarks/bench_fts.py [--bills 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from bench_storage import load_scaled_bills
+from bill_db import BillStore
+from search_bills import REGIONS
+
+QUERIES = [
+    ('banking OR 280E', {}),
+    ('banking OR 280E, active, south', {'state_codes': REGIONS['south'], 'exclude_status': [6, 7, 8]}),
+    ('"adult use" NOT hemp', {}),
+    ('tax*, 2025', {'since': '2025-01-01', 'until': '2025-12-31'}),
+    ('expungement, status 1', {'status_codes': [1]}),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the FTS5 bill index')
+    parser.add_argument('--bills', type=int, default=100000, help='approximate bill count (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per query (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    base, last_updated = load_scaled_bills(1)
+    scaled, _ = load_scaled_bills(max(1, round(args.bills / len(base))))
+    # load_scaled_bills() ids only stay unique for up to 100 copies
+    bills = [dict(bill, id=i + 1) for i, bill in enumerate(scaled)]
+
+    with tempfile.TemporaryDirectory() as workdir, BillStore(os.path.join(workdir, 'bills.sqlite')) as store:
+        start = time.perf_counter()
+        store.sync(bills, last_updated)
+        print(f"Initial sync of {len(bills):,} bills: {time.perf_counter() - start:.2f} s")
+
+        changed = [dict(bill, last_action='Amended in committee') if i % 100 == 0 else bill
+                   for i, bill in enumerate(bills)]
+        start = time.perf_counter()
+        result = store.sync(changed, last_updated)
+        print(f"Re-sync with {result.updated:,} changed bills: {time.perf_counter() - start:.2f} s")
+        print()
+
+        print(f"{'query':<40} {'results':>8} {'median ms':>10}")
+        for label, filters in QUERIES:
+            query = label.split(',')[0]
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results = store.search(query, limit=20, **filters)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{label:<40} {len(results):>8} {statistics.median(timings):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
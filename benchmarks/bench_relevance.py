@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: legacy substring relevance filter vs the compiled classifier
+over the bills in bills.json.
+
+Usage: python benchmarks/bench_relevance.py [--repeat 50] [--bills ../bills.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from relevance import classify, is_relevant_bill
+from relevance_diff import legacy_is_relevant_bill
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--bills', default=os.path.join(ROOT, 'bills.json'))
+    args = parser.parse_args()
+
+    with open(args.bills, 'r', encoding='utf-8') as f:
+        texts = [(b.get('title') or '', b.get('description') or '') for b in json.load(f)['bills']]
+
+    candidates = [
+        ('legacy substring scan', legacy_is_relevant_bill),
+        ('compiled regex (bool)', is_relevant_bill),
+        ('compiled regex + terms', classify),
+    ]
+    print(f"{len(texts)} bills x {args.repeat} passes")
+    for name, func in candidates:
+        seconds = timeit.timeit(lambda: [func(t, d) for t, d in texts], number=args.repeat)
+        per_bill = seconds / (args.repeat * len(texts)) * 1e6
+        print(f"  {name:24} {seconds:7.3f} s total  {per_bill:6.2f} us/bill")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak RSS and render time of index.html generation, building one
+string (generate_html) vs streaming chunks to disk (write_html), at several
+multiples of the bills in bills.json. Each measurement runs in a fresh process.
+With --cards it instead times the card renderer and compares HTML escapers
+(str.replace chain, str.translate, html.escape) on the bills' field values.
+
+Usage: python benchmarks/bench_render.py [--scales 1 10 100] [--cards]
+"""
+
+import argparse
+import html
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+
+def load_scaled_bills(scale):
+    """bills.json repeated ``scale`` times with unique ids"""
+    with open(os.path.join(ROOT, 'bills.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    bills = []
+    for copy in range(scale):
+        for bill in data['bills']:
+            bills.append(dict(bill, id=f"{bill['id']}-{copy}"))
+    return bills, data['last_updated']
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(mode, scale):
+    """Render once in this process and print a JSON measurement"""
+    import render
+
+    bills, last_updated = load_scaled_bills(scale)
+    out_path = os.path.join(tempfile.mkdtemp(), 'index.html')
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    if mode == 'string':
+        html = render.generate_html(bills, last_updated)
+        with open(out_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+    else:
+        render.write_html(out_path, bills, last_updated)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'bills': len(bills),
+        'seconds': elapsed,
+        'rss_growth_mb': peak_rss_mb() - baseline,
+        'output_mb': os.path.getsize(out_path) / (1024 * 1024),
+    }))
+    os.remove(out_path)
+
+
+def escaper_variants():
+    """Candidate escapers; all but html.escape produce escape_html's exact output"""
+    import render
+
+    table = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})
+    return {
+        'str.replace chain': render.escape_html,
+        'str.translate': lambda text: str(text).translate(table) if text else '',
+        'html.escape': lambda text: html.escape(str(text)) if text else '',
+    }
+
+
+def bench_cards(scale, repeat=5):
+    """Best-of-``repeat`` card render and escaper timings"""
+    import render
+
+    bills, _ = load_scaled_bills(scale)
+    values = [
+        bill.get(key) for bill in bills
+        for key in ('id', 'state_name', 'bill_number', 'title', 'description', 'url')
+    ]
+
+    def best(func):
+        return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+    print(f"{len(bills)} bills, {len(values)} escaped values")
+    print(f"  generate_bill_card_html: {best(lambda: [render.generate_bill_card_html(b) for b in bills]):8.1f} ms")
+    for name, escape in escaper_variants().items():
+        print(f"  {name:>23}: {best(lambda: [escape(v) for v in values]):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--cards', action='store_true', help='time card rendering and HTML escapers')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'SCALE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]))
+        return
+    if args.cards:
+        for scale in args.scales:
+            bench_cards(scale)
+        return
+
+    print(f"{'bills':>8} {'mode':>7} {'output MB':>10} {'seconds':>8} {'peak RSS growth MB':>19}")
+    for scale in args.scales:
+        for mode in ('string', 'stream'):
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', mode, str(scale)],
+                capture_output=True, text=True, check=True
+            )
+            m = json.loads(result.stdout)
+            print(f"{m['bills']:>8} {mode:>7} {m['output_mb']:>10.1f} {m['seconds']:>8.2f} "
+                  f"{m['rss_growth_mb']:>19.1f}")
+
+
+if __name__ == '__main__':
+    main()
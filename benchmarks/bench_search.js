@@ -0,0 +1,38 @@
+// Query latency of search.js against a built search-index.json, next to a
+// plain substring scan over the same bill text (what applyFilters did per card).
+//
+// Usage: node benchmarks/bench_search.js search-index.json [texts.json]
+// (benchmarks/bench_search_index.py builds both files at several scales)
+
+const fs = require('fs');
+const path = require('path');
+const { SearchIndex } = require(path.join(__dirname, '..', 'search.js'));
+
+const QUERIES = ['cannabis', 'bank', 'medical marijuana', 'tax', 'hb', 'expunge', 'adult use', 'zzz', 'c', 'smith'];
+const REPEAT = 200;
+
+function time(fn) {
+    const start = process.hrtime.bigint();
+    for (let i = 0; i < REPEAT; i++) fn();
+    return Number(process.hrtime.bigint() - start) / 1e6 / REPEAT;
+}
+
+const data = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+let start = process.hrtime.bigint();
+const index = new SearchIndex(data);
+const loadMs = Number(process.hrtime.bigint() - start) / 1e6;
+
+const texts = process.argv[3] ? JSON.parse(fs.readFileSync(process.argv[3], 'utf8')) : null;
+
+const results = { bills: index.size, tokens: index.tokens.length, load_ms: loadMs, queries: {} };
+for (const query of QUERIES) {
+    const entry = {
+        index_ms: time(() => index.filter({ query })),
+        matches: index.filter({ query }).length
+    };
+    if (texts) {
+        entry.scan_ms = time(() => texts.filter(text => text.includes(query)));
+    }
+    results.queries[query] = entry;
+}
+console.log(JSON.stringify(results));
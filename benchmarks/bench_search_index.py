@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: size and build time of search-index.json, and (with node on the
+PATH) per-query latency of search.js vs a substring scan of every bill's
+text, at several multiples of the bills in bills.json.
+
+Usage: python benchmarks/bench_search_index.py [--scales 1 10]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from search_index import build_search_index
+from render import sort_bills
+
+
+def load_scaled_bills(scale):
+    """bills.json repeated ``scale`` times with unique ids"""
+    with open(os.path.join(ROOT, 'bills.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    bills = []
+    for copy in range(scale):
+        for bill in data['bills']:
+            bills.append(dict(bill, id=f"{bill['id']}-{copy}"))
+    return bills, data['last_updated']
+
+
+def card_text(bill):
+    """Roughly the lowercased textContent of a bill card"""
+    sponsors = ' '.join(s.get('name', '') for s in bill.get('sponsors', []))
+    return ' '.join(str(bill.get(field) or '') for field in (
+        'state_name', 'bill_number', 'title', 'status', 'description'
+    )).lower() + ' ' + sponsors.lower()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    args = parser.parse_args()
+
+    node = shutil.which('node')
+    workdir = tempfile.mkdtemp()
+    for scale in args.scales:
+        bills, last_updated = load_scaled_bills(scale)
+
+        start = time.perf_counter()
+        index = build_search_index(bills, last_updated)
+        build_seconds = time.perf_counter() - start
+
+        index_path = os.path.join(workdir, f'search-index-{scale}.json')
+        raw = json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        with open(index_path, 'wb') as f:
+            f.write(raw)
+
+        print(f"{len(bills)} bills: built in {build_seconds:.2f} s, {len(index['tokens'])} tokens, "
+              f"{len(raw) / 1024:.0f} KB ({len(gzip.compress(raw)) / 1024:.0f} KB gzipped)")
+
+        if not node:
+            print("  Info: node not found, skipping query latency")
+            continue
+
+        texts_path = os.path.join(workdir, f'texts-{scale}.json')
+        with open(texts_path, 'w', encoding='utf-8') as f:
+            json.dump([card_text(bill) for bill in sort_bills(bills)], f)
+
+        result = subprocess.run(
+            [node, os.path.join(ROOT, 'benchmarks', 'bench_search.js'), index_path, texts_path],
+            capture_output=True, text=True, check=True
+        )
+        m = json.loads(result.stdout)
+        print(f"  index decode: {m['load_ms']:.1f} ms")
+        print(f"  {'query':>20} {'matches':>8} {'index ms':>9} {'scan ms':>8}")
+        for query, entry in m['queries'].items():
+            print(f"  {query:>20} {entry['matches']:>8} {entry['index_ms']:>9.3f} {entry['scan_ms']:>8.3f}")
+    shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: file size, load time and memory of bills.json (pretty-printed and
+compact) vs the columnar format (full bills, and only a few columns), at several multiples of the bills in
+bills.json. Each load runs in a fresh process; memory is the tracemalloc
+peak during the load and the size still held by the loaded bills.
+
+Usage: python benchmarks/bench_storage.py [--scales 1 10] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import columnar
+
+FORMATS = ('json-indent', 'json-compact', 'columnar', 'columnar.gz', 'columns-only')
+
+# Fields read by the columns-only load (a per-state count / date range style query)
+COLUMN_QUERY = ('state_code', 'status', 'last_action_date')
+
+
+def load_scaled_bills(scale):
+    """bills.json repeated ``scale`` times with unique ids
+
+    Each copy is parsed separately, so copies share no string objects (as
+    they would not in a real, larger bills.json) and marshal cannot make
+    them smaller or faster by writing back-references.
+    """
+    with open(os.path.join(ROOT, 'bills.json'), 'r', encoding='utf-8') as f:
+        payload = f.read()
+    bills = []
+    for copy in range(scale):
+        data = json.loads(payload)
+        for bill in data['bills']:
+            bills.append(dict(bill, id=bill['id'] * 100 + copy))
+    return bills, data['last_updated']
+
+
+def write_files(workdir, scale):
+    """Write the scaled bills in every format; return {format: path}"""
+    bills, last_updated = load_scaled_bills(scale)
+    data = {'last_updated': last_updated, 'total_bills': len(bills), 'bills': bills}
+    suffixes = {'columnar': '.bin', 'columnar.gz': '.bin.gz', 'columns-only': '.bin'}
+    paths = {fmt: os.path.join(workdir, f'{scale}-{fmt}{suffixes.get(fmt, ".json")}') for fmt in FORMATS}
+    with open(paths['json-indent'], 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(paths['json-compact'], 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    for fmt in ('columnar', 'columnar.gz', 'columns-only'):
+        columnar.write_columnar(paths[fmt], bills, last_updated)
+        loaded, _ = columnar.load_columnar(paths[fmt])
+        assert loaded == bills, 'columnar round trip lost data'
+    return paths
+
+
+def load(fmt, path):
+    if fmt == 'columns-only':
+        columns = columnar.load_columns(path)
+        return list(zip(*(columns.column(key) for key in COLUMN_QUERY)))
+    if fmt.startswith('columnar'):
+        return columnar.load_columnar(path)[0]
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['bills']
+
+
+def run_child(fmt, path, repeat):
+    """Time ``repeat`` loads, then measure memory of one more, and print JSON"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(fmt, path)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    bills = load(fmt, path)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({'bills': len(bills), 'seconds': min(timings),
+                      'retained_mb': retained / 2 ** 20, 'peak_mb': peak / 2 ** 20}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--child', nargs=2, metavar=('FORMAT', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.repeat)
+        return
+
+    workdir = tempfile.mkdtemp()
+    print(f"{'bills':>7} {'format':>13} {'file KB':>9} {'load ms':>8} {'held MB':>8} {'peak MB':>8}")
+    for scale in args.scales:
+        for fmt, path in write_files(workdir, scale).items():
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--repeat', str(args.repeat), '--child', fmt, path],
+                capture_output=True, text=True, check=True
+            )
+            m = json.loads(result.stdout)
+            print(f"{m['bills']:>7} {fmt:>13} {os.path.getsize(path) / 1024:>9.0f} {m['seconds'] * 1000:>8.1f} "
+                  f"{m['retained_mb']:>8.1f} {m['peak_mb']:>8.1f}")
+            os.remove(path)
+    os.rmdir(workdir)
+
+
+if __name__ == '__main__':
+    main()
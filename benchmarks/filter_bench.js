@@ -0,0 +1,119 @@
+// In-browser filter/sort benchmark for the generated page.
+// Open index.html?bench (app.js loads this file) or paste it into the DevTools console.
+// Times filter, sort and DOM commit (including the forced layout) for the current
+// engine in app.js and for the previous per-card implementation, then prints a table.
+
+(async function () {
+    const RUNS = 15;
+    const QUERIES = ['', 'cannabis', 'medical marijuana', 'tax', 'zzz'];
+    const SORTS = ['recent', 'state', 'alphabetical'];
+
+    const container = document.getElementById('billsContainer');
+    const noResults = document.getElementById('noResults');
+
+    function median(values) {
+        const sorted = [...values].sort((a, b) => a - b);
+        return sorted[Math.floor(sorted.length / 2)];
+    }
+
+    function layout() {
+        return container.offsetHeight;
+    }
+
+    // The applyFilters this tracker shipped before sort keys and batched commits
+    function legacyRun({ query, state, status, sort }) {
+        const cards = billEntries.map(entry => entry.card);
+        let t0 = performance.now();
+        const visible = cards.filter(card => {
+            const matchesSearch = card.textContent.toLowerCase().includes(query);
+            const matchesState = state === 'all' || (state === 'US' && card.dataset.stateCode === 'US') ||
+                card.dataset.state === state;
+            const matchesStatus = status === 'all' || card.dataset.status.toLowerCase().includes(status);
+            return matchesSearch && matchesState && matchesStatus;
+        });
+        let t1 = performance.now();
+        const byDate = (a, b) => new Date(b.dataset.date || 0) - new Date(a.dataset.date || 0);
+        if (sort === 'recent') visible.sort(byDate);
+        if (sort === 'state') {
+            visible.sort((a, b) => a.dataset.state === b.dataset.state ? byDate(a, b) :
+                a.dataset.state.localeCompare(b.dataset.state));
+        }
+        if (sort === 'alphabetical') {
+            visible.sort((a, b) => a.querySelector('.bill-number').textContent
+                .localeCompare(b.querySelector('.bill-number').textContent));
+        }
+        let t2 = performance.now();
+        cards.forEach(card => { card.style.display = 'none'; });
+        noResults.style.display = visible.length === 0 ? 'block' : 'none';
+        visible.forEach(card => {
+            card.style.display = 'block';
+            container.appendChild(card);
+        });
+        layout();
+        let t3 = performance.now();
+        return [t1 - t0, t2 - t1, t3 - t2, visible.length];
+    }
+
+    function currentRun(criteria) {
+        // Start from an empty list so every run pays for a real commit
+        container.replaceChildren();
+        renderedEntries = [];
+        layout();
+        let t0 = performance.now();
+        const entries = filterEntries(criteria);
+        let t1 = performance.now();
+        sortEntries(entries, criteria.sort);
+        let t2 = performance.now();
+        renderEntries(entries);
+        layout();
+        let t3 = performance.now();
+        return [t1 - t0, t2 - t1, t3 - t2, entries.length];
+    }
+
+    await searchIndexReady;
+
+    // The legacy engine needs every card in the DOM, which virtual mode never has
+    const engines = billEntries.every(entry => entry.card)
+        ? [['legacy', legacyRun], ['current', currentRun]]
+        : [['current', currentRun]];
+
+    const rows = [];
+    for (const [engine, run] of engines) {
+        billEntries.forEach(entry => { if (entry.card) entry.card.style.display = ''; });
+        for (const query of QUERIES) {
+            for (const sort of SORTS) {
+                const criteria = { query, state: 'all', status: 'all', sort };
+                const samples = [];
+                for (let i = 0; i < RUNS; i++) samples.push(run(criteria));
+                rows.push({
+                    engine,
+                    query: query || '(none)',
+                    sort,
+                    bills: samples[0][3],
+                    filter_ms: +median(samples.map(s => s[0])).toFixed(2),
+                    sort_ms: +median(samples.map(s => s[1])).toFixed(2),
+                    commit_ms: +median(samples.map(s => s[2])).toFixed(2)
+                });
+            }
+        }
+    }
+
+    // Put the page back the way the filters say it should be
+    billEntries.forEach(entry => { if (entry.card) entry.card.style.display = ''; });
+    renderedEntries = [];
+    applyFilters();
+
+    window.filterBenchResults = rows;
+    console.table(rows);
+
+    const pre = document.createElement('pre');
+    pre.style.cssText = 'position:fixed;bottom:0;right:0;max-height:50vh;overflow:auto;' +
+        'background:#fff;border:1px solid #ccc;padding:8px;font-size:11px;z-index:1000';
+    pre.textContent = `${billEntries.length} cards, search index: ${searchIndex ? 'yes' : 'no'}, ` +
+        `median of ${RUNS} runs\n\n` +
+        'engine   query              sort          bills  filter ms  sort ms  commit ms\n' +
+        rows.map(r => `${r.engine.padEnd(8)} ${r.query.padEnd(18)} ${r.sort.padEnd(13)} ` +
+            `${String(r.bills).padStart(5)} ${String(r.filter_ms).padStart(10)} ` +
+            `${String(r.sort_ms).padStart(8)} ${String(r.commit_ms).padStart(10)}`).join('\n');
+    document.body.appendChild(pre);
+})();
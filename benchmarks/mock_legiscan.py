@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Local mock of the LegiScan API for benchmarks.
+Serves deterministic getSearch/getBill/getBillText/getDatasetList/getDataset
+payloads with configurable latency.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import scraper
+
+
+class MockLegiScan:
+    """Threaded HTTP server that answers a subset of LegiScan ops"""
+
+    def __init__(self, latency=0.05, bills_per_state=10, error_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(420)
+        self.bills_per_state = bills_per_state
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.bills = {}
+        self.texts = {}
+        for state_index, state_code in enumerate(scraper.STATES):
+            for n in range(bills_per_state):
+                bill_id = (state_index + 1) * 100000 + n
+                self.bills[bill_id] = self.make_bill(bill_id, state_code, n)
+        self.server = None
+        self.thread = None
+
+    def make_bill(self, bill_id, state_code, n):
+        """Build a getBill payload; every fourth bill is off-topic"""
+        relevant = n % 4 != 3
+        title = f'Cannabis regulation act {n}' if relevant else f'Marijuana commemorative day {n}'
+        return {
+            'bill_id': bill_id,
+            'change_hash': f'{bill_id:x}',
+            'bill_number': f'HB{n + 1}',
+            'title': title,
+            'description': title + '. Relating to cannabis.',
+            'status': (n % 6) + 1,
+            'status_date': '2025-03-%02d' % (n % 28 + 1),
+            'url': f'https://legiscan.com/{state_code}/bill/HB{n + 1}/2025',
+            'last_action': 'Referred to committee',
+            'last_action_date': '2025-04-%02d' % (n % 28 + 1),
+            'sponsors': [{'name': f'Sponsor {i}', 'party': 'D', 'role': 'Rep'} for i in range(n % 7)],
+            'texts': self.make_texts(bill_id, n),
+        }
+
+    def make_texts(self, bill_id, n):
+        """Introduced and amended HTML versions; the introduced text of bill n is shared across states"""
+        sections = [f'<p>Section {i}. The cannabis control board shall adopt rule {i} of act {n}.</p>'
+                    for i in range(200)]
+        versions = [('Introduced', '2025-01-15', sections), ('Amended', '2025-03-01',
+                     sections[:50] + ['<p>Section 50. As amended in committee.</p>'] + sections[51:])]
+        texts = []
+        for k, (text_type, text_date, body) in enumerate(versions):
+            doc_id = bill_id * 10 + k
+            self.texts[doc_id] = f'<html><body>{"".join(body)}</body></html>'.encode('utf-8')
+            texts.append({'doc_id': doc_id, 'date': text_date, 'type': text_type, 'mime': 'text/html',
+                          'text_hash': hashlib.md5(self.texts[doc_id]).hexdigest()})
+        return texts
+
+    def search_payload(self, state_code):
+        """Build a getSearch payload for one state"""
+        results = {'summary': {'count': self.bills_per_state}}
+        for i, bill in enumerate(self.state_bills(state_code)):
+            results[str(i)] = {
+                'bill_id': bill['bill_id'],
+                'bill_number': bill['bill_number'],
+                'change_hash': bill['change_hash'],
+                'title': bill['title'],
+                'last_action': bill['last_action'],
+                'last_action_date': bill['last_action_date'],
+            }
+        return {'status': 'OK', 'searchresult': results}
+
+    def state_bills(self, state_code):
+        """All bills belonging to one state"""
+        return [b for b in self.bills.values() if b['url'].split('/')[3] == state_code]
+
+    def session_id(self, state_code):
+        """Synthetic session id: one current session per state"""
+        return list(scraper.STATES).index(state_code) + 1
+
+    def dataset_zip(self, state_code):
+        """Build a dataset archive laid out like LegiScan's JSON datasets"""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for bill in self.state_bills(state_code):
+                name = f"{state_code}/2025-2026_Regular_Session/bill/{bill['bill_number']}.json"
+                archive.writestr(name, json.dumps({'bill': bill}))
+        return buffer.getvalue()
+
+    def dataset_list_payload(self, state_code):
+        """Build a getDatasetList payload with one current and one past session"""
+        session_id = self.session_id(state_code)
+        return {'status': 'OK', 'datasetlist': [
+            {'session_id': session_id, 'year_start': 2025, 'year_end': 2099,
+             'dataset_hash': f'{session_id:08x}', 'access_key': f'key{session_id}'},
+            {'session_id': session_id + 1000, 'year_start': 2023, 'year_end': 2024,
+             'dataset_hash': 'old', 'access_key': 'old'},
+        ]}
+
+    def handle(self, op, params):
+        """Return (status, payload) for one request"""
+        with self.lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self.random.random() < self.error_rate:
+            return 503, {'status': 'ERROR', 'alert': {'message': 'Service unavailable'}}
+        if op == 'getSearch':
+            return 200, self.search_payload(params.get('state', ''))
+        if op == 'getBill':
+            bill = self.bills.get(int(params.get('id', 0)))
+            if bill is None:
+                return 200, {'status': 'ERROR', 'alert': {'message': 'Unknown bill id'}}
+            return 200, {'status': 'OK', 'bill': bill}
+        if op == 'getBillText':
+            doc = self.texts.get(int(params.get('id', 0)))
+            if doc is None:
+                return 200, {'status': 'ERROR', 'alert': {'message': 'Unknown doc id'}}
+            return 200, {'status': 'OK', 'text': {'doc_id': int(params['id']), 'mime': 'text/html',
+                                                  'doc': base64.b64encode(doc).decode('ascii')}}
+        if op == 'getDatasetList':
+            return 200, self.dataset_list_payload(params.get('state', ''))
+        if op == 'getDataset':
+            state_code = list(scraper.STATES)[int(params.get('id', 0)) - 1]
+            return 200, {'status': 'OK', 'dataset': {
+                'session_id': int(params['id']),
+                'mime': 'application/zip',
+                'zip': base64.b64encode(self.dataset_zip(state_code)).decode('ascii'),
+            }}
+        return 200, {'status': 'ERROR', 'alert': {'message': f'Unknown op {op}'}}
+
+    def start(self):
+        """Start serving on a free localhost port; returns the base URL template"""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                status, payload = mock.handle(query.get('op', ''), query)
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return 'http://127.0.0.1:%d/?key={}&op={}' % self.server.server_address[1]
+
+    def stop(self):
+        """Shut the server down"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def use_mock(mock):
+    """Point the scraper module at a running mock server"""
+    scraper.LEGISCAN_BASE_URL = mock.start()
+    scraper.LEGISCAN_API_KEY = 'benchmark'
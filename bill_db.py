@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+SQLite bill store - the tracker's bills keyed by LegiScan bill id, with a
+status history row every time a bill's status changes and an FTS5
+full-text index over title, description, last action and sponsors. A scan
+is synced into the store (only new, changed and removed bills are written,
+to the index as well), the site is rendered from its indexed queries and
+bills.json is exported from it. search_bills.py queries the index.
+
+Usage: python bill_db.py [--changed-since YYYY-MM-DD] [--state CA] [--export bills.json]
+"""
+
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+
+from output_files import write_json_atomic
+
+BILL_DB_PATH = 'bills.sqlite'
+BILL_DB_VERSION = 2
+
+# Columns of the full-text index, in bills_fts order, and their BM25 weights
+FTS_COLUMNS = ('title', 'description', 'last_action', 'sponsors')
+FTS_WEIGHTS = (10.0, 4.0, 1.0, 2.0)
+
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS bills (
+        id INTEGER PRIMARY KEY,
+        state_rank INTEGER NOT NULL,
+        state_code TEXT,
+        status_code INTEGER,
+        status_date TEXT,
+        last_action_date TEXT,
+        digest TEXT NOT NULL,
+        data TEXT NOT NULL,
+        first_seen TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS bills_state ON bills (state_code);
+    CREATE INDEX IF NOT EXISTS bills_status ON bills (status_code);
+    CREATE INDEX IF NOT EXISTS bills_last_action ON bills (last_action_date);
+    CREATE INDEX IF NOT EXISTS bills_order ON bills (state_rank, id);
+
+    CREATE TABLE IF NOT EXISTS status_history (
+        bill_id INTEGER NOT NULL,
+        status_code INTEGER,
+        status TEXT,
+        status_date TEXT,
+        recorded_at TEXT NOT NULL,
+        PRIMARY KEY (bill_id, status_code, status_date)
+    );
+    CREATE INDEX IF NOT EXISTS status_history_date ON status_history (status_date);
+
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+'''
+
+# rowid is the bill id; porter stemming so 'banking' also finds 'bank'
+_FTS_SCHEMA = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS bills_fts USING fts5(
+        title, description, last_action, sponsors,
+        tokenize = 'porter unicode61 remove_diacritics 2'
+    );
+'''
+
+
+def fts_row(bill):
+    """The indexed text of one bill, in FTS_COLUMNS order"""
+    sponsors = ' '.join(
+        f"{sponsor.get('name') or ''} {sponsor.get('party') or ''}" for sponsor in bill.get('sponsors', [])
+    )
+    return (bill.get('title') or '', bill.get('description') or '', bill.get('last_action') or '', sponsors)
+
+
+def fts_query(text):
+    """Quote every word of a query that is not valid FTS5 syntax, e.g. 'H.B. 12' -> '"H.B." "12"'"""
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def bill_digest(data):
+    """sha256 of a bill's stored JSON text"""
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class SyncResult:
+    """Counts of what one sync() wrote"""
+
+    def __init__(self):
+        self.added = 0
+        self.updated = 0
+        self.removed = 0
+        self.unchanged = 0
+        self.status_changes = 0
+
+    @property
+    def changed(self):
+        return bool(self.added or self.updated or self.removed)
+
+    def __str__(self):
+        return (f"{self.added} added, {self.updated} updated, {self.removed} removed, "
+                f"{self.unchanged} unchanged, {self.status_changes} status changes")
+
+
+class BillStore:
+    """Bills and their status history in one SQLite file
+
+    ``state_order`` lists state codes in display order (scraper.STATES);
+    bills() returns bills in that order, then by id, which is the order
+    bills.json has always used.
+    """
+
+    def __init__(self, path=BILL_DB_PATH, state_order=None):
+        self.path = path
+        self.state_rank = {code: rank for rank, code in enumerate(state_order or [])}
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_SCHEMA)
+        self.conn.executescript(_FTS_SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('version', ?)", (str(BILL_DB_VERSION),))
+        self.conn.commit()
+        if int(self.get_meta('version')) < BILL_DB_VERSION:
+            self.rebuild_fts()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM bills').fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return default if row is None else row[0]
+
+    @property
+    def last_updated(self):
+        return self.get_meta('last_updated')
+
+    def _rank(self, state_code):
+        return self.state_rank.get(state_code, len(self.state_rank))
+
+    def sync(self, bills, last_updated=None):
+        """Make the store hold exactly ``bills``; return a SyncResult
+
+        Only new, changed and removed bills are written. A bill whose status
+        code or status date changed (or that is new) gets a status_history
+        row. ``last_updated`` is stored only when something changed, so an
+        unchanged scan keeps the previous timestamp.
+        """
+        result = SyncResult()
+        now = datetime.now().isoformat(timespec='seconds')
+        stored = {
+            bill_id: (digest, status_code, status_date)
+            for bill_id, digest, status_code, status_date in self.conn.execute(
+                'SELECT id, digest, status_code, status_date FROM bills'
+            )
+        }
+
+        with self.conn:
+            for bill in bills:
+                bill_id = bill.get('id')
+                data = json.dumps(bill, ensure_ascii=False)
+                digest = bill_digest(data)
+                previous = stored.pop(bill_id, None)
+                if previous is not None and previous[0] == digest:
+                    result.unchanged += 1
+                    continue
+
+                row = (bill.get('state_code'), bill.get('status_code'), bill.get('status_date'),
+                       bill.get('last_action_date'), digest, data, now, self._rank(bill.get('state_code')))
+                if previous is None:
+                    self.conn.execute(
+                        'INSERT INTO bills (state_code, status_code, status_date, last_action_date, '
+                        'digest, data, updated_at, state_rank, first_seen, id) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        row + (now, bill_id)
+                    )
+                    self.conn.execute('INSERT INTO bills_fts (rowid, title, description, last_action, sponsors) '
+                                      'VALUES (?, ?, ?, ?, ?)', (bill_id,) + fts_row(bill))
+                    result.added += 1
+                else:
+                    self.conn.execute(
+                        'UPDATE bills SET state_code = ?, status_code = ?, status_date = ?, '
+                        'last_action_date = ?, digest = ?, data = ?, updated_at = ?, state_rank = ? '
+                        'WHERE id = ?',
+                        row + (bill_id,)
+                    )
+                    self.conn.execute('UPDATE bills_fts SET title = ?, description = ?, last_action = ?, '
+                                      'sponsors = ? WHERE rowid = ?', fts_row(bill) + (bill_id,))
+                    result.updated += 1
+
+                if previous is None or previous[1:] != (bill.get('status_code'), bill.get('status_date')):
+                    cursor = self.conn.execute(
+                        'INSERT OR IGNORE INTO status_history VALUES (?, ?, ?, ?, ?)',
+                        (bill_id, bill.get('status_code'), bill.get('status'), bill.get('status_date'), now)
+                    )
+                    result.status_changes += cursor.rowcount
+
+            # History rows of removed bills are kept
+            self.conn.executemany('DELETE FROM bills WHERE id = ?', [(bill_id,) for bill_id in stored])
+            self.conn.executemany('DELETE FROM bills_fts WHERE rowid = ?', [(bill_id,) for bill_id in stored])
+            result.removed = len(stored)
+
+            if last_updated and (result.changed or self.last_updated is None):
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_updated', ?)", (last_updated,))
+        return result
+
+    def bills(self, state_code=None, status_code=None, since=None):
+        """Bills in bills.json order, optionally filtered (``since``: last action on/after YYYY-MM-DD)"""
+        clauses, params = [], []
+        if state_code is not None:
+            clauses.append('state_code = ?')
+            params.append(state_code)
+        if status_code is not None:
+            clauses.append('status_code = ?')
+            params.append(status_code)
+        if since is not None:
+            clauses.append('last_action_date >= ?')
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return [
+            json.loads(data)
+            for data, in self.conn.execute(f'SELECT data FROM bills {where} ORDER BY state_rank, id', params)
+        ]
+
+    def search(self, query, state_codes=None, status_codes=None, since=None, until=None, exclude_status=None,
+               limit=20):
+        """(bill, score, snippet) for bills matching an FTS5 ``query``, best BM25 match first
+
+        Filters: state and status code lists (``exclude_status`` drops
+        status codes), and ``since``/``until`` on last_action_date, or
+        status_date when a bill has no action date (YYYY-MM-DD, inclusive). A query that is not valid FTS5 syntax is
+        retried with every word quoted. Scores are BM25 relevance, higher
+        is better.
+        """
+        clauses, params = ['bills_fts MATCH ?'], [query]
+        for column, values, operator in (('b.state_code', state_codes, 'IN'),
+                                         ('b.status_code', status_codes, 'IN'),
+                                         ('b.status_code', exclude_status, 'NOT IN')):
+            if values:
+                clauses.append(f"{column} {operator} ({', '.join('?' * len(values))})")
+                params.extend(values)
+        action_date = "COALESCE(NULLIF(b.last_action_date, ''), b.status_date)"
+        if since is not None:
+            clauses.append(f'{action_date} >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append(f'{action_date} <= ?')
+            params.append(until)
+        sql = (
+            f"SELECT b.data, bm25(bills_fts, {', '.join(map(str, FTS_WEIGHTS))}) AS score, "
+            "snippet(bills_fts, -1, '[', ']', '…', 12) "
+            'FROM bills_fts JOIN bills b ON b.id = bills_fts.rowid '
+            f"WHERE {' AND '.join(clauses)} ORDER BY score LIMIT ?"
+        )
+        try:
+            rows = self.conn.execute(sql, params + [limit]).fetchall()
+        except sqlite3.OperationalError:
+            params[0] = fts_query(query)
+            rows = self.conn.execute(sql, params + [limit]).fetchall()
+        # bm25() is negative, lower for better matches
+        return [(json.loads(data), round(-score, 3), snippet) for data, score, snippet in rows]
+
+    def rebuild_fts(self):
+        """Re-index every bill (stores created before the full-text index)"""
+        with self.conn:
+            self.conn.execute('DELETE FROM bills_fts')
+            self.conn.executemany(
+                'INSERT INTO bills_fts (rowid, title, description, last_action, sponsors) VALUES (?, ?, ?, ?, ?)',
+                ((bill_id,) + fts_row(json.loads(data)) for bill_id, data in self.conn.execute(
+                    'SELECT id, data FROM bills'
+                ).fetchall())
+            )
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(BILL_DB_VERSION),))
+
+    def counts_by_state(self):
+        """{state_code: bill count}"""
+        return dict(self.conn.execute('SELECT state_code, COUNT(*) FROM bills GROUP BY state_code'))
+
+    def status_changes(self, since, state_code=None):
+        """(bill, history row) for each status change dated on/after ``since``, newest first"""
+        query = (
+            'SELECT b.data, h.status_code, h.status, h.status_date, h.recorded_at '
+            'FROM status_history h JOIN bills b ON b.id = h.bill_id '
+            'WHERE h.status_date >= ?'
+        )
+        params = [since]
+        if state_code is not None:
+            query += ' AND b.state_code = ?'
+            params.append(state_code)
+        query += ' ORDER BY h.status_date DESC, b.state_rank, b.id'
+        return [
+            (json.loads(data), {'status_code': code, 'status': status, 'status_date': date,
+                                'recorded_at': recorded_at})
+            for data, code, status, date, recorded_at in self.conn.execute(query, params)
+        ]
+
+    def history(self, bill_id):
+        """Status history rows of one bill, oldest first"""
+        return [
+            {'status_code': code, 'status': status, 'status_date': date, 'recorded_at': recorded_at}
+            for code, status, date, recorded_at in self.conn.execute(
+                'SELECT status_code, status, status_date, recorded_at FROM status_history '
+                'WHERE bill_id = ? ORDER BY status_date, recorded_at', (bill_id,)
+            )
+        ]
+
+    def import_snapshot(self, path='bills.json'):
+        """Seed an empty store from an existing bills.json; return the number of bills imported"""
+        if len(self):
+            return 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        self.sync(data.get('bills', []), data.get('last_updated'))
+        return len(self)
+
+    def export(self, path='bills.json'):
+        """Write the bills.json snapshot; return True if the file changed"""
+        bills = self.bills()
+        return write_json_atomic(path, {
+            'last_updated': self.last_updated,
+            'total_bills': len(bills),
+            'bills': bills
+        }, indent=2, ensure_ascii=False)
+
+
+def main(argv=None):
+    """Main function - query the bill store"""
+    parser = argparse.ArgumentParser(description='Query the SQLite bill store')
+    parser.add_argument('--db', default=BILL_DB_PATH, help='bill store (default: %(default)s)')
+    parser.add_argument('--changed-since', metavar='YYYY-MM-DD',
+                        default=(datetime.now() - timedelta(days=7)).date().isoformat(),
+                        help='list status changes dated on or after this day (default: a week ago)')
+    parser.add_argument('--state', help='only this state code')
+    parser.add_argument('--export', metavar='PATH', help='write a bills.json snapshot instead')
+    args = parser.parse_args(argv)
+
+    with BillStore(args.db) as store:
+        if not len(store):
+            print(f"❌ ERROR: {args.db} holds no bills - run scraper.py first")
+            return 1
+
+        if args.export:
+            changed = store.export(args.export)
+            print(f"✅ {len(store)} bills exported to {args.export}" + ("" if changed else " (unchanged)"))
+            return 0
+
+        changes = store.status_changes(args.changed_since, args.state)
+
+    print(f"{len(changes)} status changes since {args.changed_since}:")
+    for bill, change in changes:
+        print(f"  {change['status_date']}  {bill.get('state_code')} {bill.get('bill_number')}: "
+              f"{change['status']} - {bill.get('title', '')[:60]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
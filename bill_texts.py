@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Bill text store - full-text documents from getBillText, kept in a local
+content-addressed store. Each document is stored once under the sha256
+of its bytes, so a text shared by companion bills or re-issued under a
+new doc_id costs nothing extra. A new version is compressed against the
+bill's previous version as a dictionary (zstd when the zstandard package
+is installed, zlib otherwise), so mostly-unchanged amendments add only
+their differences. Known doc_ids, and new ones whose LegiScan text_hash
+matches a document already held, are never downloaded again.
+
+Usage: python bill_texts.py [--bill BILL_ID] [--extract DOC_ID --output PATH]
+"""
+
+import os
+import sys
+import gzip
+import zlib
+import json
+import base64
+import hashlib
+import argparse
+import threading
+
+from output_files import write_json_atomic
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib deltas and gzip objects without it
+    zstandard = None
+
+BILL_TEXT_DIR = 'bill_texts'
+BILL_TEXT_INDEX = 'index.json'
+
+# Longest chain of versions compressed against each other (bounds read cost)
+MAX_DELTA_CHAIN = 8
+
+# zlib only looks back this far, so a longer dictionary is wasted
+ZLIB_WINDOW = 32 * 1024
+
+CODEC_EXTENSIONS = {'gzip': 'gz', 'zlib-delta': 'zz', 'zstd': 'zst'}
+
+
+class TextStoreError(Exception):
+    """A stored document is missing or does not match its address"""
+
+
+def content_address(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _compress(data, base=None):
+    """(codec, compressed bytes); ``base`` is the previous version's bytes, used as a dictionary"""
+    if zstandard is not None:
+        if base is not None:
+            dictionary = zstandard.ZstdCompressionDict(base, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            return 'zstd', zstandard.ZstdCompressor(level=19, dict_data=dictionary).compress(data)
+        return 'zstd', zstandard.ZstdCompressor(level=19).compress(data)
+    if base is not None:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, zlib.Z_DEFAULT_STRATEGY, base[-ZLIB_WINDOW:])
+        return 'zlib-delta', compressor.compress(data) + compressor.flush()
+    return 'gzip', gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _decompress(codec, blob, base=None):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise TextStoreError('zstd object found but the zstandard package is not installed')
+        if base is not None:
+            dictionary = zstandard.ZstdCompressionDict(base, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(blob)
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if codec == 'zlib-delta':
+        decompressor = zlib.decompressobj(zdict=base[-ZLIB_WINDOW:])
+        return decompressor.decompress(blob) + decompressor.flush()
+    return gzip.decompress(blob)
+
+
+class BillTextStore:
+    """Content-addressed, compressed bill documents plus the bill -> document index
+
+    index.json holds ``objects`` (sha256 -> codec, delta base, sizes, md5),
+    ``docs`` (doc_id -> bill, sha256 and LegiScan metadata), ``bills``
+    (bill_id -> doc_ids, oldest first) and ``checked`` (bill_ids whose
+    whole texts list is stored).
+    """
+
+    def __init__(self, root=BILL_TEXT_DIR):
+        self.root = root
+        self.objects = {}
+        self.docs = {}
+        self.bills = {}
+        self.checked = set()
+        self.by_md5 = {}
+        self.downloaded = 0
+        self.deduplicated = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Load the index; a missing store is empty"""
+        try:
+            with open(os.path.join(self.root, BILL_TEXT_INDEX), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        self.objects = data.get('objects', {})
+        self.docs = data.get('docs', {})
+        self.bills = data.get('bills', {})
+        # Indexes written before ``checked`` existed only list bills whose texts were fetched
+        self.checked = set(data.get('checked', self.bills))
+        self.by_md5 = {entry['md5']: sha for sha, entry in self.objects.items()}
+        return self
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        write_json_atomic(os.path.join(self.root, BILL_TEXT_INDEX), {
+            'objects': self.objects,
+            'docs': self.docs,
+            'bills': self.bills,
+            'checked': sorted(self.checked),
+        }, indent=1, sort_keys=True)
+
+    def object_path(self, sha, codec):
+        return os.path.join(self.root, 'objects', sha[:2], f'{sha}.{CODEC_EXTENSIONS[codec]}')
+
+    def read(self, sha):
+        """The bytes of one stored document (delta bases are resolved first)"""
+        entry = self.objects.get(sha)
+        if entry is None:
+            raise TextStoreError(f'{sha} is not in the store')
+        base = self.read(entry['base']) if entry.get('base') else None
+        with open(self.object_path(sha, entry['codec']), 'rb') as f:
+            data = _decompress(entry['codec'], f.read(), base)
+        if content_address(data) != sha:
+            raise TextStoreError(f'{sha} does not match its content')
+        return data
+
+    def _delta_base(self, bill_id):
+        """sha256 of the bill's newest stored version, if it can still take another delta"""
+        doc_ids = self.bills.get(str(bill_id))
+        if not doc_ids:
+            return None
+        sha = self.docs[doc_ids[-1]]['sha256']
+        return sha if self.objects[sha].get('depth', 0) < MAX_DELTA_CHAIN else None
+
+    def add(self, bill_id, doc, data):
+        """Store one document's bytes under its content address; return the sha256
+
+        Writes are serialised so two threads never store one address against
+        different delta bases.
+        """
+        sha = content_address(data)
+        with self.lock:
+            if sha in self.objects:
+                self.deduplicated += 1
+            else:
+                base = self._delta_base(bill_id)
+                codec, blob = _compress(data, self.read(base) if base else None)
+                path = self.object_path(sha, codec)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(f'{path}.tmp', 'wb') as f:
+                    f.write(blob)
+                os.replace(f'{path}.tmp', path)
+                self.objects[sha] = {
+                    'codec': codec,
+                    'base': base,
+                    'depth': self.objects[base]['depth'] + 1 if base else 0,
+                    'size': len(data),
+                    'stored': len(blob),
+                    'md5': hashlib.md5(data).hexdigest(),
+                }
+                self.by_md5[self.objects[sha]['md5']] = sha
+            self._link(bill_id, doc, sha)
+        return sha
+
+    def _link(self, bill_id, doc, sha):
+        doc_id = str(doc['doc_id'])
+        self.docs[doc_id] = {
+            'bill_id': bill_id,
+            'sha256': sha,
+            'date': doc.get('date'),
+            'type': doc.get('type'),
+            'mime': doc.get('mime'),
+            'url': doc.get('state_link') or doc.get('url'),
+        }
+        doc_ids = self.bills.setdefault(str(bill_id), [])
+        if doc_id not in doc_ids:
+            doc_ids.append(doc_id)
+            doc_ids.sort(key=lambda key: (self.docs[key].get('date') or '', int(key)))
+
+    def fetch_texts(self, bill_id, texts, client):
+        """Download the documents of a getBill ``texts`` list that the store does not hold yet
+
+        Known doc_ids are skipped, and so is a new doc_id whose text_hash
+        (LegiScan's md5 of the document) matches a stored document. Only
+        once every document is stored (or deduplicated) is the bill marked
+        as checked, so has_bill() stays False after a failed download and
+        the next run tries again. Returns the number of documents
+        downloaded.
+        """
+        downloaded = 0
+        try:
+            for doc in sorted(texts, key=lambda doc: (doc.get('date') or '', doc.get('doc_id') or 0)):
+                doc_id = doc.get('doc_id')
+                with self.lock:
+                    if doc_id is None or str(doc_id) in self.docs:
+                        continue
+                    known = self.by_md5.get(doc.get('text_hash'))
+                    if known is not None:
+                        self.deduplicated += 1
+                        self._link(bill_id, doc, known)
+                        continue
+                text = client.get_bill_text(doc_id).get('text', {})
+                self.add(bill_id, dict(doc, mime=text.get('mime', doc.get('mime'))), base64.b64decode(text['doc']))
+                downloaded += 1
+        finally:
+            with self.lock:
+                self.downloaded += downloaded
+        with self.lock:
+            self.checked.add(str(bill_id))
+        return downloaded
+
+    def has_bill(self, bill_id):
+        """True once all documents of a bill's texts list are stored, whether or not it had any"""
+        return str(bill_id) in self.checked
+
+    def texts_for(self, bill_id):
+        """Index entries of one bill's documents, oldest first"""
+        return [dict(self.docs[doc_id], doc_id=doc_id) for doc_id in self.bills.get(str(bill_id), [])]
+
+    def stats(self):
+        """Document, object and byte counts"""
+        return {
+            'bills': sum(1 for doc_ids in self.bills.values() if doc_ids),
+            'docs': len(self.docs),
+            'objects': len(self.objects),
+            'raw_bytes': sum(self.objects[doc['sha256']]['size'] for doc in self.docs.values()),
+            'stored_bytes': sum(entry['stored'] for entry in self.objects.values()),
+        }
+
+
+def main(argv=None):
+    """Main function - inspect the bill text store"""
+    parser = argparse.ArgumentParser(description='Inspect the local bill text store')
+    parser.add_argument('--store', default=BILL_TEXT_DIR, help='store directory (default: %(default)s)')
+    parser.add_argument('--bill', type=int, help="list one bill's documents")
+    parser.add_argument('--extract', metavar='DOC_ID', help='write one document to --output')
+    parser.add_argument('--output', metavar='PATH', help='file for --extract (default: stdout)')
+    args = parser.parse_args(argv)
+
+    store = BillTextStore(args.store).load()
+
+    if args.extract:
+        doc = store.docs.get(args.extract)
+        if doc is None:
+            print(f"❌ ERROR: doc_id {args.extract} is not in {args.store}")
+            return 1
+        data = store.read(doc['sha256'])
+        if args.output:
+            with open(args.output, 'wb') as f:
+                f.write(data)
+            print(f"✅ {len(data):,} bytes ({doc['mime']}) written to {args.output}")
+        else:
+            sys.stdout.buffer.write(data)
+        return 0
+
+    if args.bill is not None:
+        for doc in store.texts_for(args.bill):
+            print(f"  {doc['doc_id']:>10}  {doc['date'] or '':<10}  {doc['type'] or '':<12}  "
+                  f"{doc['mime'] or '':<20}  {doc['sha256'][:12]}")
+        return 0
+
+    stats = store.stats()
+    ratio = stats['stored_bytes'] / stats['raw_bytes'] * 100 if stats['raw_bytes'] else 0
+    print(f"{stats['docs']} documents of {stats['bills']} bills in {stats['objects']} objects: "
+          f"{stats['raw_bytes']:,} bytes stored as {stats['stored_bytes']:,} ({ratio:.1f}%)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
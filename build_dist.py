@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Production build - copies the generated site into dist/ with minified HTML,
+JSON, CSS and JS, plus precompressed .gz (and .br when the brotli package is
+installed) siblings for static hosts that serve them directly. Files whose
+bytes did not change are left untouched.
+
+Usage: python build_dist.py [--out dist] [--no-compress]
+"""
+
+import os
+import re
+import sys
+import glob
+import gzip
+import json
+import argparse
+
+from output_files import write_if_changed
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz siblings without it
+    brotli = None
+
+DIST_DIR = 'dist'
+
+# Everything the live site serves, relative to the repo root
+SITE_FILES = [
+    'index.html', 'page/*.html', 'state/*/index.html',
+    'style.css', 'app.js', 'search.js', 'virtual.js',
+    'bills.json', 'search-index.json', 'cards.json',
+    'sitemap.xml', 'feeds/*.atom', 'feeds/*.json', 'api/v1/*.json', 'api/v1/*/*.json',
+    'robots.txt', 'CNAME', 'logo.png', 'og-image.jpg',
+]
+
+# Extensions that get precompressed siblings
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.xml', '.atom', '.txt')
+
+# Smaller files are not worth a compressed copy
+MIN_COMPRESS_BYTES = 512
+
+_PRESERVE_RE = re.compile(r'(<script\b[^>]*>.*?</script>|<pre\b[^>]*>.*?</pre>|<textarea\b[^>]*>.*?</textarea>)',
+                          re.IGNORECASE | re.DOTALL)
+_HTML_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+_JSON_LD_RE = re.compile(r'(<script type="application/ld\+json">)(.*?)(</script>)', re.DOTALL)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_DECLARATION_RE = re.compile(r'(^|;)\s*([\w-]+)\s*:\s*')
+
+# At-rules whose block holds declarations rather than nested rules
+_CSS_DECLARATION_AT_RULES = ('@font-face', '@page', '@property', '@counter-style', '@viewport')
+
+
+def minify_html(text):
+    """Drop comments and collapse whitespace outside script/pre/textarea blocks"""
+    parts = _PRESERVE_RE.split(text)
+    for i in range(0, len(parts), 2):
+        part = _HTML_COMMENT_RE.sub('', parts[i])
+        parts[i] = re.sub(r'\s+', ' ', part)
+    html = ''.join(parts)
+    # Inline JSON-LD can be re-serialized without changing its meaning
+    return _JSON_LD_RE.sub(
+        lambda m: m.group(1) + json.dumps(json.loads(m.group(2)), separators=(',', ':'), ensure_ascii=False) + m.group(3),
+        html
+    ).strip() + '\n'
+
+
+def minify_css(text):
+    """Strip comments and whitespace around CSS punctuation
+
+    ':' is only tightened in declarations, never in selectors, where
+    'a :hover' and 'a:hover' mean different things. Braces are tracked to
+    tell declaration blocks from the rule lists of @media, @supports and
+    @keyframes.
+    """
+    text = _CSS_COMMENT_RE.sub('', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = _CSS_PUNCT_RE.sub(r'\1', text)
+
+    parts = re.split(r'([{}])', text)
+    # One entry per open brace: True for a declaration block, False for a rule list
+    blocks = []
+    for i, part in enumerate(parts):
+        if part == '{':
+            prelude = parts[i - 1].rsplit(';', 1)[-1].strip().lower()
+            blocks.append(not prelude.startswith('@') or prelude.startswith(_CSS_DECLARATION_AT_RULES))
+        elif part == '}':
+            if blocks:
+                blocks.pop()
+        elif blocks and blocks[-1] and (i + 1 == len(parts) or parts[i + 1] == '}'):
+            parts[i] = _CSS_DECLARATION_RE.sub(r'\1\2:', part)
+    return ''.join(parts).replace(';}', '}').strip() + '\n'
+
+
+def minify_js(text):
+    """Conservative line-based minifier: drop indentation, blank lines and whole-line comments
+
+    Line breaks are kept so automatic semicolon insertion behaves exactly as
+    in the source.
+    """
+    lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith('//'):
+            lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+def minify_json(text):
+    return json.dumps(json.loads(text), separators=(',', ':'), ensure_ascii=False)
+
+
+MINIFIERS = {
+    '.html': minify_html,
+    '.css': minify_css,
+    '.js': minify_js,
+    '.json': minify_json,
+}
+
+
+def site_files(root='.'):
+    """Relative paths of the site files that exist"""
+    paths = []
+    for pattern in SITE_FILES:
+        paths.extend(sorted(glob.glob(os.path.join(root, pattern))))
+    return [os.path.relpath(path, root) for path in paths]
+
+
+def build_file(src, dest, compress=True):
+    """Minify/copy one file and write its compressed siblings; return the byte counts"""
+    ext = os.path.splitext(src)[1].lower()
+    with open(src, 'rb') as f:
+        data = f.read()
+
+    minifier = MINIFIERS.get(ext)
+    if minifier is not None:
+        data = minifier(data.decode('utf-8')).encode('utf-8')
+
+    os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+    return write_with_siblings(dest, data, compress=compress and ext in COMPRESSIBLE)
+
+
+def write_with_siblings(dest, data, compress=True):
+    """Write bytes plus .gz/.br siblings (when worth it); return the byte counts and whether anything changed"""
+    changed = write_if_changed(dest, data)
+    sizes = {'minified': len(data), 'gz': None, 'br': None}
+
+    if compress and len(data) >= MIN_COMPRESS_BYTES:
+        # mtime=0 keeps the .gz bytes identical across builds
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        changed |= write_if_changed(dest + '.gz', gz)
+        sizes['gz'] = len(gz)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            changed |= write_if_changed(dest + '.br', br)
+            sizes['br'] = len(br)
+    return sizes, changed
+
+
+def remove_stale(out_dir, keep):
+    """Delete files in out_dir that the current build did not produce"""
+    removed = 0
+    for dirpath, _, filenames in os.walk(out_dir, topdown=False):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.relpath(path, out_dir) not in keep:
+                os.remove(path)
+                removed += 1
+        if dirpath != out_dir and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+def main(argv=None):
+    """Main function - build dist/ from the generated site"""
+    parser = argparse.ArgumentParser(description='Build a minified, precompressed copy of the site')
+    parser.add_argument('--out', default=DIST_DIR, help='output directory (default: %(default)s)')
+    parser.add_argument('--no-compress', action='store_true', help='skip the .gz/.br siblings')
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("Production Build - Minifying and precompressing the site")
+    print("=" * 70)
+    print()
+
+    files = site_files()
+    if 'index.html' not in files:
+        print("❌ ERROR: index.html not found - run scraper.py or convert_json_to_html.py first")
+        return 1
+    if brotli is None and not args.no_compress:
+        print("  Info: brotli not installed, writing .gz siblings only (pip install brotli for .br)")
+
+    totals = {'source': 0, 'minified': 0, 'gz': 0, 'br': 0}
+    keep = set()
+    changed = 0
+    for path in files:
+        dest = os.path.join(args.out, path)
+        sizes, file_changed = build_file(path, dest, compress=not args.no_compress)
+        changed += file_changed
+        keep.add(path)
+        for ext in ('gz', 'br'):
+            if sizes[ext] is not None:
+                keep.add(f'{path}.{ext}')
+        totals['source'] += os.path.getsize(path)
+        totals['minified'] += sizes['minified']
+        # Served size: the best encoding available for this file
+        totals['gz'] += sizes['gz'] or sizes['minified']
+        totals['br'] += sizes['br'] or sizes['gz'] or sizes['minified']
+
+    removed = remove_stale(args.out, keep)
+
+    def kb(n):
+        return f"{n / 1024:,.0f} KB"
+
+    print(f"✅ {len(files)} files built into {args.out}/ ({changed} changed, {removed} stale removed)")
+    print(f"   Source:   {kb(totals['source'])}")
+    print(f"   Minified: {kb(totals['minified'])}")
+    if not args.no_compress:
+        print(f"   Gzip:     {kb(totals['gz'])}")
+        if brotli is not None:
+            print(f"   Brotli:   {kb(totals['br'])}")
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
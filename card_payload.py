@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Card payload for the virtualized list - every bill reduced to the values a
+bill card displays, as compact rows in page order (the same order as
+search-index.json). With --virtualize, index.html pre-renders only the first
+cards and virtual.js builds the rest from this file as they scroll into view.
+"""
+
+from output_files import write_json_atomic
+from render import format_date, get_status_class, sort_bills
+
+CARD_PAYLOAD_FILE = 'cards.json'
+CARD_PAYLOAD_VERSION = 1
+
+# Cards pre-rendered into index.html in virtual mode (about the first viewport)
+VIRTUAL_SSR_CARDS = 20
+
+# Sponsors shown on a card before "+N more"
+CARD_SPONSORS = 3
+
+CARD_FIELDS = [
+    'id', 'state_code', 'state_name', 'bill_number', 'title', 'description',
+    'status', 'status_class', 'date', 'last_action', 'url', 'analysis_url',
+    'sponsors', 'more_sponsors',
+]
+
+
+def card_row(bill):
+    """One bill as a row of CARD_FIELDS values"""
+    date = bill.get('last_action_date') or bill.get('status_date') or ''
+    sponsors = bill.get('sponsors', [])
+    return [
+        bill.get('id'),
+        bill.get('state_code', ''),
+        bill.get('state_name', ''),
+        bill.get('bill_number', ''),
+        bill.get('title', ''),
+        bill.get('description', ''),
+        bill.get('status', 'Unknown'),
+        get_status_class(bill.get('status', 'Unknown')),
+        date,
+        format_date(date),
+        bill.get('url', '#'),
+        bill.get('analysis_url') or '',
+        [
+            f"{s.get('name', '')} ({s.get('party')})" if s.get('party') else s.get('name', '')
+            for s in sponsors[:CARD_SPONSORS]
+        ],
+        max(len(sponsors) - CARD_SPONSORS, 0),
+    ]
+
+
+def build_card_payload(bills, last_updated=None):
+    """Payload dict with one row per bill, most recent first"""
+    return {
+        'version': CARD_PAYLOAD_VERSION,
+        'last_updated': last_updated,
+        'fields': CARD_FIELDS,
+        'rows': [card_row(bill) for bill in sort_bills(bills)],
+    }
+
+
+def write_card_payload(path, bills, last_updated=None):
+    """Build the payload and write it as compact JSON"""
+    payload = build_card_payload(bills, last_updated)
+    write_json_atomic(path, payload, separators=(',', ':'), ensure_ascii=False)
+    return payload
+
+
+def virtual_page(bills, ssr_cards=VIRTUAL_SSR_CARDS, payload_url=CARD_PAYLOAD_FILE):
+    """Render options for a page whose list is virtualized from the payload"""
+    return {
+        'cards': sort_bills(bills)[:ssr_cards],
+        'container_attrs': f' data-virtual="{payload_url}" data-total="{len(bills)}"',
+    }
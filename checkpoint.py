@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Scan checkpoints - each jurisdiction's bills are written atomically as soon
+as it finishes, so an interrupted scan can be resumed with --resume instead
+of starting over.
+
+Layout:
+    scan_checkpoints/manifest.json      current generation and its settings
+    scan_checkpoints/<generation>/XX.json   bills (and change hashes) for state XX
+"""
+
+import os
+import json
+import shutil
+from datetime import datetime
+
+from output_files import write_json_atomic
+from metrics import log
+
+CHECKPOINT_DIR = 'scan_checkpoints'
+
+
+class ScanCheckpoint:
+    """Per-state checkpoint files for one scan generation"""
+
+    def __init__(self, directory=CHECKPOINT_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self.generation = None
+        self.settings = {}
+
+    @property
+    def generation_dir(self):
+        return os.path.join(self.directory, self.generation)
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def start(self, resume=False, **settings):
+        """Open the scan generation to write into
+
+        With ``resume`` the latest unfinished generation is reused if it was
+        started with the same settings; otherwise a new generation begins and
+        older checkpoint data is removed. Returns True when resuming.
+        """
+        manifest = self._read_manifest()
+        resumable = (
+            resume and manifest is not None and not manifest.get('complete')
+            and manifest.get('settings') == settings
+        )
+
+        if resumable:
+            self.generation = manifest['generation']
+            self.settings = settings
+            os.makedirs(self.generation_dir, exist_ok=True)
+            return True
+
+        if resume and manifest is not None and manifest.get('settings') != settings:
+            log('checkpoint_reset', "Info: Checkpoint settings differ from this run - starting a new scan generation")
+
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self.generation = datetime.now().strftime('%Y%m%dT%H%M%S')
+        self.settings = settings
+        os.makedirs(self.generation_dir, exist_ok=True)
+        self._write_manifest(complete=False)
+        return False
+
+    def _write_manifest(self, complete):
+        write_json_atomic(self.manifest_path, {
+            'generation': self.generation,
+            'settings': self.settings,
+            'complete': complete,
+        }, indent=2)
+
+    def _state_path(self, state_code):
+        return os.path.join(self.generation_dir, f'{state_code}.json')
+
+    def completed_states(self):
+        """State codes already checkpointed in this generation"""
+        return {
+            name[:-len('.json')] for name in os.listdir(self.generation_dir)
+            if name.endswith('.json')
+        }
+
+    def load(self, state_code):
+        """Return (bills, change_hashes) saved for a state"""
+        with open(self._state_path(state_code), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data['bills'], data.get('hashes', {})
+
+    def save(self, state_code, bills, hashes=None):
+        """Atomically checkpoint one finished state"""
+        write_json_atomic(self._state_path(state_code), {
+            'state_code': state_code,
+            'saved_at': datetime.now().isoformat(),
+            'bills': bills,
+            'hashes': hashes or {},
+        }, ensure_ascii=False)
+
+    def finish(self):
+        """Mark the generation complete so the next --resume starts fresh"""
+        self._write_manifest(complete=True)
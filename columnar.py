@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Columnar bill storage - a compact binary companion to bills.json. Every
+field is a column; state, status and status code values are interned into
+small tables, sponsors and matched terms are deduplicated into tables
+referenced by index, and dates are stored as day numbers. The columns are
+packed with marshal, which loads them several times faster than JSON can
+be parsed. decode_bills() rebuilds the exact bills.json schema (same keys,
+same key order, same values), so the file stands in for bills.json
+wherever the bills are only read: load_snapshot() prefers it when it is
+at least as new as bills.json.
+"""
+
+import os
+import json
+import gzip
+import marshal
+from datetime import date, timedelta
+
+from output_files import write_if_changed
+
+COLUMNAR_FILE = 'bills.columns.bin'
+COLUMNAR_FORMAT = 'bills-columnar'
+COLUMNAR_VERSION = 2
+
+# marshal format 4 is read and written by every Python 3.4+, so files stay portable
+MARSHAL_VERSION = 4
+
+# Low-cardinality fields stored as indexes into a value table
+INTERNED_FIELDS = ('state_code', 'state_name', 'status', 'status_code')
+
+# 'YYYY-MM-DD' fields stored as days since 1970-01-01
+DATE_FIELDS = ('status_date', 'last_action_date')
+
+# Sponsors with exactly these keys are stored as value lists instead of dicts
+SPONSOR_FIELDS = ('name', 'party', 'role')
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _encode_date(value):
+    """Day number for a canonical ISO date; strings and None unchanged; anything else boxed in a list"""
+    if isinstance(value, str) and len(value) == 10:
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            return value
+        if day.isoformat() == value:
+            return (day - _EPOCH).days
+    if value is None or isinstance(value, str):
+        return value
+    return [value]
+
+
+def _decode_date(value):
+    if isinstance(value, int):
+        return (_EPOCH + timedelta(days=value)).isoformat()
+    if isinstance(value, list):
+        return value[0]
+    return value
+
+
+class _Table:
+    """Deduplicating value table; index() returns a value's position"""
+
+    def __init__(self):
+        self.values = []
+        self.positions = {}
+
+    def index(self, value, key=None):
+        key = value if key is None else key
+        position = self.positions.get(key)
+        if position is None:
+            position = self.positions[key] = len(self.values)
+            self.values.append(value)
+        return position
+
+
+def _sponsor_entry(sponsor):
+    """Table entry and dedupe key for one sponsor dict"""
+    if tuple(sponsor) == SPONSOR_FIELDS:
+        values = [sponsor[field] for field in SPONSOR_FIELDS]
+        return values, json.dumps(values)
+    return sponsor, json.dumps(sponsor, sort_keys=False)
+
+
+def encode_bills(bills, last_updated=None):
+    """Columnar dict for a list of bills.json bills"""
+    layouts = _Table()
+    layout_column = []
+    columns = {}
+    interned = {field: _Table() for field in INTERNED_FIELDS}
+    sponsors = _Table()
+    terms = _Table()
+
+    for position, bill in enumerate(bills):
+        keys = tuple(bill)
+        layout_column.append(layouts.index(list(keys), keys))
+        for key in keys:
+            if key not in columns:
+                # Bills before this one lacked the key; their layout skips the placeholder
+                columns[key] = [None] * position
+        for key, column in columns.items():
+            if key not in bill:
+                column.append(None)
+                continue
+            value = bill[key]
+            if key in interned:
+                value = interned[key].index(value, json.dumps(value))
+            elif key in DATE_FIELDS:
+                value = _encode_date(value)
+            elif key == 'sponsors' and isinstance(value, list):
+                value = [sponsors.index(*_sponsor_entry(s)) for s in value]
+            elif key == 'matched_terms' and isinstance(value, list):
+                value = [terms.index(term) for term in value]
+            column.append(value)
+
+    return {
+        'format': COLUMNAR_FORMAT,
+        'version': COLUMNAR_VERSION,
+        'last_updated': last_updated,
+        'count': len(bills),
+        'layouts': layouts.values,
+        'layout': layout_column,
+        'tables': dict(
+            {field: table.values for field, table in interned.items()},
+            sponsors=sponsors.values,
+            matched_terms=terms.values,
+        ),
+        'columns': columns,
+    }
+
+
+class BillColumns:
+    """Read-only view of encode_bills() output
+
+    column() decodes a single field for every bill, so callers that only
+    need a few fields (counts per state, date ranges) never build the bill
+    dicts; bills() rebuilds the full bills.json list.
+    """
+
+    def __init__(self, data):
+        if data.get('format') != COLUMNAR_FORMAT or data.get('version') != COLUMNAR_VERSION:
+            raise ValueError(f"not a {COLUMNAR_FORMAT} v{COLUMNAR_VERSION} file")
+        self.data = data
+        self.last_updated = data.get('last_updated')
+        self._decoded = {}
+
+    def __len__(self):
+        return self.data['count']
+
+    @property
+    def fields(self):
+        return list(self.data['columns'])
+
+    def column(self, key):
+        """Decoded values of one field, one per bill (None where a bill lacks it)"""
+        if key not in self._decoded:
+            self._decoded[key] = self._decode(key, self.data['columns'][key])
+        return self._decoded[key]
+
+    def _decode(self, key, column):
+        tables = self.data['tables']
+        if key in INTERNED_FIELDS:
+            table = tables[key]
+            return [table[i] if i is not None else None for i in column]
+        if key in DATE_FIELDS:
+            # Far fewer distinct days than bills, so convert each value once
+            try:
+                days = {value: _decode_date(value) for value in set(column)}
+            except TypeError:  # a boxed non-date value
+                return [_decode_date(value) for value in column]
+            return list(map(days.__getitem__, column))
+        if key == 'sponsors':
+            # Build each distinct sponsor once; every bill gets its own copy
+            entries = [dict(zip(SPONSOR_FIELDS, entry)) if isinstance(entry, list) else entry
+                       for entry in tables['sponsors']]
+            return [[entries[i].copy() for i in value] if isinstance(value, list) else value
+                    for value in column]
+        if key == 'matched_terms':
+            terms = tables['matched_terms']
+            return [[terms[i] for i in value] if isinstance(value, list) else value for value in column]
+        return column
+
+    def bills(self):
+        """Every bill as a bills.json dict, keys in their original order"""
+        layouts = self.data['layouts']
+        if len(layouts) == 1:
+            # Every bill has the same keys: zip the columns into rows at C speed
+            keys = layouts[0]
+            return [dict(zip(keys, row)) for row in zip(*(self.column(key) for key in keys))]
+        return [
+            {key: self.column(key)[position] for key in layouts[layout]}
+            for position, layout in enumerate(self.data['layout'])
+        ]
+
+
+def decode_bills(data):
+    """Rebuild (bills, last_updated) from encode_bills() output"""
+    columns = BillColumns(data)
+    return columns.bills(), columns.last_updated
+
+
+def write_columnar(path, bills, last_updated=None):
+    """Write the columnar file (gzipped when path ends in .gz); return True if it changed"""
+    payload = marshal.dumps(encode_bills(bills, last_updated), MARSHAL_VERSION)
+    if path.endswith('.gz'):
+        # mtime=0 so identical bills produce identical bytes
+        payload = gzip.compress(payload, compresslevel=6, mtime=0)
+    return write_if_changed(path, payload)
+
+
+def _read_columnar(path):
+    with open(path, 'rb') as f:
+        payload = f.read()
+    if path.endswith('.gz'):
+        payload = gzip.decompress(payload)
+    try:
+        data = marshal.loads(payload)
+    except (EOFError, ValueError, TypeError) as e:
+        raise ValueError(f"{path} is not a columnar bills file: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} is not a columnar bills file")
+    return data
+
+
+def is_columnar_path(path):
+    return path.endswith(('.bin', '.bin.gz'))
+
+
+def load_columns(path=COLUMNAR_FILE):
+    """Open a columnar file as a BillColumns view"""
+    return BillColumns(_read_columnar(path))
+
+
+def load_columnar(path=COLUMNAR_FILE):
+    """Load (bills, last_updated) from a columnar file"""
+    return decode_bills(_read_columnar(path))
+
+
+def load_bills_file(path):
+    """(bills, last_updated) from either bills.json or a columnar file"""
+    if is_columnar_path(path):
+        return load_columnar(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('bills', []), data.get('last_updated')
+
+
+def load_snapshot(path='bills.json', columnar_path=None):
+    """(bills, last_updated) of a bills.json snapshot, read from its columnar copy when that is current
+
+    The copy (COLUMNAR_FILE for bills.json) is used when it is at least as
+    new as the snapshot, so a hand-edited bills.json always wins; a
+    missing, unreadable or stale copy falls back to parsing the JSON.
+    Raises FileNotFoundError when the snapshot is missing and
+    JSONDecodeError when it is broken.
+    """
+    if columnar_path is None and os.path.basename(path) == 'bills.json':
+        columnar_path = os.path.join(os.path.dirname(path), COLUMNAR_FILE)
+    try:
+        if columnar_path and os.path.getmtime(columnar_path) >= os.path.getmtime(path):
+            return load_columnar(columnar_path)
+    except (OSError, ValueError):
+        pass
+    return load_bills_file(path)
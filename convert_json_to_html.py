@@ -1,408 +1,26 @@
 #!/usr/bin/env python3
 """
 Quick HTML Generator - Converts existing bills.json to SSR index.html
-Use this if you already have a recent bills.json file
+Use this if you already have a recent bills.json file (or its columnar copy or
+the bill store, via --input bills.columns.bin / --input bills.sqlite)
 """
 
+import os
 import json
+import argparse
 from datetime import datetime
 
-def escape_html(text):
-    """Escape HTML special characters"""
-    if not text:
-        return ''
-    return (str(text)
-            .replace('&', '&amp;')
-            .replace('<', '&lt;')
-            .replace('>', '&gt;')
-            .replace('"', '&quot;')
-            .replace("'", '&#39;'))
+from bill_db import BillStore
+from columnar import load_bills_file
+from paginate import add_output_args, html_outputs, write_frontend
 
-def get_status_class(status):
-    """Get CSS class for bill status"""
-    status_lower = status.lower()
-    
-    if 'introduced' in status_lower:
-        return 'status-introduced'
-    if 'committee' in status_lower:
-        return 'status-committee'
-    if 'passed' in status_lower:
-        return 'status-passed'
-    if 'enacted' in status_lower or 'signed' in status_lower:
-        return 'status-enacted'
-    
-    return 'status-introduced'
-
-def format_date(date_str):
-    """Format date string"""
-    if not date_str:
-        return 'Unknown'
-    
-    try:
-        date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        return date.strftime('%b %d, %Y')
-    except:
-        return date_str
-
-def generate_bill_card_html(bill):
-    """Generate HTML for a single bill card"""
-    status_class = get_status_class(bill.get('status', 'Unknown'))
-    sponsors = bill.get('sponsors', [])[:3]
-    has_more_sponsors = len(bill.get('sponsors', [])) > 3
-    
-    date_to_use = bill.get('last_action_date') or bill.get('status_date')
-    last_action_date = format_date(date_to_use)
-    
-    is_federal = bill.get('state_code') == 'US'
-    state_badge_class = 'state-badge-federal' if is_federal else 'state-badge-state'
-    
-    # Build sponsors HTML
-    sponsors_html = ''
-    if sponsors:
-        sponsor_tags = []
-        for sponsor in sponsors:
-            party = f" ({escape_html(sponsor.get('party'))})" if sponsor.get('party') else ''
-            sponsor_tags.append(f'<span class="sponsor-tag">{escape_html(sponsor.get("name", ""))}{party}</span>')
-        
-        if has_more_sponsors:
-            sponsor_tags.append(f'<span class="sponsor-tag">+{len(bill.get("sponsors", [])) - 3} more</span>')
-        
-        sponsors_html = f'''
-            <div class="bill-sponsors">
-                <strong>Sponsors:</strong>
-                <div class="sponsor-list">
-                    {' '.join(sponsor_tags)}
-                </div>
-            </div>
-        '''
-    
-    # Build analysis button HTML
-    if bill.get('analysis_url'):
-        analysis_btn = f'''
-            <a href="{escape_html(bill['analysis_url'])}" target="_blank" rel="noopener noreferrer" class="btn btn-analysis">
-                Read BMDE Analysis
-            </a>
-        '''
-    else:
-        analysis_btn = '''
-            <span class="btn btn-disabled" title="Analysis coming soon">
-                Analysis Pending
-            </span>
-        '''
-    
-    return f'''
-        <article class="bill-card" data-state="{escape_html(bill.get('state_name', ''))}" data-state-code="{escape_html(bill.get('state_code', ''))}" data-status="{escape_html(bill.get('status', ''))}" data-date="{escape_html(date_to_use or '')}">
-            <div class="bill-header">
-                <div class="bill-title">
-                    <div class="bill-meta-top">
-                        <span class="state-badge {state_badge_class}">{escape_html(bill.get('state_name', ''))}</span>
-                        <span class="bill-number">{escape_html(bill.get('bill_number', ''))}</span>
-                    </div>
-                    <h3>{escape_html(bill.get('title', ''))}</h3>
-                </div>
-                <div class="bill-status {status_class}">
-                    {escape_html(bill.get('status', 'Unknown'))}
-                </div>
-            </div>
-            
-            <p class="bill-description">
-                {escape_html(bill.get('description', ''))}
-            </p>
-            
-            <div class="bill-meta">
-                <div class="bill-meta-item">
-                    <strong>Last Action:</strong> {escape_html(last_action_date)}
-                </div>
-            </div>
-            
-            {sponsors_html}
-            
-            <div class="bill-actions">
-                <a href="{escape_html(bill.get('url', '#'))}" target="_blank" rel="noopener noreferrer" class="btn btn-secondary">
-                    View on LegiScan
-                </a>
-                {analysis_btn}
-            </div>
-        </article>
-    '''
-
-def generate_html(bills, last_updated):
-    """Generate complete HTML file with pre-rendered bills"""
-    
-    # Sort bills by most recent first
-    bills.sort(key=lambda x: x.get('last_action_date') or x.get('status_date') or '', reverse=True)
-    
-    # Calculate stats
-    total_bills = len(bills)
-    states_with_bills = set(bill.get('state_name', '') for bill in bills if bill.get('state_name'))
-    total_states = len(states_with_bills)
-    
-    active_bills = [
-        b for b in bills 
-        if not any(term in b.get('status', '').lower() for term in ['enacted', 'vetoed', 'failed', 'dead'])
-    ]
-    active_count = len(active_bills)
-    
-    analyzed_bills = [b for b in bills if b.get('analysis_url')]
-    analyzed_count = len(analyzed_bills)
-    
-    # Format last updated
-    try:
-        last_updated_formatted = datetime.fromisoformat(last_updated.replace('Z', '+00:00')).strftime('%B %d, %Y at %I:%M %p')
-    except:
-        last_updated_formatted = last_updated
-    
-    # Generate bill cards HTML
-    bill_cards_html = '\n'.join(generate_bill_card_html(bill) for bill in bills)
-    
-    # Generate state options for filter
-    sorted_states = sorted([s for s in states_with_bills if s != 'Federal'])
-    state_options_html = '\n'.join(
-        f'<option value="{escape_html(state)}">{escape_html(state)}</option>'
-        for state in sorted_states
-    )
-    
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    
-    <!-- Primary Meta Tags -->
-    <title>Cannabis Legislation Tracker - Real-Time Bills Across All 50 States | Dan K Reports</title>
-    <meta name="title" content="Cannabis Legislation Tracker - Real-Time Bills Across All 50 States | Dan K Reports">
-    <meta name="description" content="Track cannabis legislation in real-time across all 50 states and federal government. Monitor bills, status changes, and legislative progress with data-driven BMDE analysis.">
-    <meta name="keywords" content="cannabis legislation, marijuana bills, cannabis policy tracker, legalization tracker, cannabis reform, state cannabis laws, federal cannabis bills, BMDE, Black Market Death Equation, cannabis market analysis">
-    <meta name="author" content="Daniel Kief">
-    <meta name="robots" content="index, follow, max-image-preview:large, max-snippet:-1, max-video-preview:-1">
-    <link rel="canonical" href="https://tracker.dankreports.com/">
-    
-    <!-- Open Graph / Facebook Meta Tags -->
-    <meta property="og:type" content="website">
-    <meta property="og:url" content="https://tracker.dankreports.com/">
-    <meta property="og:title" content="Cannabis Legislation Tracker - Real-Time Bills Across All 50 States">
-    <meta property="og:description" content="Track cannabis legislation in real-time across all 50 states and federal government. Monitor bills, status changes, and legislative progress with data-driven BMDE analysis.">
-    <meta property="og:image" content="https://tracker.dankreports.com/og-image.jpg">
-    <meta property="og:image:width" content="1200">
-    <meta property="og:image:height" content="630">
-    <meta property="og:site_name" content="Dan K Reports - Cannabis Legislation Tracker">
-    
-    <!-- Twitter Card Meta Tags -->
-    <meta name="twitter:card" content="summary_large_image">
-    <meta name="twitter:url" content="https://tracker.dankreports.com/">
-    <meta name="twitter:title" content="Cannabis Legislation Tracker - Real-Time Bills Across All 50 States">
-    <meta name="twitter:description" content="Track cannabis legislation in real-time across all 50 states and federal government with BMDE analysis.">
-    <meta name="twitter:image" content="https://tracker.dankreports.com/og-image.jpg">
-    
-    <!-- Additional SEO Meta Tags -->
-    <meta name="theme-color" content="#2ecc71">
-    <meta name="apple-mobile-web-app-capable" content="yes">
-    <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
-    <meta name="apple-mobile-web-app-title" content="Cannabis Tracker">
-    
-    <!-- Favicon -->
-    <link rel="icon" type="image/png" href="logo.png">
-    <link rel="apple-touch-icon" href="logo.png">
-    
-    <!-- Preconnect for Performance -->
-    <link rel="preconnect" href="https://www.dankreports.com">
-    <link rel="dns-prefetch" href="https://www.dankreports.com">
-    
-    <!-- Stylesheet -->
-    <link rel="stylesheet" href="style.css">
-    
-    <!-- Structured Data / Schema.org JSON-LD -->
-    <script type="application/ld+json">
-    {{
-      "@context": "https://schema.org",
-      "@graph": [
-        {{
-          "@type": "WebApplication",
-          "@id": "https://tracker.dankreports.com/#webapp",
-          "name": "Cannabis Legislation Tracker",
-          "applicationCategory": "GovernmentApplication",
-          "operatingSystem": "Web Browser",
-          "url": "https://tracker.dankreports.com/",
-          "description": "Real-time tracking of cannabis legislation across all 50 states and federal government using LegiScan API with data-driven CBDT Framework analysis.",
-          "offers": {{
-            "@type": "Offer",
-            "price": "0",
-            "priceCurrency": "USD"
-          }},
-          "author": {{
-            "@type": "Person",
-            "name": "Daniel Kief"
-          }},
-          "publisher": {{
-            "@type": "Organization",
-            "name": "Dan K Reports",
-            "url": "https://www.dankreports.com/"
-          }},
-          "featureList": [
-            "Real-time cannabis bill tracking across all 50 states",
-            "Federal cannabis legislation monitoring",
-            "LegiScan API integration for up-to-date data",
-            "CBDT Framework analysis integration",
-            "Advanced filtering by state, status, and keywords",
-            "Bill status tracking and legislative progress"
-          ]
-        }},
-        {{
-          "@type": "WebSite",
-          "@id": "https://tracker.dankreports.com/#website",
-          "url": "https://tracker.dankreports.com/",
-          "name": "Cannabis Legislation Tracker",
-          "description": "Track cannabis legislation across America in real-time",
-          "publisher": {{
-            "@id": "https://www.dankreports.com/#organization"
-          }},
-          "potentialAction": {{
-            "@type": "SearchAction",
-            "target": {{
-              "@type": "EntryPoint",
-              "urlTemplate": "https://tracker.dankreports.com/?search={{search_term_string}}"
-            }},
-            "query-input": "required name=search_term_string"
-          }}
-        }},
-        {{
-          "@type": "Organization",
-          "@id": "https://www.dankreports.com/#organization",
-          "name": "Dan K Reports",
-          "url": "https://www.dankreports.com/"
-        }},
-        {{
-          "@type": "BreadcrumbList",
-          "@id": "https://tracker.dankreports.com/#breadcrumb",
-          "itemListElement": [
-            {{
-              "@type": "ListItem",
-              "position": 1,
-              "name": "Home",
-              "item": "https://www.dankreports.com/"
-            }},
-            {{
-              "@type": "ListItem",
-              "position": 2,
-              "name": "Cannabis Legislation Tracker",
-              "item": "https://tracker.dankreports.com/"
-            }}
-          ]
-        }}
-      ]
-    }}
-    </script>
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="header-content">
-                <div class="header-title-row">
-                    <img src="logo.png" alt="Dan K Reports Logo" class="header-logo">
-                    <div class="header-text">
-                        <h1>Cannabis Legislation Tracker</h1>
-                        <p class="subtitle">All 50 States + Federal - Real-time tracking with data-driven analysis</p>
-                    </div>
-                </div>
-            </div>
-            <div class="header-meta">
-                <span class="last-updated">Last Updated: <time datetime="{escape_html(last_updated)}">{escape_html(last_updated_formatted)}</time></span>
-                <a href="https://www.dankreports.com" class="btn-primary" rel="noopener noreferrer">Visit Dan K Reports</a>
-            </div>
-        </div>
-    </header>
-
-    <main class="container">
-        <section class="intro">
-            <h2>Track Cannabis Policy Across America</h2>
-            <p>
-                This tracker monitors cannabis legislation across all 50 states and the federal government using the LegiScan API, 
-                providing up-to-date information on bills, status changes, and legislative progress. 
-                For in-depth analysis of significant bills, visit 
-                <a href="https://www.dankreports.com" rel="noopener noreferrer">Dan K Reports</a> where we apply 
-                the Black Market Death Equation (BMDE) to predict policy outcomes.
-            </p>
-        </section>
-
-        <section class="filters">
-            <h3>Filter Bills</h3>
-            <div class="filter-controls">
-                <input type="text" id="searchInput" placeholder="Search bills by title, description, or bill number..." aria-label="Search bills">
-                
-                <select id="stateFilter" aria-label="Filter by state">
-                    <option value="all">All States + Federal</option>
-                    <option value="US">Federal Only</option>
-                    <optgroup label="States">
-                        {state_options_html}
-                    </optgroup>
-                </select>
-
-                <select id="statusFilter" aria-label="Filter by status">
-                    <option value="all">All Statuses</option>
-                    <option value="introduced">Introduced</option>
-                    <option value="committee">In Committee</option>
-                    <option value="passed">Passed</option>
-                    <option value="enacted">Enacted</option>
-                </select>
-
-                <select id="sortOrder" aria-label="Sort order">
-                    <option value="recent">Most Recent</option>
-                    <option value="oldest">Oldest First</option>
-                    <option value="state">By State</option>
-                    <option value="alphabetical">By Bill Number</option>
-                </select>
-            </div>
-        </section>
-
-        <section class="stats">
-            <div class="stat-card">
-                <h4>Total Bills</h4>
-                <p class="stat-number">{total_bills}</p>
-            </div>
-            <div class="stat-card">
-                <h4>States Tracked</h4>
-                <p class="stat-number">{total_states}</p>
-            </div>
-            <div class="stat-card">
-                <h4>Active Bills</h4>
-                <p class="stat-number">{active_count}</p>
-            </div>
-            <div class="stat-card">
-                <h4>With Analysis</h4>
-                <p class="stat-number">{analyzed_count}</p>
-            </div>
-        </section>
-
-        <section class="bills-list">
-            <h2>Current Cannabis Bills</h2>
-            <div id="billsContainer">
-                {bill_cards_html}
-            </div>
-            <div id="noResults" class="no-results" style="display: none;">
-                <p>No bills found matching your criteria.</p>
-            </div>
-        </section>
-    </main>
-
-    <footer>
-        <div class="container">
-            <p>&copy; 2025 Daniel Kief. All rights reserved.</p>
-            <p>
-                <a href="https://www.dankreports.com" rel="noopener noreferrer">Dan K Reports</a> | 
-                <a href="/sitemap.xml">Sitemap</a>
-            </p>
-        </div>
-    </footer>
-
-    <script src="app.js"></script>
-</body>
-</html>
-'''
-    
-    return html
-
-def main():
+def main(argv=None):
     """Main function - load bills.json and generate index.html"""
+    parser = argparse.ArgumentParser(description='Render index.html from an existing bills.json')
+    parser.add_argument('--input', default='bills.json',
+                        help='bills.json, a columnar bills file or the bill store (default: %(default)s)')
+    add_output_args(parser)
+    args = parser.parse_args(argv)
     
     print("=" * 70)
     print("Quick HTML Generator - Converting bills.json to index.html")
@@ -411,37 +29,41 @@ def main():
     
     # Load bills.json
     try:
-        with open('bills.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if args.input.endswith('.sqlite'):
+            if not os.path.exists(args.input):
+                raise FileNotFoundError(args.input)
+            with BillStore(args.input) as store:
+                bills, last_updated = store.bills(), store.last_updated
+        else:
+            bills, last_updated = load_bills_file(args.input)
     except FileNotFoundError:
-        print("❌ ERROR: bills.json not found!")
+        print(f"❌ ERROR: {args.input} not found!")
         print()
         print("Make sure bills.json is in the same directory as this script.")
         return
-    except json.JSONDecodeError as e:
-        print(f"❌ ERROR: Invalid JSON in bills.json: {e}")
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"❌ ERROR: Cannot read {args.input}: {e}")
         return
     
-    bills = data.get('bills', [])
-    last_updated = data.get('last_updated', datetime.now().isoformat())
+    last_updated = last_updated or datetime.now().isoformat()
     
     if not bills:
-        print("❌ ERROR: No bills found in bills.json")
+        print(f"❌ ERROR: No bills found in {args.input}")
         return
     
-    print(f"✅ Loaded {len(bills)} bills from bills.json")
+    print(f"✅ Loaded {len(bills)} bills from {args.input}")
     print(f"   Last updated: {last_updated}")
     print()
     
-    # Generate HTML
+    # Generate and save HTML
     print("🔨 Generating index.html...")
-    html_content = generate_html(bills, last_updated)
-    
-    # Save HTML
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print("✅ index.html created successfully!")
+    pages = write_frontend(bills, last_updated, page_size=args.paginate, virtual=args.virtualize)
+    if pages > 1:
+        print(f"✅ index.html and {pages - 1} page/state shards created successfully!")
+    else:
+        print("✅ index.html created successfully!")
+    for output in html_outputs(args.paginate, args.virtualize):
+        print(f"   - {output}")
     print()
     print("=" * 70)
     print("SUCCESS!")
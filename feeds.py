@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Bill change feeds - each scan is diffed against the previous snapshot (new
+and removed bill ids, status_code and last_action_date changes) and the
+changes are added to rolling Atom and JSON Feed files, one for every
+jurisdiction plus one for all of them. Subscribers fetch a few KB instead
+of polling index.html. Entries are kept in feed_entries.json between runs;
+each feed holds at most the FEED_WINDOW newest entries.
+"""
+
+import os
+import json
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+from output_files import write_if_changed, write_json_atomic
+from render import SITE_URL
+
+FEED_DIR = 'feeds'
+FEED_ENTRIES_FILE = 'feed_entries.json'
+
+# Entries per feed (and per jurisdiction in feed_entries.json)
+FEED_WINDOW = 100
+
+FEED_TITLE = 'Cannabis Bill Updates | Dan K Reports'
+FEED_AUTHOR = 'Dan K Reports'
+
+
+def diff_bills(previous, current):
+    """(event, old bill, new bill) for every change between two bill lists
+
+    Both lists are indexed by id once, so the diff is linear in the number
+    of bills. A status change takes precedence over a new last action.
+    """
+    old_by_id = {bill.get('id'): bill for bill in previous}
+    changes = []
+    seen = set()
+    for bill in current:
+        bill_id = bill.get('id')
+        seen.add(bill_id)
+        old = old_by_id.get(bill_id)
+        if old is None:
+            changes.append(('new', None, bill))
+        elif old.get('status_code') != bill.get('status_code'):
+            changes.append(('status', old, bill))
+        elif old.get('last_action_date') != bill.get('last_action_date'):
+            changes.append(('action', old, bill))
+    changes.extend(('removed', old, None) for bill_id, old in old_by_id.items() if bill_id not in seen)
+    return changes
+
+
+def feed_timestamp(value):
+    """RFC 3339 timestamp for an ISO last_updated value (naive values are local time)"""
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        moment = datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.replace(microsecond=0).isoformat()
+
+
+def feed_entry(event, old, new, updated):
+    """One feed entry (a plain dict, as kept in feed_entries.json)"""
+    bill = new or old
+    label = f"{bill.get('state_code', '')} {bill.get('bill_number', '')}".strip()
+    if event == 'new':
+        title = f"{label}: new bill ({bill.get('status', 'Unknown')})"
+        key = bill.get('status_code')
+    elif event == 'status':
+        title = f"{label}: {old.get('status', 'Unknown')} → {bill.get('status', 'Unknown')}"
+        key = bill.get('status_code')
+    elif event == 'action':
+        title = f"{label}: {bill.get('last_action') or 'new action'}"
+        key = bill.get('last_action_date')
+    else:
+        title = f"{label}: no longer tracked"
+        key = 'removed'
+
+    summary = bill.get('title', '')
+    action_date = bill.get('last_action_date') or bill.get('status_date')
+    if bill.get('last_action') and action_date:
+        summary += f" (last action {action_date}: {bill['last_action']})"
+    return {
+        'id': f"{SITE_URL}#bill-{bill.get('id')}-{event}-{key}-{updated[:10]}",
+        'bill_id': bill.get('id'),
+        'state_code': bill.get('state_code', ''),
+        'state_name': bill.get('state_name', ''),
+        'event': event,
+        'title': title,
+        'summary': summary,
+        'url': bill.get('url') or SITE_URL,
+        'updated': updated,
+    }
+
+
+def trim_entries(entries, window=FEED_WINDOW):
+    """Keep the newest ``window`` entries of every jurisdiction (entries are newest first)"""
+    kept = []
+    per_state = {}
+    for entry in entries:
+        count = per_state.get(entry['state_code'], 0)
+        if count < window:
+            kept.append(entry)
+            per_state[entry['state_code']] = count + 1
+    return kept
+
+
+def feed_url(state_code=None, ext='atom'):
+    """Site-relative URL of the combined feed or one jurisdiction's feed"""
+    name = state_code.lower() if state_code else 'all'
+    return f'{FEED_DIR}/{name}.{ext}'
+
+
+def render_atom(entries, title, state_code=None):
+    """Atom 1.0 document; <updated> is the newest entry's time so unchanged feeds keep their bytes"""
+    self_url = SITE_URL + feed_url(state_code, 'atom')
+    updated = entries[0]['updated'] if entries else '1970-01-01T00:00:00+00:00'
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom">',
+        f'    <title>{escape(title)}</title>',
+        f'    <id>{escape(self_url)}</id>',
+        f'    <link rel="self" href="{escape(self_url)}"/>',
+        f'    <link rel="alternate" href="{escape(SITE_URL)}"/>',
+        f'    <updated>{updated}</updated>',
+        f'    <author><name>{escape(FEED_AUTHOR)}</name></author>',
+    ]
+    for entry in entries:
+        lines.extend([
+            '    <entry>',
+            f'        <title>{escape(entry["title"])}</title>',
+            f'        <id>{escape(entry["id"])}</id>',
+            f'        <link href="{escape(entry["url"])}"/>',
+            f'        <updated>{entry["updated"]}</updated>',
+            f'        <category term="{escape(entry["state_code"])}" label="{escape(entry["state_name"])}"/>',
+            f'        <summary>{escape(entry["summary"])}</summary>',
+            '    </entry>',
+        ])
+    lines.append('</feed>')
+    return '\n'.join(lines) + '\n'
+
+
+def render_json_feed(entries, title, state_code=None):
+    """JSON Feed 1.1 document"""
+    return json.dumps({
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': title,
+        'home_page_url': SITE_URL,
+        'feed_url': SITE_URL + feed_url(state_code, 'json'),
+        'authors': [{'name': FEED_AUTHOR}],
+        'items': [
+            {
+                'id': entry['id'],
+                'url': entry['url'],
+                'title': entry['title'],
+                'content_text': entry['summary'],
+                'date_published': entry['updated'],
+                'tags': [entry['state_code'], entry['event']],
+                '_bill': {'id': entry['bill_id'], 'state_code': entry['state_code'], 'event': entry['event']},
+            }
+            for entry in entries
+        ],
+    }, indent=1, ensure_ascii=False) + '\n'
+
+
+def load_entries(path=FEED_ENTRIES_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('entries', [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def write_feeds(changes, last_updated, out_dir='.', entries_path=FEED_ENTRIES_FILE, window=FEED_WINDOW):
+    """Add ``changes`` (from diff_bills) to the rolling feeds; return the number of feeds rewritten"""
+    updated = feed_timestamp(last_updated)
+    added = [feed_entry(event, old, new, updated) for event, old, new in changes]
+    entries = trim_entries(added + load_entries(entries_path), window)
+    write_json_atomic(entries_path, {'entries': entries}, indent=1, ensure_ascii=False)
+
+    by_state = {}
+    for entry in entries:
+        by_state.setdefault(entry['state_code'], []).append(entry)
+    feeds = [(None, FEED_TITLE, entries[:window])]
+    feeds.extend(
+        (code, f"{state_entries[0]['state_name'] or code} {FEED_TITLE}", state_entries)
+        for code, state_entries in sorted(by_state.items()) if code
+    )
+
+    os.makedirs(os.path.join(out_dir, FEED_DIR), exist_ok=True)
+    changed = 0
+    for code, title, feed_entries in feeds:
+        changed += write_if_changed(os.path.join(out_dir, *feed_url(code, 'atom').split('/')),
+                                    render_atom(feed_entries, title, code))
+        changed += write_if_changed(os.path.join(out_dir, *feed_url(code, 'json').split('/')),
+                                    render_json_feed(feed_entries, title, code))
+    return changed
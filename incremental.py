@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Incremental scraping support - tracks LegiScan change_hash values per bill
+so unchanged bills can be merged from the previous bills.json snapshot
+(read from its columnar copy when that is current) instead of being
+fetched again with getBill.
+"""
+
+import json
+import threading
+
+from columnar import load_snapshot
+from output_files import write_json_atomic
+
+SCRAPE_STATE_FILE = 'scrape_state.json'
+
+
+class ScrapeState:
+    """Per-bill change_hash store backing incremental scans"""
+
+    def __init__(self, state_path=SCRAPE_STATE_FILE, snapshot_path='bills.json'):
+        self.state_path = state_path
+        self.snapshot_path = snapshot_path
+        self.hashes = {}
+        self.previous_bills = {}
+        self.new_hashes = {}
+        self.reused = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Load stored hashes and the previous snapshot; missing files mean a cold start"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.hashes = json.load(f).get('bills', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.hashes = {}
+
+        try:
+            bills = load_snapshot(self.snapshot_path)[0]
+        except (FileNotFoundError, json.JSONDecodeError):
+            bills = []
+        self.previous_bills = {str(bill.get('id')): bill for bill in bills}
+        return self
+
+    def cached_bill(self, bill_id, change_hash):
+        """Return the previous bill if its change_hash is unchanged, else None"""
+        key = str(bill_id)
+        if not change_hash or self.hashes.get(key) != change_hash:
+            return None
+        bill = self.previous_bills.get(key)
+        if bill is not None:
+            self.record(bill_id, change_hash)
+            with self.lock:
+                self.reused += 1
+        return bill
+
+    def previous_analysis_url(self, bill_id):
+        """Return the hand-curated analysis_url from the previous snapshot"""
+        bill = self.previous_bills.get(str(bill_id))
+        return bill.get('analysis_url') if bill else None
+
+    def record(self, bill_id, change_hash):
+        """Remember the hash of a bill that is part of the new snapshot"""
+        if not change_hash:
+            return
+        with self.lock:
+            self.new_hashes[str(bill_id)] = change_hash
+
+    def hashes_for(self, bills):
+        """Recorded hashes for a list of bills (used by scan checkpoints)"""
+        with self.lock:
+            return {
+                str(bill['id']): self.new_hashes[str(bill['id'])]
+                for bill in bills if str(bill['id']) in self.new_hashes
+            }
+
+    def restore(self, hashes):
+        """Re-record hashes loaded from a scan checkpoint"""
+        with self.lock:
+            self.new_hashes.update(hashes)
+
+    def carry(self, bills):
+        """Keep the stored hashes of previous bills that were carried over without a scan"""
+        with self.lock:
+            self.new_hashes.update(
+                (str(bill['id']), self.hashes[str(bill['id'])])
+                for bill in bills if str(bill['id']) in self.hashes
+            )
+
+    def save(self):
+        """Persist hashes for the snapshot that was just written"""
+        write_json_atomic(self.state_path, {'bills': self.new_hashes}, indent=2, sort_keys=True)
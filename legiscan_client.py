@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+LegiScan API client - one pooled keep-alive session for every op, with
+rate limiting, retries (exponential backoff + jitter on 429/5xx and
+connection errors), an optional on-disk response cache and per-op
+latency, byte, throttle and backoff counters.
+"""
+
+import time
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = 'https://api.legiscan.com/?key={}&op={}'
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LegiScanError(Exception):
+    """Raised when a LegiScan call fails after all retries or returns an API error"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every worker making API calls"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it; return the seconds spent waiting"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class OpStats:
+    """Call, retry, error, latency and byte counters for one API op
+
+    ``total_seconds`` is time spent in HTTP requests; ``parse_seconds``
+    decoding JSON; ``throttle_seconds`` waiting for the rate limiter and
+    ``backoff_seconds`` sleeping between retries.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.revalidated = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.parse_seconds = 0.0
+        self.throttle_seconds = 0.0
+        self.backoff_seconds = 0.0
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'retries': self.retries,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'revalidated': self.revalidated,
+            'avg_ms': round(self.total_seconds / self.calls * 1000, 1) if self.calls else 0.0,
+            'max_ms': round(self.max_seconds * 1000, 1),
+            'network_seconds': round(self.total_seconds, 3),
+            'bytes': self.bytes,
+            'parse_seconds': round(self.parse_seconds, 3),
+            'throttle_seconds': round(self.throttle_seconds, 3),
+            'backoff_seconds': round(self.backoff_seconds, 3),
+        }
+
+
+class LegiScanClient:
+    """Wraps all LegiScan operations behind one pooled HTTP session"""
+
+    def __init__(self, api_key, base_url=DEFAULT_BASE_URL, limiter=None, max_retries=3,
+                 backoff=0.5, max_backoff=30.0, timeout=30, pool_size=10, cache=None, offline=False):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _op_stats(self, op):
+        with self.lock:
+            return self.stats.setdefault(op, OpStats())
+
+    def _retry_delay(self, attempt, response=None):
+        """Exponential backoff with full jitter, honouring Retry-After when given"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(self.max_backoff, float(retry_after))
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def call(self, op, validate=None, **params):
+        """Perform one API op and return the decoded payload (status == 'OK')
+
+        Fresh cache entries are returned without a request; stale ones are
+        revalidated with their ETag/Last-Modified. A ``validate`` callable
+        gets a cached payload and returning False makes the entry stale
+        however young it is (e.g. getBill after getSearch reported a new
+        change_hash). In offline mode every answer must come from the cache.
+        """
+        url = self.base_url.format(self.api_key, op)
+        stats = self._op_stats(op)
+        attempt = 0
+
+        entry = None
+        if self.cache is not None and (self.offline or self.cache.cacheable(op)):
+            entry = self.cache.get(op, params)
+            if entry is not None and validate is not None and not validate(entry.payload()):
+                if self.offline:
+                    raise LegiScanError(f'{op} {params} is outdated in the response cache (offline mode)')
+                entry.fetched_at = 0
+            if entry is not None and (entry.fresh or self.offline):
+                with self.lock:
+                    stats.cache_hits += 1
+                return entry.payload()
+        if self.offline:
+            raise LegiScanError(f'{op} {params} is not in the response cache (offline mode)')
+        headers = entry.conditional_headers() if entry is not None else {}
+
+        while True:
+            if self.limiter is not None:
+                waited = self.limiter.acquire()
+                if waited:
+                    with self.lock:
+                        stats.throttle_seconds += waited
+
+            start = time.perf_counter()
+            response = None
+            error = None
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            with self.lock:
+                stats.calls += 1
+                stats.total_seconds += elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+
+            retryable = error is not None or response.status_code in RETRY_STATUS_CODES
+            if retryable and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                with self.lock:
+                    stats.retries += 1
+                    stats.backoff_seconds += delay
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if error is not None:
+                with self.lock:
+                    stats.errors += 1
+                raise LegiScanError(f'{op} failed after {attempt + 1} attempts: {error}')
+
+            if response.status_code == 304 and entry is not None:
+                with self.lock:
+                    stats.revalidated += 1
+                self.cache.touch(op, params)
+                return entry.payload()
+
+            if response.status_code != 200:
+                with self.lock:
+                    stats.errors += 1
+                raise LegiScanError(f'{op} returned HTTP {response.status_code}')
+
+            start = time.perf_counter()
+            data = response.json()
+            with self.lock:
+                stats.bytes += len(response.content)
+                stats.parse_seconds += time.perf_counter() - start
+            if data.get('status') != 'OK':
+                with self.lock:
+                    stats.errors += 1
+                raise LegiScanError(data.get('alert', {}).get('message', f'{op} returned status {data.get("status")}'))
+
+            if self.cache is not None and self.cache.cacheable(op):
+                self.cache.put(op, params, response.content, response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'))
+            return data
+
+    def get_search(self, state, query, year=2):
+        return self.call('getSearch', state=state, query=query, year=year)
+
+    def get_bill(self, bill_id, change_hash=None):
+        """getBill; a cached copy whose change_hash differs from ``change_hash`` is never served as fresh"""
+        if not change_hash:
+            return self.call('getBill', id=bill_id)
+        return self.call('getBill', id=bill_id,
+                         validate=lambda payload: payload.get('bill', {}).get('change_hash') == change_hash)
+
+    def get_bill_text(self, doc_id):
+        return self.call('getBillText', id=doc_id)
+
+    def get_dataset_list(self, state):
+        return self.call('getDatasetList', state=state)
+
+    def get_dataset(self, session_id, access_key):
+        return self.call('getDataset', id=session_id, access_key=access_key)
+
+    def stats_report(self):
+        """Per-op counters as plain dicts"""
+        with self.lock:
+            return {op: stats.as_dict() for op, stats in sorted(self.stats.items())}
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+LegiScan bulk dataset support - downloads each session's dataset archive
+once (getDatasetList/getDataset), caches it on disk keyed by dataset_hash
+and streams the bill JSON files out of the zip.
+"""
+
+import os
+import json
+import base64
+import zipfile
+from datetime import datetime
+
+DATASET_CACHE_DIR = 'dataset_cache'
+
+
+def current_datasets(datasets, year=None):
+    """Keep datasets for sessions that run through the given (default: current) year"""
+    year = year or datetime.now().year
+    return [d for d in datasets if (d.get('year_end') or 0) >= year]
+
+
+def dataset_cache_path(dataset, cache_dir=None):
+    """Path of the cached archive for a dataset"""
+    return os.path.join(cache_dir or DATASET_CACHE_DIR, f"{dataset['session_id']}-{dataset['dataset_hash']}.zip")
+
+
+def fetch_dataset_archive(dataset, client, cache_dir=None):
+    """Return the path of the dataset zip, downloading it only if the hash is new"""
+    cache_dir = cache_dir or DATASET_CACHE_DIR
+    path = dataset_cache_path(dataset, cache_dir)
+    if os.path.exists(path):
+        return path, False
+
+    data = client.get_dataset(dataset['session_id'], dataset['access_key'])
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(base64.b64decode(data['dataset']['zip']))
+    os.replace(tmp_path, path)
+
+    # Older archives for the same session are superseded by the new hash
+    prefix = f"{dataset['session_id']}-"
+    for name in os.listdir(cache_dir):
+        stale = os.path.join(cache_dir, name)
+        if name.startswith(prefix) and name.endswith('.zip') and stale != path:
+            os.remove(stale)
+
+    return path, True
+
+
+def iter_dataset_bills(path):
+    """Yield the bill payload of every bill/*.json member, one file at a time"""
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            parts = info.filename.split('/')
+            if info.is_dir() or len(parts) < 2 or parts[-2] != 'bill' or not parts[-1].endswith('.json'):
+                continue
+            with archive.open(info) as f:
+                payload = json.load(f)
+            yield payload.get('bill', payload)
+
+
+def iter_state_bills(state_code, client, cache_dir=None, year=None):
+    """Yield raw bill payloads from the current session datasets of one state"""
+    data = client.get_dataset_list(state_code)
+
+    for dataset in current_datasets(data.get('datasetlist', []), year):
+        path, _ = fetch_dataset_archive(dataset, client, cache_dir)
+        yield from iter_dataset_bills(path)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Shard Merger - Combines the partial files written by `scraper.py --shard i/N`
+into bills.json and index.html (plus scrape_state.json for incremental runs,
+new bill_denylist.json entries, the shards' API requests in
+quota_ledger.json and, for --schedule runs, refresh_schedule.json). Merged
+shard files are deleted, so a re-run cannot merge them twice.
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+from datetime import datetime, timedelta
+
+from bill_db import BILL_DB_PATH
+from incremental import SCRAPE_STATE_FILE
+from output_files import write_json_atomic
+from paginate import add_output_args, html_outputs
+from prefilter import PreFilter
+from quota import QuotaLedger, load_previous_bills
+from refresh_schedule import RefreshSchedule
+from scraper import STATES, SHARD_FILE_PATTERN, save_outputs, shard_states
+
+# Shards of one run finish within this long of each other; a wider spread means leftovers of another run
+MAX_RUN_SPREAD = timedelta(hours=12)
+
+
+def load_shards(paths):
+    """Load every shard file, skipping unreadable ones"""
+    shards = []
+    for path in sorted(paths):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                shards.append((path, json.load(f)))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ ERROR: Could not read {path}: {e}")
+    return shards
+
+
+def missing_shards(shards):
+    """Shard specs (i/N) that are expected but absent"""
+    counts = {int(data['shard'].split('/')[1]) for _, data in shards if data.get('shard')}
+    present = {data.get('shard') for _, data in shards}
+    return sorted(
+        f'{i}/{count}' for count in counts for i in range(1, count + 1)
+        if f'{i}/{count}' not in present
+    )
+
+
+def run_spread(shards):
+    """Time between the oldest and newest shard's last_updated (None if one is unreadable)"""
+    try:
+        stamps = [datetime.fromisoformat(data['last_updated']) for _, data in shards]
+    except (KeyError, TypeError, ValueError):
+        return None
+    return max(stamps) - min(stamps)
+
+
+def missing_states(missing):
+    """State codes covered by the missing shard specs"""
+    codes = set()
+    for spec in missing:
+        index, count = (int(part) for part in spec.split('/'))
+        codes.update(shard_states(index, count))
+    return codes
+
+
+def merge_bills(shards, carried=()):
+    """Dedupe bills by id (newest shard wins) and sort deterministically
+
+    ``carried`` bills (the previous bills of missing shards' states) are
+    kept unless a shard has a newer version.
+    """
+    state_order = {code: i for i, code in enumerate(STATES)}
+    merged = {bill.get('id'): bill for bill in carried}
+    for _, data in sorted(shards, key=lambda item: item[1].get('last_updated', '')):
+        for bill in data.get('bills', []):
+            merged[bill.get('id')] = bill
+
+    return sorted(
+        merged.values(),
+        key=lambda b: (state_order.get(b.get('state_code'), len(state_order)), b.get('id') or 0)
+    )
+
+
+def main(argv=None):
+    """Main function - merge shard files and generate bills.json + index.html"""
+    parser = argparse.ArgumentParser(description='Merge scraper shard files into bills.json and index.html')
+    parser.add_argument('files', nargs='*',
+                        help=f"shard files (default: {SHARD_FILE_PATTERN.format('*', '*')})")
+    parser.add_argument('--allow-missing', action='store_true',
+                        help='merge even if some shards of the set are absent; their jurisdictions keep '
+                             'the previous bills')
+    add_output_args(parser)
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("Shard Merger - Combining partial scans")
+    print("=" * 70)
+    print()
+
+    paths = args.files or glob.glob(SHARD_FILE_PATTERN.format('*', '*'))
+    shards = load_shards(paths)
+    if not shards:
+        print("❌ ERROR: No shard files found")
+        return 1
+
+    counts = {data.get('shard', '').split('/')[-1] for _, data in shards}
+    if len(counts) > 1:
+        print(f"❌ ERROR: Shard files come from different splits: {', '.join(sorted(counts))}")
+        return 1
+
+    spread = run_spread(shards)
+    if spread is None or spread > MAX_RUN_SPREAD:
+        print("❌ ERROR: Shard files come from different runs (last_updated):")
+        for path, data in shards:
+            print(f"  {path}: {data.get('last_updated')}")
+        print("Delete the stale shard files, or pass only the current ones")
+        return 1
+
+    missing = missing_shards(shards)
+    if missing and not args.allow_missing:
+        print(f"❌ ERROR: Missing shards: {', '.join(missing)} (use --allow-missing to merge anyway)")
+        return 1
+
+    for path, data in shards:
+        print(f"✅ {path}: {data.get('total_bills', len(data.get('bills', [])))} bills "
+              f"from {len(data.get('states', []))} jurisdictions")
+
+    # States of missing shards keep their previous bills rather than being removed
+    previous_bills = load_previous_bills('bills.json')
+    absent = missing_states(missing)
+    carried = [bill for bill in previous_bills if bill.get('state_code') in absent]
+    if absent:
+        print(f"⚠️  Keeping {len(carried)} previous bills of {len(absent)} jurisdictions in missing shards")
+
+    bills = merge_bills(shards, carried)
+    last_updated = max(data.get('last_updated', '') for _, data in shards) or datetime.now().isoformat()
+
+    save_outputs(bills, last_updated, args.paginate, args.virtualize)
+
+    hashes = {}
+    if carried:
+        try:
+            with open(SCRAPE_STATE_FILE, 'r', encoding='utf-8') as f:
+                stored = json.load(f).get('bills', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            stored = {}
+        hashes.update((str(bill['id']), stored[str(bill['id'])]) for bill in carried if str(bill['id']) in stored)
+    for _, data in shards:
+        hashes.update(data.get('hashes', {}))
+    if hashes:
+        write_json_atomic(SCRAPE_STATE_FILE, {'bills': hashes}, indent=2, sort_keys=True)
+
+    denied = {}
+    for _, data in shards:
+        denied.update(data.get('denylist', {}))
+    if denied:
+        prefilter = PreFilter().load()
+        for bill_id, change_hash in denied.items():
+            prefilter.deny(bill_id, change_hash)
+        prefilter.save()
+
+    ledger = QuotaLedger().load()
+    requests = 0
+    refreshed = []
+    for path, data in shards:
+        usage = data.get('quota', {})
+        # Keyed by shard and run, so merging the same shard file again never counts it twice
+        key = f"shard {data.get('shard')} {data.get('last_updated')}"
+        if not ledger.record(usage.get('requests', 0), states=usage.get('refreshed', []), key=key):
+            print(f"⚠️  {path}: its API requests are already in {ledger.path}, not counted again")
+            continue
+        requests += usage.get('requests', 0)
+        if usage.get('scheduled'):
+            refreshed.extend(usage.get('refreshed', []))
+    ledger.save()
+
+    schedule = None
+    if refreshed:
+        schedule = RefreshSchedule().load()
+        schedule.update_all(refreshed, previous_bills, bills)
+        schedule.save()
+
+    # Consumed: a re-run must not merge (or count the quota of) these shards again
+    for path, _ in shards:
+        os.remove(path)
+
+    print()
+    print("=" * 70)
+    print("SUCCESS!")
+    print("=" * 70)
+    print(f"Merged {len(shards)} shards into {len(bills)} unique bills (shard files deleted)")
+    print(f"  - {BILL_DB_PATH} (bill store and status history)")
+    print("  - bills.json (data backup)")
+    for output in html_outputs(args.paginate, args.virtualize):
+        print(f"  - {output}")
+    if hashes:
+        print(f"  - {SCRAPE_STATE_FILE} (change hashes for incremental runs)")
+    if denied:
+        print(f"  - {prefilter.path} ({len(denied)} bills ruled irrelevant)")
+    print(f"  - {ledger.path} ({requests} API requests by the shards, {ledger.used()} used this month)")
+    if schedule is not None:
+        print(f"  - {schedule.path} (next refresh of {len(refreshed)} jurisdictions)")
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Scan instrumentation - per-state counts and timings, per-op API counters
+(taken from LegiScanClient.stats_report()) and stage timings (fetch, store,
+render, ...) for one run. Written as a JSON run report and, optionally, a
+Prometheus textfile-collector file. log() replaces the scraper's progress
+prints so --log-format json turns them into one JSON object per line.
+"""
+
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from output_files import write_if_changed
+
+RUN_REPORT_FILE = 'run_report.json'
+METRICS_PREFIX = 'cannabis_tracker'
+
+# LegiScan public API allowance, requests per calendar month
+MONTHLY_QUOTA = 30000
+
+LOG_FORMATS = ('text', 'json')
+_log_format = 'text'
+
+
+def set_log_format(log_format):
+    global _log_format
+    _log_format = log_format
+
+
+def log(event, message='', **fields):
+    """Print a progress line, or one JSON object per line with --log-format json
+
+    Events without a message (scan_start, run_complete, ...) print nothing in text mode.
+    """
+    if _log_format == 'json':
+        record = {'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'), 'event': event}
+        if message:
+            record['msg'] = message.strip()
+        record.update(fields)
+        sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+    elif message:
+        print(message)
+
+
+def echo(message=''):
+    """Banner and spacing lines; only shown with text logs"""
+    if _log_format != 'json':
+        print(message)
+
+
+class RunMetrics:
+    """Counters and timings for one scraper run, shared by every worker thread"""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.states = {}
+        self.api = {}
+        self.totals = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block; repeated stages add up"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def record_state(self, state_code, seconds, **counts):
+        """Per-state counts (hits, reused, prefiltered, fetched, filtered, errors, bills) and wall time"""
+        with self.lock:
+            self.states[state_code] = dict(counts, seconds=round(seconds, 3))
+
+    def set_api_stats(self, stats):
+        """Per-op counters from LegiScanClient.stats_report()"""
+        self.api = stats
+
+    def set_total(self, name, value):
+        self.totals[name] = value
+
+    def report(self):
+        """The run report as a plain dict"""
+        requests = sum(op['calls'] for op in self.api.values())
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration_seconds': round(time.perf_counter() - self.start, 3),
+            'stages': {name: round(seconds, 3) for name, seconds in self.stages.items()},
+            'api': {
+                'requests': requests,
+                'cache_hits': sum(op['cache_hits'] for op in self.api.values()),
+                'bytes': sum(op.get('bytes', 0) for op in self.api.values()),
+                'monthly_quota': MONTHLY_QUOTA,
+                'quota_percent': round(requests / MONTHLY_QUOTA * 100, 2),
+                'ops': self.api,
+            },
+            'states': dict(sorted(self.states.items())),
+            'totals': self.totals,
+        }
+
+    def write_report(self, path=RUN_REPORT_FILE):
+        report = self.report()
+        write_if_changed(path, json.dumps(report, indent=2) + '\n')
+        return report
+
+    def write_prometheus(self, path):
+        """Prometheus textfile-collector file (written atomically, as node_exporter expects)"""
+        write_if_changed(path, render_prometheus(self.report()))
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}' if labels else ''
+
+
+def render_prometheus(report):
+    """Prometheus exposition text for a run report; every metric is a gauge of the last run"""
+    metrics = []
+
+    def gauge(name, help_text, samples):
+        metrics.append(f'# HELP {METRICS_PREFIX}_{name} {help_text}')
+        metrics.append(f'# TYPE {METRICS_PREFIX}_{name} gauge')
+        metrics.extend(f'{METRICS_PREFIX}_{name}{_labels(**labels)} {value}' for labels, value in samples)
+
+    started = datetime.fromisoformat(report['started_at']).timestamp()
+    gauge('last_run_timestamp_seconds', 'Start of the last scraper run', [({}, int(started))])
+    gauge('run_duration_seconds', 'Wall time of the last run', [({}, report['duration_seconds'])])
+    gauge('stage_seconds', 'Wall time per run stage', [
+        ({'stage': stage}, seconds) for stage, seconds in report['stages'].items()
+    ])
+
+    ops = report['api']['ops']
+    op_fields = [
+        ('calls', 'api_requests', 'LegiScan HTTP requests, retries included'),
+        ('cache_hits', 'api_cache_hits', 'Calls answered from the response cache'),
+        ('retries', 'api_retries', 'Retried requests'),
+        ('errors', 'api_errors', 'Calls that failed'),
+        ('bytes', 'api_response_bytes', 'Decoded response body bytes'),
+        ('network_seconds', 'api_network_seconds', 'Seconds spent in HTTP requests'),
+        ('parse_seconds', 'api_parse_seconds', 'Seconds spent decoding JSON responses'),
+        ('throttle_seconds', 'api_throttle_seconds', 'Seconds spent waiting for the rate limiter'),
+        ('backoff_seconds', 'api_backoff_seconds', 'Seconds slept between retries'),
+    ]
+    for field, name, help_text in op_fields:
+        gauge(name, help_text, [({'op': op}, stats.get(field, 0)) for op, stats in ops.items()])
+    gauge('api_max_latency_seconds', 'Slowest request per op', [
+        ({'op': op}, stats['max_ms'] / 1000) for op, stats in ops.items()
+    ])
+    gauge('api_quota_ratio', 'Share of the monthly API quota used by the last run', [
+        ({}, report['api']['requests'] / report['api']['monthly_quota'])
+    ])
+
+    states = report['states']
+    gauge('state_seconds', 'Wall time per jurisdiction', [
+        ({'state': code}, counts['seconds']) for code, counts in states.items()
+    ])
+    for field in ('bills', 'filtered', 'fetched', 'errors'):
+        gauge(f'state_{field}', f'Per-jurisdiction {field} count', [
+            ({'state': code}, counts.get(field, 0)) for code, counts in states.items()
+        ])
+
+    for name, value in report['totals'].items():
+        gauge(name, f'Run total: {name}', [({}, value)])
+    return '\n'.join(metrics) + '\n'
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Output file helpers - every generated file is written to a temp file first
+and only moved over the existing one when its content hash differs, so a
+rerun that produces the same bytes leaves the file (and its mtime, the git
+tree and the deploy) untouched.
+"""
+
+import os
+import json
+import hashlib
+
+# Bytes read at a time when hashing a file
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """sha256 hex digest of a file, or None if it does not exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def replace_if_changed(tmp_path, path):
+    """Move tmp_path over path if the content differs; return True if path changed"""
+    try:
+        same_size = os.path.getsize(tmp_path) == os.path.getsize(path)
+    except FileNotFoundError:
+        same_size = False
+
+    if same_size and file_digest(tmp_path) == file_digest(path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_if_changed(path, content):
+    """Write str or bytes content to path unless it already holds exactly that"""
+    tmp_path = f'{path}.tmp'
+    if isinstance(content, bytes):
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+    else:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+    return replace_if_changed(tmp_path, path)
+
+
+def write_json_atomic(path, data, **kwargs):
+    """Write JSON to a temp file and rename it into place if the content changed"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **kwargs)
+    return replace_if_changed(tmp_path, path)
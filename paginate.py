@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Paginated static output - splits the tracker into a small landing page with
+the most recent bills, /page/<n>.html shards for the rest and one
+/state/<code>/index.html per jurisdiction, all linked to each other and
+listed in sitemap.xml. Every shard is pre-rendered through render.py, so
+crawlers still see each bill without the browser parsing all of them.
+write_frontend() is the one entry point the generators use for every HTML
+layout, the JSON files app.js reads next to it and the static API.
+"""
+
+import os
+import glob
+from xml.sax.saxutils import escape
+
+from card_payload import CARD_PAYLOAD_FILE, VIRTUAL_SSR_CARDS, virtual_page, write_card_payload
+from metrics import log
+from output_files import write_if_changed
+from render import (
+    SITE_URL, DEFAULT_TITLE, DEFAULT_HEADING,
+    asset_prefix, escape_html, sort_bills, write_html,
+)
+from search_index import SEARCH_INDEX_FILE, write_search_index
+from static_api import API_DIR, API_MANIFEST_FILE, write_api
+
+# Bill cards per landing page / page shard
+PAGE_SIZE = 50
+PAGE_DIR = 'page'
+STATE_DIR = 'state'
+SITEMAP_FILE = 'sitemap.xml'
+
+
+def page_url(number):
+    """Site-relative URL of page ``number`` (page 1 is the landing page)"""
+    return '' if number == 1 else f'{PAGE_DIR}/{number}.html'
+
+
+def state_url(state_code):
+    """Site-relative URL of a jurisdiction's page"""
+    return f'{STATE_DIR}/{state_code.lower()}/'
+
+
+def url_file(out_dir, url_path):
+    """File that serves ``url_path``"""
+    if not url_path or url_path.endswith('/'):
+        url_path += 'index.html'
+    return os.path.join(out_dir, *url_path.split('/'))
+
+
+def link(from_path, to_path):
+    """Relative href from one page to another"""
+    return (asset_prefix(from_path) + to_path) or './'
+
+
+def render_nav(url_path, page_count, current_page=None, states=()):
+    """Newer/older links, page numbers and the per-state index"""
+    parts = ['\n            <nav class="pagination" aria-label="Bill pages">']
+    if current_page and current_page > 1:
+        parts.append(f'<a href="{link(url_path, page_url(current_page - 1))}" rel="prev">&larr; Newer</a>')
+    for number in range(1, page_count + 1):
+        if number == current_page:
+            parts.append(f'<span class="current" aria-current="page">{number}</span>')
+        else:
+            parts.append(f'<a href="{link(url_path, page_url(number))}">{number}</a>')
+    if current_page and current_page < page_count:
+        parts.append(f'<a href="{link(url_path, page_url(current_page + 1))}" rel="next">Older &rarr;</a>')
+    parts.append('</nav>')
+
+    if states:
+        parts.append('\n            <nav class="state-index" aria-label="Bills by state"><h3>Bills by State</h3>')
+        for code, name in states:
+            parts.append(f'<a href="{link(url_path, state_url(code))}">{escape_html(name)}</a>')
+        parts.append('</nav>')
+    return ' '.join(parts)
+
+
+def bills_by_state(bills):
+    """{state_code: [bills]} with Federal first, then states by name"""
+    grouped = {}
+    for bill in bills:
+        if bill.get('state_code'):
+            grouped.setdefault(bill['state_code'], []).append(bill)
+    return dict(sorted(
+        grouped.items(),
+        key=lambda item: (item[0] != 'US', item[1][0].get('state_name') or item[0])
+    ))
+
+
+def plan_site(bills, page_size=PAGE_SIZE):
+    """Describe every page as a dict of url_path, cards and render options"""
+    ordered = sort_bills(bills)
+    chunks = [ordered[i:i + page_size] for i in range(0, len(ordered), page_size)] or [[]]
+    grouped = bills_by_state(ordered)
+    states = [(code, state_bills[0].get('state_name') or code) for code, state_bills in grouped.items()]
+
+    pages = []
+    for number, cards in enumerate(chunks, start=1):
+        url_path = page_url(number)
+        page = {'url_path': url_path, 'cards': cards}
+        if number > 1:
+            page['title'] = f'Page {number} - {DEFAULT_TITLE}'
+            page['heading'] = f'{DEFAULT_HEADING} - Page {number} of {len(chunks)}'
+        page['nav_html'] = render_nav(url_path, len(chunks), number, states)
+        pages.append(page)
+
+    for code, name in states:
+        url_path = state_url(code)
+        label = 'Federal' if code == 'US' else name
+        pages.append({
+            'url_path': url_path,
+            'cards': grouped[code],
+            'title': f'{label} Cannabis Legislation - {len(grouped[code])} Bills | Dan K Reports',
+            'heading': f'{label} Cannabis Bills',
+            'nav_html': render_nav(url_path, len(chunks), states=states),
+        })
+    return pages
+
+
+def render_sitemap(pages, last_updated):
+    """sitemap.xml listing the landing page and every shard"""
+    default_lastmod = (last_updated or '')[:10]
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for page in pages:
+        url_path = page['url_path']
+        if not url_path:
+            changefreq, priority = 'daily', '1.0'
+        elif url_path.startswith(STATE_DIR + '/'):
+            changefreq, priority = 'weekly', '0.8'
+        else:
+            changefreq, priority = 'daily', '0.5'
+        # A shard changes when its newest bill does; the landing page every run
+        newest = page['cards'][0] if url_path and page['cards'] else {}
+        lastmod = (newest.get('last_action_date') or newest.get('status_date') or default_lastmod)[:10]
+        lines.extend([
+            '    <url>',
+            f'        <loc>{escape(SITE_URL + url_path)}</loc>',
+            f'        <lastmod>{lastmod}</lastmod>',
+            f'        <changefreq>{changefreq}</changefreq>',
+            f'        <priority>{priority}</priority>',
+            '    </url>',
+        ])
+    lines.append('</urlset>')
+    return '\n'.join(lines) + '\n'
+
+
+def remove_stale_shards(out_dir, written):
+    """Delete page/state shards left over from a larger previous build"""
+    written = {os.path.abspath(path) for path in written}
+    patterns = [
+        os.path.join(out_dir, PAGE_DIR, '*.html'),
+        os.path.join(out_dir, STATE_DIR, '*', 'index.html'),
+    ]
+    removed = 0
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            if os.path.abspath(path) not in written:
+                os.remove(path)
+                removed += 1
+                try:
+                    os.rmdir(os.path.dirname(path))
+                except OSError:
+                    pass
+    return removed
+
+
+def write_site(bills, last_updated, out_dir='.', page_size=PAGE_SIZE, virtual=None):
+    """Write index.html, every page/state shard and sitemap.xml; return the pages"""
+    pages = plan_site(bills, page_size)
+    if virtual:
+        pages[0].update(virtual_page(bills, virtual))
+    written = []
+    changed = 0
+    for page in pages:
+        path = url_file(out_dir, page['url_path'])
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        changed += write_html(path, bills, last_updated, **page)
+        written.append(path)
+    if changed < len(pages):
+        log('pages_unchanged', f"  Info: {len(pages) - changed} of {len(pages)} pages unchanged, left in place",
+            unchanged=len(pages) - changed, pages=len(pages))
+
+    removed = remove_stale_shards(out_dir, written)
+    if removed:
+        log('stale_removed', f"  Info: Removed {removed} stale page shards", files=removed)
+
+    write_if_changed(os.path.join(out_dir, SITEMAP_FILE), render_sitemap(pages, last_updated))
+    return pages
+
+
+def write_frontend(bills, last_updated, out_dir='.', page_size=None, virtual=None):
+    """Write the HTML pages, the JSON files app.js loads and the static API; return the number of pages"""
+    if page_size:
+        pages = len(write_site(bills, last_updated, out_dir, page_size, virtual))
+    else:
+        page = virtual_page(bills, virtual) if virtual else {}
+        write_html(os.path.join(out_dir, 'index.html'), bills, last_updated, **page)
+        pages = 1
+
+    write_search_index(os.path.join(out_dir, SEARCH_INDEX_FILE), bills, last_updated)
+    if virtual:
+        write_card_payload(os.path.join(out_dir, CARD_PAYLOAD_FILE), bills, last_updated)
+    write_api(bills, last_updated, out_dir)
+    return pages
+
+
+def add_output_args(parser):
+    """--paginate [N] and --virtualize [N] options shared by the HTML generators"""
+    parser.add_argument('--paginate', type=int, nargs='?', const=PAGE_SIZE, metavar='N',
+                        help=f'render a landing page with the N most recent bills plus page/<n>.html and '
+                             f'state/<code>/index.html shards and sitemap.xml (default N: {PAGE_SIZE})')
+    parser.add_argument('--virtualize', type=int, nargs='?', const=VIRTUAL_SSR_CARDS, metavar='N',
+                        help=f'pre-render only the first N cards of index.html and let the browser '
+                             f'mount the rest from {CARD_PAYLOAD_FILE} as they scroll into view '
+                             f'(default N: {VIRTUAL_SSR_CARDS})')
+
+
+def html_outputs(page_size=None, virtual=None):
+    """Descriptions of the files written by write_frontend"""
+    if virtual:
+        outputs = [f"index.html (first {virtual} bills pre-rendered, the rest virtualized)"]
+    elif page_size:
+        outputs = [f"index.html (landing page with the {page_size} most recent bills)"]
+    else:
+        outputs = ["index.html (SEO-optimized with pre-rendered content)"]
+    if page_size:
+        outputs.append("page/<n>.html and state/<code>/index.html (pre-rendered shards)")
+        outputs.append("sitemap.xml (landing page and every shard)")
+    outputs.append(f"{SEARCH_INDEX_FILE} (client-side search index)")
+    if virtual:
+        outputs.append(f"{CARD_PAYLOAD_FILE} (card data for the virtualized list)")
+    outputs.append(f"{API_DIR}/{API_MANIFEST_FILE}, states/<code>.json and status/<code>.json (static API)")
+    return outputs
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Search-result pre-filter - decides from getSearch metadata alone whether a
+hit is worth a getBill call. Bills that getBill already ruled irrelevant
+are kept in a persisted denylist (keyed by change_hash, so an amended bill
+is checked again); the optional title mode also runs the relevance
+classifier on the search title and last action.
+"""
+
+import json
+import threading
+
+from output_files import write_json_atomic
+from relevance import is_relevant_bill
+
+DENYLIST_FILE = 'bill_denylist.json'
+PREFILTER_MODES = ('none', 'denylist', 'title')
+
+
+class PreFilter:
+    """Stage-one filter applied to search hits before getBill"""
+
+    def __init__(self, mode='denylist', path=DENYLIST_FILE):
+        if mode not in PREFILTER_MODES:
+            raise ValueError(f'unknown prefilter mode {mode!r}')
+        self.mode = mode
+        self.path = path
+        self.denylist = {}
+        self.added = {}
+        self.skipped = {'denylist': 0, 'title': 0}
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Load the denylist; a missing file means an empty list"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                # Entries without a change_hash (older files) can never match and are dropped
+                self.denylist = {key: value for key, value in json.load(f).get('bills', {}).items() if value}
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.denylist = {}
+        return self
+
+    def reject(self, bill_id, change_hash, hit):
+        """Return the reason a search hit can skip getBill, or None"""
+        if self.mode == 'none':
+            return None
+
+        reason = None
+        key = str(bill_id)
+        # Without a change_hash a stale entry cannot be told from a current one, so it never matches
+        if change_hash and self.denylist.get(key) == change_hash:
+            reason = 'denylist'
+        elif self.mode == 'title' and not is_relevant_bill(hit.get('title') or '', hit.get('last_action') or ''):
+            reason = 'title'
+
+        if reason is not None:
+            with self.lock:
+                self.skipped[reason] += 1
+        return reason
+
+    def deny(self, bill_id, change_hash):
+        """Remember a bill that getBill ruled irrelevant (only with a change_hash to match it by)"""
+        if not change_hash:
+            return
+        with self.lock:
+            self.denylist[str(bill_id)] = change_hash
+            self.added[str(bill_id)] = change_hash
+
+    def allow(self, bill_id):
+        """Forget a bill that has become relevant"""
+        with self.lock:
+            self.denylist.pop(str(bill_id), None)
+
+    @property
+    def saved_calls(self):
+        return sum(self.skipped.values())
+
+    def save(self):
+        """Persist the denylist"""
+        write_json_atomic(self.path, {'bills': self.denylist}, indent=2, sort_keys=True)
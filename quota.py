@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+API quota budget - a persisted ledger of LegiScan requests per month and
+day, and a planner that spends a run's share of the monthly allowance where
+it buys the most freshness. Jurisdictions are scanned in priority order
+(staleness x session activity x status volatility) and, inside each one,
+getBill calls go to new bills first, then to bills whose status can still
+change, most recent action first. Hits left over when the budget runs out
+keep their previous version and are fetched on a later run.
+"""
+
+import json
+import calendar
+import threading
+from datetime import date, timedelta
+
+from columnar import load_snapshot
+from output_files import write_json_atomic
+from metrics import MONTHLY_QUOTA
+
+QUOTA_LEDGER_FILE = 'quota_ledger.json'
+
+# Days of per-day usage kept in the ledger
+LEDGER_DAYS = 62
+
+# Statuses that no longer change: Enacted/Signed, Vetoed, Failed/Dead
+TERMINAL_STATUS_CODES = {6, 7, 8}
+
+# A bill counts towards session activity if it had an action this recently
+ACTIVE_DAYS = 30
+
+# Staleness assumed for a jurisdiction that was never refreshed
+NEVER_REFRESHED_DAYS = 30
+
+
+def _parse_day(value):
+    try:
+        return date.fromisoformat((value or '')[:10])
+    except ValueError:
+        return None
+
+
+class QuotaLedger:
+    """Requests used per month and per day, plus when each jurisdiction was last refreshed"""
+
+    def __init__(self, path=QUOTA_LEDGER_FILE, monthly_quota=MONTHLY_QUOTA):
+        self.path = path
+        self.monthly_quota = monthly_quota
+        self.months = {}
+        self.days = {}
+        self.refreshed = {}
+        self.recorded = {}
+
+    def load(self):
+        """Load the ledger; a missing file means nothing was used yet"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        self.months = data.get('months', {})
+        self.days = data.get('days', {})
+        self.refreshed = data.get('refreshed', {})
+        self.recorded = data.get('recorded', {})
+        return self
+
+    def used(self, today=None):
+        """Requests used so far in today's month"""
+        today = today or date.today()
+        return self.months.get(today.strftime('%Y-%m'), 0)
+
+    def remaining(self, today=None):
+        return max(self.monthly_quota - self.used(today), 0)
+
+    def used_today(self, today=None):
+        today = today or date.today()
+        return self.days.get(today.isoformat(), 0)
+
+    def daily_allowance(self, today=None):
+        """What may still be spent today: today's even share of the month's quota, less today's use
+
+        The share is computed from what was left at the start of the day, so
+        several runs on one day split a single day's share between them.
+        """
+        today = today or date.today()
+        days_left = calendar.monthrange(today.year, today.month)[1] - today.day + 1
+        used_today = self.used_today(today)
+        return max(0, (self.remaining(today) + used_today) // days_left - used_today)
+
+    def record(self, requests, states=(), today=None, key=None):
+        """Add a run's requests and mark ``states`` as refreshed today
+
+        A ``key`` (e.g. a shard spec plus its last_updated) makes the call
+        idempotent: requests already recorded under that key are not added
+        again. Returns False when they were skipped.
+        """
+        today = today or date.today()
+        if key is not None:
+            if key in self.recorded:
+                return False
+            self.recorded[key] = today.isoformat()
+            cutoff = (today - timedelta(days=LEDGER_DAYS)).isoformat()
+            self.recorded = {name: day for name, day in self.recorded.items() if day >= cutoff}
+        month = today.strftime('%Y-%m')
+        self.months[month] = self.months.get(month, 0) + requests
+        self.days[today.isoformat()] = self.days.get(today.isoformat(), 0) + requests
+        for day in sorted(self.days)[:-LEDGER_DAYS]:
+            del self.days[day]
+        for state_code in states:
+            self.refreshed[state_code] = today.isoformat()
+        return True
+
+    def save(self):
+        write_json_atomic(self.path, {
+            'monthly_quota': self.monthly_quota,
+            'months': self.months,
+            'days': self.days,
+            'refreshed': self.refreshed,
+            'recorded': self.recorded,
+        }, indent=2, sort_keys=True)
+
+
+class ScanPlanner:
+    """Orders jurisdictions and caps getBill calls to fit a request budget
+
+    ``previous_bills`` is the last snapshot; ``last_report`` the previous
+    run_report.json (its per-state getBill counts make the best estimate).
+    A ``budget`` of None means unlimited.
+    """
+
+    def __init__(self, ledger, previous_bills=(), last_report=None, budget=None, today=None):
+        self.ledger = ledger
+        self.today = today or date.today()
+        self.budget = budget
+        self.previous = {bill.get('id'): bill for bill in previous_bills}
+        self.by_state = {}
+        for bill in previous_bills:
+            self.by_state.setdefault(bill.get('state_code'), []).append(bill)
+        self.last_report = (last_report or {}).get('states', {})
+        self.spent = 0
+        self.deferred = 0
+        self.lock = threading.Lock()
+
+    def state_score(self, state_code):
+        """Staleness (days) x (1 + recently active bills) x (0.5 + share of bills whose status can change)"""
+        refreshed = _parse_day(self.ledger.refreshed.get(state_code))
+        staleness = (self.today - refreshed).days if refreshed else NEVER_REFRESHED_DAYS
+        bills = self.by_state.get(state_code, [])
+        active = 0
+        for bill in bills:
+            day = _parse_day(bill.get('last_action_date') or bill.get('status_date'))
+            if day is not None and (self.today - day).days <= ACTIVE_DAYS:
+                active += 1
+        volatile = sum(1 for bill in bills if bill.get('status_code') not in TERMINAL_STATUS_CODES)
+        volatility = volatile / len(bills) if bills else 1.0
+        # Refreshed today still scores above zero so ties break on activity
+        return round(max(staleness, 0.5) * (1 + active) * (0.5 + volatility), 2)
+
+    def estimate_bill_calls(self, state_code, incremental=False):
+        """Expected getBill calls: last run's count, else the bills that may have changed"""
+        report = self.last_report.get(state_code)
+        if report is not None and 'fetched' in report:
+            return report['fetched']
+        bills = self.by_state.get(state_code, [])
+        if incremental:
+            return sum(1 for bill in bills if bill.get('status_code') not in TERMINAL_STATUS_CODES)
+        return len(bills)
+
+    def order(self, states):
+        """``states`` ({code: name}) re-ordered by priority, highest first"""
+        return dict(sorted(states.items(), key=lambda item: -self.state_score(item[0])))
+
+    def plan(self, states, incremental=False):
+        """Per-state rows and totals for --plan"""
+        rows = []
+        for state_code, state_name in self.order(states).items():
+            rows.append({
+                'state': state_code,
+                'name': state_name,
+                'score': self.state_score(state_code),
+                'search_calls': 1,
+                'bill_calls': self.estimate_bill_calls(state_code, incremental),
+            })
+        return rows
+
+    def bill_priority(self, hit_id, hit):
+        """Sort key for a search hit: new bills, then open statuses, then most recent action"""
+        previous = self.previous.get(hit_id)
+        if previous is None:
+            rank = 0
+        elif previous.get('status_code') not in TERMINAL_STATUS_CODES:
+            rank = 1
+        else:
+            rank = 2
+        action = _parse_day(hit.get('last_action_date'))
+        return rank, -(action.toordinal() if action else 0)
+
+    def select(self, hits, search_calls=1):
+        """Split hits ((id, change_hash, search data) tuples) into (fetch, deferred) within the budget
+
+        ``search_calls`` already made for these hits are charged first.
+        """
+        with self.lock:
+            self.spent += search_calls
+            if self.budget is None:
+                self.spent += len(hits)
+                return list(hits), []
+            ranked = sorted(hits, key=lambda hit: self.bill_priority(hit[0], hit[2]))
+            allowed = max(min(self.budget - self.spent, len(ranked)), 0)
+            self.spent += allowed
+            self.deferred += len(ranked) - allowed
+            return ranked[:allowed], ranked[allowed:]
+
+
+def load_previous_bills(path='bills.json'):
+    """The last bills.json snapshot's bills (from its columnar copy when current); empty on a cold start"""
+    try:
+        return load_snapshot(path)[0]
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def load_last_report(path):
+    """The previous run report, or None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def print_plan(rows, ledger, budget, today=None):
+    """The --plan dry run table"""
+    today = today or date.today()
+    search_calls = sum(row['search_calls'] for row in rows)
+    bill_calls = sum(row['bill_calls'] for row in rows)
+    total = search_calls + bill_calls
+
+    print(f"{'state':<6} {'name':<16} {'score':>8} {'getSearch':>10} {'getBill':>8}")
+    for row in rows:
+        print(f"{row['state']:<6} {row['name'][:16]:<16} {row['score']:>8} {row['search_calls']:>10} "
+              f"{row['bill_calls']:>8}")
+    print()
+    print(f"Estimated requests: {total} ({search_calls} getSearch + {bill_calls} getBill)")
+    print(f"Used this month: {ledger.used(today)} of {ledger.monthly_quota} "
+          f"({ledger.remaining(today)} left, {ledger.used_today(today)} used today, "
+          f"{ledger.daily_allowance(today)} more allowed today)")
+    if budget is None:
+        print("Budget: unlimited (--no-budget)")
+    elif total <= budget:
+        print(f"✅ Fits the run budget of {budget} requests")
+    else:
+        print(f"⚠️  Exceeds the run budget of {budget} requests: about {total - budget} getBill calls "
+              f"would be deferred, lowest priority first")
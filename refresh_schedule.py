@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Adaptive refresh schedule - each jurisdiction gets its own refresh interval,
+learnt from its bills: the rate of distinct last_action_date values over
+the last HISTORY_DAYS sets a base interval, a state whose bills changed
+since its last refresh is polled twice as often, and a quiet one backs off
+exponentially up to MAX_INTERVAL_HOURS. `scraper.py --schedule` only scans
+the jurisdictions that are due and carries the others' bills over, so the
+scraper can run often without calling the API for out-of-session states.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+from output_files import write_json_atomic
+
+REFRESH_SCHEDULE_FILE = 'refresh_schedule.json'
+
+# Bounds of a jurisdiction's refresh interval
+MIN_INTERVAL_HOURS = 6
+MAX_INTERVAL_HOURS = 24 * 28
+
+# Window of last_action_date values used to estimate a state's change rate
+HISTORY_DAYS = 90
+
+
+def _clamp(hours):
+    return round(min(max(hours, MIN_INTERVAL_HOURS), MAX_INTERVAL_HOURS), 1)
+
+
+def change_signature(bills):
+    """What counts as a change for scheduling: bills added/removed, status or last action moved"""
+    return {
+        (bill.get('id'), bill.get('status_code'), bill.get('status_date'), bill.get('last_action_date'))
+        for bill in bills
+    }
+
+
+def history_interval(bills, today=None):
+    """Base interval (hours) from the distinct action dates of the last HISTORY_DAYS"""
+    today = today or date.today()
+    start = (today - timedelta(days=HISTORY_DAYS)).isoformat()
+    action_days = {
+        day[:10] for day in (bill.get('last_action_date') or bill.get('status_date') for bill in bills)
+        if day and day[:10] >= start
+    }
+    if not action_days:
+        return MAX_INTERVAL_HOURS
+    return _clamp(HISTORY_DAYS * 24 / len(action_days))
+
+
+class RefreshSchedule:
+    """Per-jurisdiction refresh intervals and due times, kept in refresh_schedule.json"""
+
+    def __init__(self, path=REFRESH_SCHEDULE_FILE):
+        self.path = path
+        self.states = {}
+
+    def load(self):
+        """Load the schedule; a missing file makes every jurisdiction due"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.states = json.load(f).get('states', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.states = {}
+        return self
+
+    def is_due(self, state_code, now=None):
+        entry = self.states.get(state_code)
+        if entry is None:
+            return True
+        now = now or datetime.now()
+        return datetime.fromisoformat(entry['next_due']) <= now
+
+    def due(self, states, now=None):
+        """The subset of ``states`` ({code: name}) that is due, in the same order"""
+        return {code: name for code, name in states.items() if self.is_due(code, now)}
+
+    def next_due(self, states):
+        """(state code, next_due) of the earliest jurisdiction of ``states`` that is not due yet"""
+        upcoming = [(self.states[code]['next_due'], code) for code in states if code in self.states]
+        return min(upcoming)[::-1] if upcoming else None
+
+    def update(self, state_code, previous_bills, bills, now=None):
+        """Set a refreshed jurisdiction's next interval from what changed since its last refresh
+
+        A change halves the interval (never above the history estimate); no
+        change doubles it (never below it). Returns the new interval in hours.
+        """
+        now = now or datetime.now()
+        entry = self.states.get(state_code, {})
+        base = history_interval(bills, now.date())
+        previous_interval = entry.get('interval_hours', base)
+        changed = change_signature(previous_bills) != change_signature(bills)
+        if changed:
+            interval = _clamp(min(base, previous_interval / 2))
+            quiet_runs = 0
+        else:
+            interval = _clamp(max(base, previous_interval * 2))
+            quiet_runs = entry.get('quiet_runs', 0) + 1
+
+        self.states[state_code] = {
+            'interval_hours': interval,
+            'quiet_runs': quiet_runs,
+            'last_refreshed': now.isoformat(timespec='seconds'),
+            'last_changed': now.isoformat(timespec='seconds') if changed else entry.get('last_changed'),
+            'next_due': (now + timedelta(hours=interval)).isoformat(timespec='seconds'),
+        }
+        return interval
+
+    def update_all(self, state_codes, previous_bills, bills, now=None):
+        """update() every refreshed jurisdiction from two full bill lists"""
+        previous_by_state, by_state = {}, {}
+        for bill in previous_bills:
+            previous_by_state.setdefault(bill.get('state_code'), []).append(bill)
+        for bill in bills:
+            by_state.setdefault(bill.get('state_code'), []).append(bill)
+        for state_code in state_codes:
+            self.update(state_code, previous_by_state.get(state_code, []), by_state.get(state_code, []), now)
+
+    def save(self):
+        write_json_atomic(self.path, {'states': self.states}, indent=2, sort_keys=True)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Bill relevance classifier - one precompiled, word-bounded alternation regex
+finds cannabis terms and policy terms in a single pass over the text and
+reports which terms matched.
+"""
+
+import re
+
+CANNABIS_TERMS = ['cannabis', 'marijuana', 'marihuana']
+
+# Policy-relevant terms to filter noise
+POLICY_TERMS = [
+    'bank', 'banking', 'tax', 'deduction', '280e', 'safe banking',
+    'commerce', 'interstate', 'import', 'export', 'trade',
+    'administration', 'regulation', 'regulatory', 'rule', 'rulemaking',
+    'license', 'licensing', 'licensee', 'permit',
+    'scheduling', 'schedule i', 'schedule ii', 'schedule iii',
+    'decriminalization', 'legalization', 'legalize',
+    'medical', 'recreational', 'adult-use', 'adult use',
+    'dispensary', 'dispensaries', 'cultivation', 'cultivator',
+    'manufacturer', 'manufacturing', 'processor', 'retailer',
+    'delivery', 'transporter',
+    'enforcement', 'compliance', 'violation', 'penalty', 'penalties',
+    'black market', 'gray market', 'grey market', 'illicit',
+    'testing', 'test', 'potency', 'thc', 'cbd', 'contaminant',
+    'pesticide', 'lab', 'laboratory', 'laboratories',
+    'equity', 'social equity', 'expungement', 'record', 'conviction',
+    'tribal', 'reservation',
+    'fund', 'funding', 'grant', 'appropriation', 'cash fund',
+    'revenue', 'fee', 'fees',
+    'possession', 'consume', 'consumption', 'use', 'impairment',
+    'dui', 'dwi', 'workplace',
+    'hemp', 'research', 'study', 'pilot', 'program',
+    'law', 'policy', 'initiative', 'petition', 'crime',
+    'label', 'labelling', 'packaging', 'advertising',
+    'labor', 'labour', 'workforce', 'compensation',
+    'capital', 'lending', 'investment'
+]
+
+
+# Inflections accepted around a term: licenses, licensed, taxes, labeling, unlicensed, relabeled
+TERM_PREFIX = r'(?:un|re)?'
+TERM_SUFFIX = r'(?:s|es|d|ed|ing)?'
+
+
+def _trie_pattern(terms):
+    """Regex source for a character trie of the terms
+
+    Sharing prefixes ('bank', 'banking', ...) keeps the alternation from
+    retrying every term at every position, and the greedy branches prefer
+    the longest term ('safe banking' over 'banking', 'schedule iii' over
+    'schedule i').
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        optional = '' in node
+        if not branches:
+            return ''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+
+    return emit(trie)
+
+
+def compile_terms(terms):
+    """Build one regex matching any term as a whole word; group 1 is the term"""
+    return re.compile(r'\b' + TERM_PREFIX + r'(' + _trie_pattern(set(terms)) + r')' + TERM_SUFFIX + r'\b')
+
+
+_TERM_KIND = dict.fromkeys(POLICY_TERMS, 'policy')
+_TERM_KIND.update(dict.fromkeys(CANNABIS_TERMS, 'cannabis'))
+_TERMS_RE = compile_terms(_TERM_KIND)
+
+
+def match_terms(title, description):
+    """Return (cannabis_terms, policy_terms) found in title + description, in order of appearance"""
+    text = f"{title or ''} {description or ''}".lower()
+    cannabis, policy = [], []
+    for term in _TERMS_RE.findall(text):
+        found = cannabis if _TERM_KIND[term] == 'cannabis' else policy
+        if term not in found:
+            found.append(term)
+    return cannabis, policy
+
+
+def classify(title, description):
+    """Return (relevant, matched_terms) for a bill"""
+    cannabis, policy = match_terms(title, description)
+    relevant = bool(cannabis) and bool(policy)
+    return relevant, cannabis + policy
+
+
+def is_relevant_bill(title, description):
+    """Filter out non-policy bills"""
+    text = f"{title or ''} {description or ''}".lower()
+    # A whole-word match implies a substring match, so this cheap check rejects most noise
+    if not any(term in text for term in CANNABIS_TERMS):
+        return False
+    return classify(title, description)[0]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Relevance Diff - Lists bills whose classification differs between the old
+substring filter and the compiled word-boundary classifier in relevance.py.
+
+Reads bills.json by default; dataset archives (e.g. dataset_cache/*.zip)
+can be passed too and also contain the bills that were filtered out.
+Note that bills.json only keeps the first 500 characters of a description.
+"""
+
+import sys
+import json
+import argparse
+
+from legiscan_datasets import iter_dataset_bills
+from relevance import match_terms, is_relevant_bill
+
+# Frozen copy of the term lists the substring filter shipped with (scraper.py
+# before relevance.py); relevance.py's lists have grown since and must not leak in
+LEGACY_CANNABIS_TERMS = ['cannabis', 'marijuana', 'marihuana']
+
+LEGACY_POLICY_TERMS = [
+    'bank', 'banking', 'tax', 'deduction', '280e', 'safe banking',
+    'commerce', 'interstate', 'import', 'export', 'trade',
+    'administration', 'regulation', 'regulatory', 'rule', 'rulemaking',
+    'license', 'licensing', 'licensee', 'permit',
+    'scheduling', 'schedule i', 'schedule ii', 'schedule iii',
+    'decriminalization', 'legalization', 'legalize',
+    'medical', 'recreational', 'adult-use', 'adult use',
+    'dispensary', 'dispensaries', 'cultivation', 'cultivator',
+    'manufacturer', 'manufacturing', 'processor', 'retailer',
+    'delivery', 'transporter',
+    'enforcement', 'compliance', 'violation', 'penalty', 'penalties',
+    'black market', 'gray market', 'grey market', 'illicit',
+    'testing', 'test', 'potency', 'thc', 'cbd', 'contaminant',
+    'pesticide', 'lab', 'laboratory',
+    'equity', 'social equity', 'expungement', 'record', 'conviction',
+    'tribal', 'reservation',
+    'fund', 'funding', 'grant', 'appropriation', 'cash fund',
+    'revenue', 'fee', 'fees',
+    'possession', 'consume', 'consumption', 'use', 'impairment',
+    'dui', 'dwi', 'workplace',
+    'hemp', 'research', 'study', 'pilot', 'program'
+]
+
+
+def legacy_terms(title, description):
+    """Terms the old `term in text` substring scan would have hit"""
+    text = (title + ' ' + description).lower()
+    return ([t for t in LEGACY_CANNABIS_TERMS if t in text], [t for t in LEGACY_POLICY_TERMS if t in text])
+
+
+def legacy_is_relevant_bill(title, description):
+    """The original substring-based filter"""
+    cannabis, policy = legacy_terms(title, description)
+    return bool(cannabis) and bool(policy)
+
+
+def load_bills(path):
+    """Yield (label, title, description) from bills.json or a dataset zip"""
+    if path.endswith('.zip'):
+        for bill in iter_dataset_bills(path):
+            label = f"{bill.get('state', '??')} {bill.get('bill_number', '')} ({bill.get('bill_id')})"
+            yield label, bill.get('title') or '', bill.get('description') or ''
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for bill in json.load(f).get('bills', []):
+            label = f"{bill.get('state_code', '??')} {bill.get('bill_number', '')} ({bill.get('id')})"
+            yield label, bill.get('title') or '', bill.get('description') or ''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='List bills whose relevance classification changed')
+    parser.add_argument('files', nargs='*', default=['bills.json'], help='bills.json and/or dataset zips')
+    parser.add_argument('--json', action='store_true', help='print machine-readable output')
+    args = parser.parse_args(argv)
+
+    total = 0
+    changes = []
+    for path in args.files:
+        for label, title, description in load_bills(path):
+            total += 1
+            old = legacy_is_relevant_bill(title, description)
+            new = is_relevant_bill(title, description)
+            if old == new:
+                continue
+            old_cannabis, old_policy = legacy_terms(title, description)
+            new_cannabis, new_policy = match_terms(title, description)
+            changes.append({
+                'bill': label,
+                'title': title,
+                'change': 'dropped' if old else 'added',
+                'legacy_terms': old_cannabis + old_policy,
+                'matched_terms': new_cannabis + new_policy,
+            })
+
+    if args.json:
+        print(json.dumps({'total': total, 'changes': changes}, indent=2, ensure_ascii=False))
+        return 0
+
+    for change in changes:
+        print(f"{change['change'].upper():8} {change['bill']}: {change['title'][:70]}")
+        print(f"         legacy: {', '.join(change['legacy_terms']) or '-'}")
+        print(f"         now:    {', '.join(change['matched_terms']) or '-'}")
+    dropped = sum(1 for c in changes if c['change'] == 'dropped')
+    print()
+    print(f"{total} bills checked: {dropped} dropped, {len(changes) - dropped} added")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
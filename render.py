@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Shared SSR renderer used by scraper.py and convert_json_to_html.py.
+Streams index.html as head, bill card and footer chunks into a buffered
+file writer so the whole document never has to be held in memory.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+from output_files import replace_if_changed
+
+# Bytes buffered before each write to disk
+WRITE_BUFFER_SIZE = 64 * 1024
+
+SITE_URL = 'https://tracker.dankreports.com/'
+DEFAULT_TITLE = 'Cannabis Legislation Tracker - Real-Time Bills Across All 50 States | Dan K Reports'
+DEFAULT_HEADING = 'Current Cannabis Bills'
+
+def escape_html(text):
+    """Escape HTML special characters
+
+    A chain of str.replace calls is the fastest escaper CPython has for
+    short strings (str.translate is several times slower); see
+    benchmarks/bench_render.py --cards.
+    """
+    if not text:
+        return ''
+    return (str(text)
+            .replace('&', '&amp;')
+            .replace('<', '&lt;')
+            .replace('>', '&gt;')
+            .replace('"', '&quot;')
+            .replace("'", '&#39;'))
+
+@lru_cache(maxsize=None)
+def get_status_class(status):
+    """Get CSS class for bill status"""
+    status_lower = status.lower()
+    
+    if 'introduced' in status_lower:
+        return 'status-introduced'
+    if 'committee' in status_lower:
+        return 'status-committee'
+    if 'passed' in status_lower:
+        return 'status-passed'
+    if 'enacted' in status_lower or 'signed' in status_lower:
+        return 'status-enacted'
+    
+    return 'status-introduced'
+
+@lru_cache(maxsize=4096)
+def format_date(date_str):
+    """Format date string"""
+    if not date_str:
+        return 'Unknown'
+    
+    try:
+        date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        return date.strftime('%b %d, %Y')
+    except:
+        return date_str
+
+# Card fragments that do not depend on the bill, built once
+ANALYSIS_PENDING_HTML = '''
+            <span class="btn btn-disabled" title="Analysis coming soon">
+                Analysis Pending
+            </span>
+        '''
+
+@lru_cache(maxsize=4096)
+def _sponsor_tag(name, party):
+    """One escaped sponsor tag; the same legislators sponsor many bills"""
+    party = f" ({escape_html(party)})" if party else ''
+    return f'<span class="sponsor-tag">{escape_html(name)}{party}</span>'
+
+@lru_cache(maxsize=None)
+def _escape_label(text):
+    """escape_html for low-cardinality values (state names, statuses)"""
+    return escape_html(text)
+
+def generate_bill_card_html(bill):
+    """Generate HTML for a single bill card"""
+    get = bill.get
+    status = get('status', 'Unknown')
+    status_class = get_status_class(status)
+    all_sponsors = get('sponsors', [])
+    
+    date_to_use = get('last_action_date') or get('status_date')
+    last_action_date = format_date(date_to_use)
+    
+    state_badge_class = 'state-badge-federal' if get('state_code') == 'US' else 'state-badge-state'
+    state_name = _escape_label(get('state_name', ''))
+    
+    # Build sponsors HTML
+    sponsors_html = ''
+    if all_sponsors:
+        sponsor_tags = [_sponsor_tag(s.get('name', ''), s.get('party')) for s in all_sponsors[:3]]
+        if len(all_sponsors) > 3:
+            sponsor_tags.append(f'<span class="sponsor-tag">+{len(all_sponsors) - 3} more</span>')
+        
+        sponsors_html = f'''
+            <div class="bill-sponsors">
+                <strong>Sponsors:</strong>
+                <div class="sponsor-list">
+                    {' '.join(sponsor_tags)}
+                </div>
+            </div>
+        '''
+    
+    # Build analysis button HTML
+    if get('analysis_url'):
+        analysis_btn = f'''
+            <a href="{escape_html(bill['analysis_url'])}" target="_blank" rel="noopener noreferrer" class="btn btn-analysis">
+                Read BMDE Analysis
+            </a>
+        '''
+    else:
+        analysis_btn = ANALYSIS_PENDING_HTML
+    
+    return f'''
+        <article class="bill-card" data-id="{escape_html(get('id', ''))}" data-state="{state_name}" data-state-code="{_escape_label(get('state_code', ''))}" data-status="{_escape_label(get('status', ''))}" data-date="{escape_html(date_to_use or '')}">
+            <div class="bill-header">
+                <div class="bill-title">
+                    <div class="bill-meta-top">
+                        <span class="state-badge {state_badge_class}">{state_name}</span>
+                        <span class="bill-number">{escape_html(get('bill_number', ''))}</span>
+                    </div>
+                    <h3>{escape_html(get('title', ''))}</h3>
+                </div>
+                <div class="bill-status {status_class}">
+                    {_escape_label(status)}
+                </div>
+            </div>
+            
+            <p class="bill-description">
+                {escape_html(get('description', ''))}
+            </p>
+            
+            <div class="bill-meta">
+                <div class="bill-meta-item">
+                    <strong>Last Action:</strong> {escape_html(last_action_date)}
+                </div>
+            </div>
+            
+            {sponsors_html}
+            
+            <div class="bill-actions">
+                <a href="{escape_html(get('url', '#'))}" target="_blank" rel="noopener noreferrer" class="btn btn-secondary">
+                    View on LegiScan
+                </a>
+                {analysis_btn}
+            </div>
+        </article>
+    '''
+
+def asset_prefix(url_path):
+    """Relative prefix from a page at ``url_path`` back to the site root"""
+    return '../' * url_path.count('/')
+
+def render_head(bills, last_updated, url_path='', title=DEFAULT_TITLE, heading=DEFAULT_HEADING,
+                container_attrs=''):
+    """Render everything before the first bill card
+
+    ``url_path`` is the page's location relative to the site root ('' for
+    the landing page, 'page/2.html', 'state/ca/'); it sets the canonical URL
+    and the relative paths to style.css and logo.png. ``container_attrs`` is
+    appended to the billsContainer tag (e.g. the virtual list's data-virtual).
+    """
+    prefix = asset_prefix(url_path)
+    canonical_url = SITE_URL + url_path
+    
+    # Calculate stats
+    total_bills = len(bills)
+    states_with_bills = set(bill.get('state_name', '') for bill in bills if bill.get('state_name'))
+    total_states = len(states_with_bills)
+    
+    active_count = sum(
+        1 for b in bills
+        if not any(term in b.get('status', '').lower() for term in ['enacted', 'vetoed', 'failed', 'dead'])
+    )
+    
+    analyzed_count = sum(1 for b in bills if b.get('analysis_url'))
+    
+    # Format last updated
+    try:
+        last_updated_formatted = datetime.fromisoformat(last_updated.replace('Z', '+00:00')).strftime('%B %d, %Y at %I:%M %p')
+    except:
+        last_updated_formatted = last_updated
+    
+    # Generate state options for filter
+    sorted_states = sorted([s for s in states_with_bills if s != 'Federal'])
+    state_options_html = '\n'.join(
+        f'<option value="{escape_html(state)}">{escape_html(state)}</option>'
+        for state in sorted_states
+    )
+    
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    
+    <!-- Primary Meta Tags -->
+    <title>{escape_html(title)}</title>
+    <meta name="title" content="{escape_html(title)}">
+    <meta name="description" content="Track cannabis legislation in real-time across all 50 states and federal government. Monitor bills, status changes, and legislative progress with data-driven BMDE analysis.">
+    <meta name="keywords" content="cannabis legislation, marijuana bills, cannabis policy tracker, legalization tracker, cannabis reform, state cannabis laws, federal cannabis bills, BMDE, Black Market Death Equation, cannabis market analysis">
+    <meta name="author" content="Daniel Kief">
+    <meta name="robots" content="index, follow, max-image-preview:large, max-snippet:-1, max-video-preview:-1">
+    <link rel="canonical" href="{canonical_url}">
+    
+    <!-- Open Graph / Facebook Meta Tags -->
+    <meta property="og:type" content="website">
+    <meta property="og:url" content="{canonical_url}">
+    <meta property="og:title" content="Cannabis Legislation Tracker - Real-Time Bills Across All 50 States">
+    <meta property="og:description" content="Track cannabis legislation in real-time across all 50 states and federal government. Monitor bills, status changes, and legislative progress with data-driven BMDE analysis.">
+    <meta property="og:image" content="https://tracker.dankreports.com/og-image.jpg">
+    <meta property="og:image:width" content="1200">
+    <meta property="og:image:height" content="630">
+    <meta property="og:site_name" content="Dan K Reports - Cannabis Legislation Tracker">
+    
+    <!-- Twitter Card Meta Tags -->
+    <meta name="twitter:card" content="summary_large_image">
+    <meta name="twitter:url" content="{canonical_url}">
+    <meta name="twitter:title" content="Cannabis Legislation Tracker - Real-Time Bills Across All 50 States">
+    <meta name="twitter:description" content="Track cannabis legislation in real-time across all 50 states and federal government with BMDE analysis.">
+    <meta name="twitter:image" content="https://tracker.dankreports.com/og-image.jpg">
+    
+    <!-- Additional SEO Meta Tags -->
+    <meta name="theme-color" content="#2ecc71">
+    <meta name="apple-mobile-web-app-capable" content="yes">
+    <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
+    <meta name="apple-mobile-web-app-title" content="Cannabis Tracker">
+    
+    <!-- Favicon -->
+    <link rel="icon" type="image/png" href="{prefix}logo.png">
+    <link rel="apple-touch-icon" href="{prefix}logo.png">
+    
+    <!-- Preconnect for Performance -->
+    <link rel="preconnect" href="https://www.dankreports.com">
+    <link rel="dns-prefetch" href="https://www.dankreports.com">
+    
+    <!-- Change feeds -->
+    <link rel="alternate" type="application/atom+xml" title="Cannabis bill updates" href="{prefix}feeds/all.atom">
+    <link rel="alternate" type="application/feed+json" title="Cannabis bill updates" href="{prefix}feeds/all.json">
+    
+    <!-- Stylesheet -->
+    <link rel="stylesheet" href="{prefix}style.css">
+    
+    <!-- Structured Data / Schema.org JSON-LD -->
+    <script type="application/ld+json">
+    {{
+      "@context": "https://schema.org",
+      "@graph": [
+        {{
+          "@type": "WebApplication",
+          "@id": "https://tracker.dankreports.com/#webapp",
+          "name": "Cannabis Legislation Tracker",
+          "applicationCategory": "GovernmentApplication",
+          "operatingSystem": "Web Browser",
+          "url": "https://tracker.dankreports.com/",
+          "description": "Real-time tracking of cannabis legislation across all 50 states and federal government using LegiScan API with data-driven CBDT Framework analysis.",
+          "offers": {{
+            "@type": "Offer",
+            "price": "0",
+            "priceCurrency": "USD"
+          }},
+          "author": {{
+            "@type": "Person",
+            "name": "Daniel Kief"
+          }},
+          "publisher": {{
+            "@type": "Organization",
+            "name": "Dan K Reports",
+            "url": "https://www.dankreports.com/"
+          }},
+          "featureList": [
+            "Real-time cannabis bill tracking across all 50 states",
+            "Federal cannabis legislation monitoring",
+            "LegiScan API integration for up-to-date data",
+            "CBDT Framework analysis integration",
+            "Advanced filtering by state, status, and keywords",
+            "Bill status tracking and legislative progress"
+          ]
+        }},
+        {{
+          "@type": "WebSite",
+          "@id": "https://tracker.dankreports.com/#website",
+          "url": "https://tracker.dankreports.com/",
+          "name": "Cannabis Legislation Tracker",
+          "description": "Track cannabis legislation across America in real-time",
+          "publisher": {{
+            "@id": "https://www.dankreports.com/#organization"
+          }},
+          "potentialAction": {{
+            "@type": "SearchAction",
+            "target": {{
+              "@type": "EntryPoint",
+              "urlTemplate": "https://tracker.dankreports.com/?search={{search_term_string}}"
+            }},
+            "query-input": "required name=search_term_string"
+          }}
+        }},
+        {{
+          "@type": "Organization",
+          "@id": "https://www.dankreports.com/#organization",
+          "name": "Dan K Reports",
+          "url": "https://www.dankreports.com/"
+        }},
+        {{
+          "@type": "BreadcrumbList",
+          "@id": "https://tracker.dankreports.com/#breadcrumb",
+          "itemListElement": [
+            {{
+              "@type": "ListItem",
+              "position": 1,
+              "name": "Home",
+              "item": "https://www.dankreports.com/"
+            }},
+            {{
+              "@type": "ListItem",
+              "position": 2,
+              "name": "Cannabis Legislation Tracker",
+              "item": "https://tracker.dankreports.com/"
+            }}
+          ]
+        }}
+      ]
+    }}
+    </script>
+</head>
+<body>
+    <header>
+        <div class="container">
+            <div class="header-content">
+                <div class="header-title-row">
+                    <img src="{prefix}logo.png" alt="Dan K Reports Logo" class="header-logo">
+                    <div class="header-text">
+                        <h1>Cannabis Legislation Tracker</h1>
+                        <p class="subtitle">All 50 States + Federal - Real-time tracking with data-driven analysis</p>
+                    </div>
+                </div>
+            </div>
+            <div class="header-meta">
+                <span class="last-updated">Last Updated: <time datetime="{escape_html(last_updated)}">{escape_html(last_updated_formatted)}</time></span>
+                <a href="https://www.dankreports.com" class="btn-primary" rel="noopener noreferrer">Visit Dan K Reports</a>
+            </div>
+        </div>
+    </header>
+
+    <main class="container">
+        <section class="intro">
+            <h2>Track Cannabis Policy Across America</h2>
+            <p>
+                This tracker monitors cannabis legislation across all 50 states and the federal government using the LegiScan API, 
+                providing up-to-date information on bills, status changes, and legislative progress. 
+                For in-depth analysis of significant bills, visit 
+                <a href="https://www.dankreports.com" rel="noopener noreferrer">Dan K Reports</a> where we apply 
+                the Black Market Death Equation (BMDE) to predict policy outcomes.
+            </p>
+        </section>
+
+        <section class="filters">
+            <h3>Filter Bills</h3>
+            <div class="filter-controls">
+                <input type="text" id="searchInput" placeholder="Search bills by title, description, or bill number..." aria-label="Search bills">
+                
+                <select id="stateFilter" aria-label="Filter by state">
+                    <option value="all">All States + Federal</option>
+                    <option value="US">Federal Only</option>
+                    <optgroup label="States">
+                        {state_options_html}
+                    </optgroup>
+                </select>
+
+                <select id="statusFilter" aria-label="Filter by status">
+                    <option value="all">All Statuses</option>
+                    <option value="introduced">Introduced</option>
+                    <option value="committee">In Committee</option>
+                    <option value="passed">Passed</option>
+                    <option value="enacted">Enacted</option>
+                </select>
+
+                <select id="sortOrder" aria-label="Sort order">
+                    <option value="recent">Most Recent</option>
+                    <option value="oldest">Oldest First</option>
+                    <option value="state">By State</option>
+                    <option value="alphabetical">By Bill Number</option>
+                </select>
+            </div>
+        </section>
+
+        <section class="stats">
+            <div class="stat-card">
+                <h4>Total Bills</h4>
+                <p class="stat-number">{total_bills}</p>
+            </div>
+            <div class="stat-card">
+                <h4>States Tracked</h4>
+                <p class="stat-number">{total_states}</p>
+            </div>
+            <div class="stat-card">
+                <h4>Active Bills</h4>
+                <p class="stat-number">{active_count}</p>
+            </div>
+            <div class="stat-card">
+                <h4>With Analysis</h4>
+                <p class="stat-number">{analyzed_count}</p>
+            </div>
+        </section>
+
+        <section class="bills-list">
+            <h2>{escape_html(heading)}</h2>
+            <div id="billsContainer"{container_attrs}>
+                '''
+
+def render_footer(url_path='', nav_html=''):
+    """Render everything after the last bill card; ``nav_html`` follows the list"""
+    return f'''
+            </div>
+            <div id="noResults" class="no-results" style="display: none;">
+                <p>No bills found matching your criteria.</p>
+            </div>{nav_html}
+        </section>
+    </main>
+
+    <footer>
+        <div class="container">
+            <p>&copy; 2025 Daniel Kief. All rights reserved.</p>
+            <p>
+                <a href="https://www.dankreports.com" rel="noopener noreferrer">Dan K Reports</a> | 
+                <a href="/sitemap.xml">Sitemap</a>
+            </p>
+        </div>
+    </footer>
+
+    <script src="{asset_prefix(url_path)}search.js"></script>
+    <script src="{asset_prefix(url_path)}app.js"></script>
+</body>
+</html>
+'''
+
+def sort_bills(bills):
+    """Most recent first"""
+    return sorted(bills, key=lambda x: x.get('last_action_date') or x.get('status_date') or '', reverse=True)
+
+def iter_html(bills, last_updated, cards=None, url_path='', title=DEFAULT_TITLE,
+              heading=DEFAULT_HEADING, nav_html='', container_attrs=''):
+    """Yield the complete page in chunks: head, one chunk per bill card, footer
+
+    Stats and filter options always describe ``bills``; ``cards`` (default:
+    all of them, most recent first) are the ones pre-rendered on this page.
+    """
+    if cards is None:
+        cards = sort_bills(bills)
+    
+    yield render_head(bills, last_updated, url_path, title, heading, container_attrs)
+    for i, bill in enumerate(cards):
+        if i:
+            yield '\n'
+        yield generate_bill_card_html(bill)
+    yield render_footer(url_path, nav_html)
+
+def generate_html(bills, last_updated, **page):
+    """Generate complete HTML file with pre-rendered bills as one string"""
+    return ''.join(iter_html(bills, last_updated, **page))
+
+def write_html(path, bills, last_updated, **page):
+    """Stream the pre-rendered page to a temp file through a buffered writer and
+    move it over ``path`` if it changed; return True if ``path`` was rewritten"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        for chunk in iter_html(bills, last_updated, **page):
+            f.write(chunk)
+    return replace_if_changed(tmp_path, path)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+On-disk LegiScan response cache - SQLite table keyed by a hash of
+(op, params) with per-op TTLs, conditional revalidation metadata and
+size-bounded LRU eviction. Used by LegiScanClient, including the
+--offline replay mode.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+RESPONSE_CACHE_PATH = 'legiscan_cache.sqlite'
+RESPONSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds a cached response is served without contacting the API; 0 disables caching
+DEFAULT_TTLS = {
+    'getSearch': 3600,
+    'getBill': 6 * 3600,
+    'getDatasetList': 3600,
+    'getDataset': 0,
+    'getBillText': 0,
+}
+
+
+def cache_key(op, params):
+    """Content address for one API request"""
+    canonical = json.dumps([op, sorted((k, str(v)) for k, v in params.items())], separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class CacheEntry:
+    """A cached response body plus its validators"""
+
+    def __init__(self, body, fetched_at, etag, last_modified, ttl):
+        self.body = body
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.ttl = ttl
+
+    @property
+    def fresh(self):
+        return time.time() - self.fetched_at < self.ttl
+
+    def payload(self):
+        return json.loads(self.body)
+
+    def conditional_headers(self):
+        """Headers for revalidating a stale entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite-backed response store shared by all client threads"""
+
+    def __init__(self, path=RESPONSE_CACHE_PATH, ttls=None, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                op TEXT NOT NULL,
+                params TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self.conn.commit()
+        self.total_bytes = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def ttl(self, op):
+        return self.ttls.get(op, 0)
+
+    def cacheable(self, op):
+        return self.ttl(op) > 0
+
+    def get(self, op, params):
+        """Return the CacheEntry for a request, or None"""
+        key = cache_key(op, params)
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT body, fetched_at, etag, last_modified FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self.conn.commit()
+        body, fetched_at, etag, last_modified = row
+        return CacheEntry(body, fetched_at, etag, last_modified, self.ttl(op))
+
+    def put(self, op, params, body, etag=None, last_modified=None):
+        """Store a successful response body (bytes)"""
+        key = cache_key(op, params)
+        now = time.time()
+        with self.lock:
+            old = self.conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self.conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, op, json.dumps(params, sort_keys=True, default=str), body, len(body),
+                 now, now, etag, last_modified)
+            )
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self.conn.commit()
+
+    def touch(self, op, params):
+        """Mark a revalidated (304) entry as freshly fetched"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute('UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?',
+                              (now, now, cache_key(op, params)))
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        doomed = []
+        for key, size in self.conn.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            if self.total_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            self.total_bytes -= size
+        self.conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
@@ -5,14 +5,42 @@ Generates a complete index.html with all bills pre-rendered for SEO.
 """
 
 import os
-import json
-import requests
-from datetime import datetime
 import time
+from datetime import datetime
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from bill_db import BillStore, BILL_DB_PATH
+from bill_texts import BillTextStore, BILL_TEXT_DIR
+from checkpoint import ScanCheckpoint, CHECKPOINT_DIR
+from columnar import COLUMNAR_FILE, write_columnar
+from feeds import FEED_DIR, FEED_ENTRIES_FILE, diff_bills, write_feeds
+from incremental import ScrapeState, SCRAPE_STATE_FILE
+from legiscan_client import LegiScanClient, TokenBucket, DEFAULT_BASE_URL
+from legiscan_datasets import iter_state_bills
+from metrics import RunMetrics, RUN_REPORT_FILE, LOG_FORMATS, set_log_format, log, echo
+from output_files import write_json_atomic
+from paginate import add_output_args, html_outputs, write_frontend
+from prefilter import PreFilter, PREFILTER_MODES, DENYLIST_FILE
+from refresh_schedule import RefreshSchedule, REFRESH_SCHEDULE_FILE
+from quota import (QuotaLedger, ScanPlanner, QUOTA_LEDGER_FILE, load_last_report, load_previous_bills,
+                   print_plan)
+from relevance import classify
+from response_cache import ResponseCache, RESPONSE_CACHE_PATH, RESPONSE_CACHE_MAX_BYTES
 
 # LegiScan API configuration
 LEGISCAN_API_KEY = os.environ.get('LEGISCAN_API_KEY')
-LEGISCAN_BASE_URL = 'https://api.legiscan.com/?key={}&op={}'
+LEGISCAN_BASE_URL = DEFAULT_BASE_URL
+
+# Partial results written by --shard i/N runs, combined by merge_shards.py
+SHARD_FILE_PATTERN = 'bills.shard-{}-of-{}.json'
+
+# Concurrency: worker threads per pool and the shared request rate (req/sec)
+LEGISCAN_MAX_WORKERS = int(os.environ.get('LEGISCAN_MAX_WORKERS', '4'))
+LEGISCAN_RATE_LIMIT = float(os.environ.get('LEGISCAN_RATE_LIMIT', '2'))
+
+# Retries with exponential backoff on 429/5xx and connection errors
+LEGISCAN_MAX_RETRIES = int(os.environ.get('LEGISCAN_MAX_RETRIES', '3'))
 
 # LegiScan status code mapping
 STATUS_MAP = {
@@ -45,608 +73,713 @@ STATES = {
     'WI': 'Wisconsin', 'WY': 'Wyoming'
 }
 
-# Policy-relevant terms to filter noise
-POLICY_TERMS = [
-    'bank', 'banking', 'tax', 'deduction', '280e', 'safe banking',
-    'commerce', 'interstate', 'import', 'export', 'trade',
-    'administration', 'regulation', 'regulatory', 'rule', 'rulemaking',
-    'license', 'licensing', 'licensee', 'permit',
-    'scheduling', 'schedule i', 'schedule ii', 'schedule iii',
-    'decriminalization', 'legalization', 'legalize',
-    'medical', 'recreational', 'adult-use', 'adult use',
-    'dispensary', 'dispensaries', 'cultivation', 'cultivator',
-    'manufacturer', 'manufacturing', 'processor', 'retailer',
-    'delivery', 'transporter',
-    'enforcement', 'compliance', 'violation', 'penalty', 'penalties',
-    'black market', 'gray market', 'grey market', 'illicit',
-    'testing', 'test', 'potency', 'thc', 'cbd', 'contaminant',
-    'pesticide', 'lab', 'laboratory',
-    'equity', 'social equity', 'expungement', 'record', 'conviction',
-    'tribal', 'reservation',
-    'fund', 'funding', 'grant', 'appropriation', 'cash fund',
-    'revenue', 'fee', 'fees',
-    'possession', 'consume', 'consumption', 'use', 'impairment',
-    'dui', 'dwi', 'workplace',
-    'hemp', 'research', 'study', 'pilot', 'program'
-]
-
-def is_relevant_bill(title, description):
-    """Filter out non-policy bills"""
-    text = (title + ' ' + description).lower()
-    cannabis_mentioned = any(term in text for term in ['cannabis', 'marijuana', 'marihuana'])
+def build_bill(bill_info, state_code, state_name, matched_terms=None):
+    """Convert a LegiScan bill payload into the bills.json schema"""
+    status_code = bill_info.get('status', 0)
+    status_text = STATUS_MAP.get(status_code, 'Unknown')
+    
+    bill = {
+        'id': bill_info.get('bill_id'),
+        'state_code': state_code,
+        'state_name': state_name,
+        'bill_number': bill_info.get('bill_number'),
+        'title': bill_info.get('title', ''),
+        'description': bill_info.get('description', '')[:500],
+        'status': status_text,
+        'status_code': status_code,
+        'status_date': bill_info.get('status_date'),
+        'url': bill_info.get('url'),
+        'last_action': bill_info.get('last_action'),
+        'last_action_date': bill_info.get('last_action_date'),
+        'sponsors': [],
+        'matched_terms': matched_terms or [],
+        'analysis_url': None
+    }
     
-    if not cannabis_mentioned:
-        return False
+    for sponsor in bill_info.get('sponsors', [])[:5]:
+        bill['sponsors'].append({
+            'name': sponsor.get('name'),
+            'party': sponsor.get('party', ''),
+            'role': sponsor.get('role', '')
+        })
     
-    policy_mentioned = any(term in text for term in POLICY_TERMS)
-    return policy_mentioned
+    return bill
 
-def fetch_bills_for_state(state_code, state_name):
-    """Fetch cannabis-related bills for a specific state"""
-    print(f"Fetching bills for {state_name}...")
-    
-    year_param = 2
-    search_url = LEGISCAN_BASE_URL.format(LEGISCAN_API_KEY, 'getSearch')
-    search_params = {
-        'state': state_code,
-        'query': 'cannabis OR marijuana',
-        'year': year_param
-    }
-    
+def fetch_text_documents(bill_id, state_code, bill_info, client, text_store):
+    """Download the new text documents of a relevant bill; a failure never drops the bill"""
+    try:
+        text_store.fetch_texts(bill_id, bill_info.get('texts', []), client)
+    except Exception as e:
+        log('text_error', f"  Warning: Error fetching bill texts: {e}", state=state_code, bill_id=bill_id,
+            error=str(e))
+
+def fetch_missing_texts(bill_id, state_code, client, text_store, change_hash=None):
+    """getBill for a reused bill whose texts were never checked, then download its documents"""
+    try:
+        bill_info = client.get_bill(bill_id, change_hash).get('bill', {})
+    except Exception as e:
+        log('text_error', f"  Warning: Error fetching bill texts: {e}", state=state_code, bill_id=bill_id,
+            error=str(e))
+        return
+    fetch_text_documents(bill_id, state_code, bill_info, client, text_store)
+
+def fetch_bill_detail(bill_id, state_code, state_name, client, text_store=None, change_hash=None):
+    """Fetch one bill via getBill. Returns (bill, filtered).
+
+    ``change_hash`` is the search hit's; a cached getBill response with a
+    different hash is fetched again rather than served. With a
+    ``text_store``, the bill's text documents it does not hold yet are
+    downloaded too.
+    """
     try:
-        response = requests.get(search_url, params=search_params)
+        bill_info = client.get_bill(bill_id, change_hash).get('bill', {})
         
-        if response.status_code != 200:
-            print(f"  Warning: Error fetching {state_name}: HTTP {response.status_code}")
-            return []
+        relevant, matched_terms = classify(bill_info.get('title', ''), bill_info.get('description', ''))
         
-        data = response.json()
+        if not relevant:
+            return None, True
         
-        if data.get('status') != 'OK':
-            print(f"  Warning: API Error for {state_name}: {data.get('alert', {}).get('message', 'Unknown')}")
-            return []
+        if text_store is not None:
+            fetch_text_documents(bill_id, state_code, bill_info, client, text_store)
+        return build_bill(bill_info, state_code, state_name, matched_terms), False
+        
+    except Exception as e:
+        log('bill_error', f"  Warning: Error fetching bill details: {e}", state=state_code, bill_id=bill_id, error=str(e))
+        return None, False
+
+def fetch_bills_for_state(state_code, state_name, client, executor=None, scrape_state=None, prefilter=None,
+                          metrics=None, planner=None, text_store=None, previous=None):
+    """Fetch cannabis-related bills for a specific state
+    
+    getBill calls are fanned out over ``executor`` when one is given; the
+    ``client`` applies rate limiting and retries. With a
+    ``scrape_state``, hits whose change_hash is unchanged are taken from
+    the previous snapshot without calling getBill. A ``prefilter`` drops
+    hits from the search metadata alone before they cost a getBill call.
+    Per-state counts and wall time go to ``metrics`` when given. A
+    ``planner`` caps the getBill calls to the run's request budget; hits
+    it defers keep their previous version until a later run. New text
+    documents of fetched bills go to ``text_store`` when given, and so do
+    those of reused bills the store has never checked (one getBill each,
+    within the planner's budget). Hits whose getBill call failed keep
+    their version from ``previous`` ({id: bill}) instead of dropping out
+    of the results.
+    Returns None when the state could not be fetched at all.
+    """
+    log('state_start', f"Fetching bills for {state_name}...", state=state_code)
+    start = time.perf_counter()
+    
+    year_param = 2
+    
+    try:
+        data = client.get_search(state_code, 'cannabis OR marijuana', year_param)
         
         search_results = data.get('searchresult', {})
         
         if not search_results or search_results.get('summary', {}).get('count', 0) == 0:
-            print(f"  Info: No bills found for {state_name}")
+            if planner is not None:
+                planner.select([])
+            log('state_done', f"  Info: No bills found for {state_name}", state=state_code, bills=0)
+            if metrics is not None:
+                metrics.record_state(state_code, time.perf_counter() - start, hits=0, bills=0)
             return []
         
         bills = []
-        filtered_count = 0
+        hits = []
+        text_hits = []
+        skipped_count = 0
         
         for bill_id, bill_data in search_results.items():
             if bill_id == 'summary':
                 continue
             
-            bill_url = LEGISCAN_BASE_URL.format(LEGISCAN_API_KEY, 'getBill')
-            bill_params = {'id': bill_data.get('bill_id')}
+            hit_id = bill_data.get('bill_id')
+            change_hash = bill_data.get('change_hash')
             
-            try:
-                bill_response = requests.get(bill_url, params=bill_params)
-                
-                if bill_response.status_code == 200:
-                    bill_detail = bill_response.json()
-                    
-                    if bill_detail.get('status') == 'OK':
-                        bill_info = bill_detail.get('bill', {})
-                        
-                        title = bill_info.get('title', '')
-                        description = bill_info.get('description', '')
-                        
-                        if not is_relevant_bill(title, description):
-                            filtered_count += 1
-                            continue
-                        
-                        status_code = bill_info.get('status', 0)
-                        status_text = STATUS_MAP.get(status_code, 'Unknown')
-                        
-                        bill = {
-                            'id': bill_info.get('bill_id'),
-                            'state_code': state_code,
-                            'state_name': state_name,
-                            'bill_number': bill_info.get('bill_number'),
-                            'title': title,
-                            'description': description[:500],
-                            'status': status_text,
-                            'status_code': status_code,
-                            'status_date': bill_info.get('status_date'),
-                            'url': bill_info.get('url'),
-                            'last_action': bill_info.get('last_action'),
-                            'last_action_date': bill_info.get('last_action_date'),
-                            'sponsors': [],
-                            'analysis_url': None
-                        }
-                        
-                        for sponsor in bill_info.get('sponsors', [])[:5]:
-                            bill['sponsors'].append({
-                                'name': sponsor.get('name'),
-                                'party': sponsor.get('party', ''),
-                                'role': sponsor.get('role', '')
-                            })
-                        
-                        bills.append(bill)
-                
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"  Warning: Error fetching bill details: {e}")
+            if scrape_state is not None:
+                cached = scrape_state.cached_bill(hit_id, change_hash)
+                if cached is not None:
+                    bills.append(cached)
+                    # Reused without getBill, so texts are only fetched if this bill never had them checked
+                    if text_store is not None and not text_store.has_bill(hit_id):
+                        text_hits.append((hit_id, change_hash, bill_data))
+                    continue
+            
+            if prefilter is not None and prefilter.reject(hit_id, change_hash, bill_data):
+                skipped_count += 1
+                continue
+            
+            hits.append((hit_id, change_hash, bill_data))
+        
+        reused_count = len(bills)
+        
+        previous = previous or {}
+        deferred_count = 0
+        if planner is not None:
+            hits, deferred = planner.select(hits)
+            deferred_count = len(deferred)
+            # No hash is recorded for these, so the next run fetches them
+            for hit_id, _, _ in deferred:
+                if hit_id in previous:
+                    bills.append(previous[hit_id])
+            # Text backfills cost a getBill each; the ones over budget wait for a later run
+            text_hits, _ = planner.select(text_hits, search_calls=0)
+        
+        if executor is not None:
+            futures = [
+                executor.submit(fetch_bill_detail, hit_id, state_code, state_name, client, text_store, change_hash)
+                for hit_id, change_hash, _ in hits
+            ]
+            text_futures = [
+                executor.submit(fetch_missing_texts, hit_id, state_code, client, text_store, change_hash)
+                for hit_id, change_hash, _ in text_hits
+            ]
+            results = [future.result() for future in futures]
+            for future in text_futures:
+                future.result()
+        else:
+            results = [
+                fetch_bill_detail(hit_id, state_code, state_name, client, text_store, change_hash)
+                for hit_id, change_hash, _ in hits
+            ]
+            for hit_id, change_hash, _ in text_hits:
+                fetch_missing_texts(hit_id, state_code, client, text_store, change_hash)
+        
+        filtered_count = 0
+        error_count = 0
+        kept_count = 0
+        for (hit_id, change_hash, _), (bill, filtered) in zip(hits, results):
+            if filtered:
+                filtered_count += 1
+                if prefilter is not None:
+                    prefilter.deny(hit_id, change_hash)
+            elif bill is None:
+                # A failed getBill says nothing about relevance, so the bill is never denylisted.
+                # Its previous version stays (without a hash, so the next run fetches it again)
+                error_count += 1
+                if hit_id in previous:
+                    bills.append(previous[hit_id])
+                    kept_count += 1
+            if bill is None:
                 continue
+            if prefilter is not None:
+                prefilter.allow(hit_id)
+            if scrape_state is not None:
+                bill['analysis_url'] = scrape_state.previous_analysis_url(hit_id)
+                scrape_state.record(hit_id, change_hash)
+            bills.append(bill)
         
+        counts = {
+            'hits': reused_count + skipped_count + deferred_count + len(hits), 'reused': reused_count,
+            'prefiltered': skipped_count, 'deferred': deferred_count, 'fetched': len(hits),
+            'filtered': filtered_count, 'errors': error_count, 'kept': kept_count, 'bills': len(bills),
+            'text_backfills': len(text_hits),
+        }
+        if metrics is not None:
+            metrics.record_state(state_code, time.perf_counter() - start, **counts)
+        # Detail lines for text logs; JSON logs carry the counts on state_done
+        if reused_count > 0:
+            echo(f"  Info: Reused {reused_count} unchanged bills from previous snapshot")
+        if text_hits:
+            echo(f"  Info: Fetched texts of {len(text_hits)} reused bills")
+        if skipped_count > 0:
+            echo(f"  Info: Pre-filter skipped {skipped_count} search hits before getBill")
+        if deferred_count > 0:
+            echo(f"  Info: Deferred {deferred_count} getBill calls to a later run (request budget)")
         if filtered_count > 0:
-            print(f"  Info: Filtered out {filtered_count} non-policy bills")
-        print(f"  Success: Found {len(bills)} relevant bills for {state_name}")
+            echo(f"  Info: Filtered out {filtered_count} non-policy bills")
+        log('state_done', f"  Success: Found {len(bills)} relevant bills for {state_name}",
+            state=state_code, seconds=round(time.perf_counter() - start, 3), **counts)
         return bills
         
     except Exception as e:
-        print(f"  Warning: Error for {state_name}: {e}")
-        return []
-
-def fetch_all_bills():
-    """Fetch cannabis bills from all states"""
-    if not LEGISCAN_API_KEY:
-        print("ERROR: LEGISCAN_API_KEY environment variable not set")
-        return []
-    
-    print("=" * 70)
-    print("Cannabis Legislation Tracker - Fetching All States")
-    print("=" * 70)
-    print()
-    
-    all_bills = []
-    
-    for state_code, state_name in STATES.items():
-        bills = fetch_bills_for_state(state_code, state_name)
-        all_bills.extend(bills)
-        time.sleep(1)
-    
-    return all_bills
-
-def escape_html(text):
-    """Escape HTML special characters"""
-    if not text:
-        return ''
-    return (str(text)
-            .replace('&', '&amp;')
-            .replace('<', '&lt;')
-            .replace('>', '&gt;')
-            .replace('"', '&quot;')
-            .replace("'", '&#39;'))
-
-def get_status_class(status):
-    """Get CSS class for bill status"""
-    status_lower = status.lower()
-    
-    if 'introduced' in status_lower:
-        return 'status-introduced'
-    if 'committee' in status_lower:
-        return 'status-committee'
-    if 'passed' in status_lower:
-        return 'status-passed'
-    if 'enacted' in status_lower or 'signed' in status_lower:
-        return 'status-enacted'
-    
-    return 'status-introduced'
+        log('state_error', f"  Warning: Error for {state_name}: {e}", state=state_code, error=str(e))
+        if metrics is not None:
+            metrics.record_state(state_code, time.perf_counter() - start, failed=1)
+        return None
 
-def format_date(date_str):
-    """Format date string"""
-    if not date_str:
-        return 'Unknown'
+def fetch_bills_from_datasets(state_code, state_name, client, executor=None, scrape_state=None,
+                              prefilter=None, metrics=None, planner=None, text_store=None, previous=None):
+    """Fetch cannabis-related bills for a state from its session dataset archives
+    
+    One getDatasetList call per state plus one getDataset call per changed
+    session replaces the getSearch + getBill round trips. ``executor``,
+    ``scrape_state``, ``prefilter``, ``planner`` and ``previous`` are accepted for signature
+    compatibility; archives are already cached by dataset hash and hold
+    every bill's full text fields. Returns None on failure.
+    """
+    log('state_start', f"Fetching datasets for {state_name}...", state=state_code)
+    start = time.perf_counter()
     
     try:
-        date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        return date.strftime('%b %d, %Y')
-    except:
-        return date_str
-
-def generate_bill_card_html(bill):
-    """Generate HTML for a single bill card"""
-    status_class = get_status_class(bill['status'])
-    sponsors = bill['sponsors'][:3]
-    has_more_sponsors = len(bill['sponsors']) > 3
-    
-    date_to_use = bill.get('last_action_date') or bill.get('status_date')
-    last_action_date = format_date(date_to_use)
-    
-    is_federal = bill['state_code'] == 'US'
-    state_badge_class = 'state-badge-federal' if is_federal else 'state-badge-state'
-    
-    # Build sponsors HTML
-    sponsors_html = ''
-    if sponsors:
-        sponsor_tags = []
-        for sponsor in sponsors:
-            party = f" ({escape_html(sponsor.get('party'))})" if sponsor.get('party') else ''
-            sponsor_tags.append(f'<span class="sponsor-tag">{escape_html(sponsor["name"])}{party}</span>')
+        bills = []
+        filtered_count = 0
         
-        if has_more_sponsors:
-            sponsor_tags.append(f'<span class="sponsor-tag">+{len(bill["sponsors"]) - 3} more</span>')
+        for bill_info in iter_state_bills(state_code, client):
+            relevant, matched_terms = classify(bill_info.get('title', ''), bill_info.get('description', ''))
+            if not relevant:
+                filtered_count += 1
+                continue
+            if text_store is not None:
+                fetch_text_documents(bill_info.get('bill_id'), state_code, bill_info, client, text_store)
+            bills.append(build_bill(bill_info, state_code, state_name, matched_terms))
         
-        sponsors_html = f'''
-            <div class="bill-sponsors">
-                <strong>Sponsors:</strong>
-                <div class="sponsor-list">
-                    {' '.join(sponsor_tags)}
-                </div>
-            </div>
-        '''
-    
-    # Build analysis button HTML
-    if bill.get('analysis_url'):
-        analysis_btn = f'''
-            <a href="{escape_html(bill['analysis_url'])}" target="_blank" rel="noopener noreferrer" class="btn btn-analysis">
-                Read CBDT Analysis
-            </a>
-        '''
-    else:
-        analysis_btn = '''
-            <span class="btn btn-disabled" title="Analysis coming soon">
-                Analysis Pending
-            </span>
-        '''
-    
-    return f'''
-        <article class="bill-card" data-state="{escape_html(bill['state_name'])}" data-state-code="{escape_html(bill['state_code'])}" data-status="{escape_html(bill['status'])}" data-date="{escape_html(date_to_use or '')}">
-            <div class="bill-header">
-                <div class="bill-title">
-                    <div class="bill-meta-top">
-                        <span class="state-badge {state_badge_class}">{escape_html(bill['state_name'])}</span>
-                        <span class="bill-number">{escape_html(bill['bill_number'])}</span>
-                    </div>
-                    <h3>{escape_html(bill['title'])}</h3>
-                </div>
-                <div class="bill-status {status_class}">
-                    {escape_html(bill['status'])}
-                </div>
-            </div>
-            
-            <p class="bill-description">
-                {escape_html(bill['description'])}
-            </p>
-            
-            <div class="bill-meta">
-                <div class="bill-meta-item">
-                    <strong>Last Action:</strong> {escape_html(last_action_date)}
-                </div>
-            </div>
-            
-            {sponsors_html}
-            
-            <div class="bill-actions">
-                <a href="{escape_html(bill['url'])}" target="_blank" rel="noopener noreferrer" class="btn btn-secondary">
-                    View on LegiScan
-                </a>
-                {analysis_btn}
-            </div>
-        </article>
-    '''
+        counts = {'hits': len(bills) + filtered_count, 'filtered': filtered_count, 'bills': len(bills)}
+        if metrics is not None:
+            metrics.record_state(state_code, time.perf_counter() - start, **counts)
+        if filtered_count > 0:
+            echo(f"  Info: Filtered out {filtered_count} non-policy bills")
+        log('state_done', f"  Success: Found {len(bills)} relevant bills for {state_name}",
+            state=state_code, seconds=round(time.perf_counter() - start, 3), **counts)
+        return bills
+        
+    except Exception as e:
+        log('state_error', f"  Warning: Error for {state_name}: {e}", state=state_code, error=str(e))
+        if metrics is not None:
+            metrics.record_state(state_code, time.perf_counter() - start, failed=1)
+        return None
 
-def generate_html(bills, last_updated):
-    """Generate complete HTML file with pre-rendered bills"""
+def fetch_all_bills(max_workers=None, rate_limit=None, scrape_state=None, backend='search',
+                    max_retries=None, cache=None, offline=False, checkpoint=None, states=None,
+                    prefilter=None, metrics=None, planner=None, carried=None, text_store=None,
+                    previous_bills=None):
+    """Fetch cannabis bills from all states
+    
+    States and bill details are fetched by up to ``max_workers`` threads
+    each; every request goes through one pooled LegiScanClient whose token
+    bucket is refilled at ``rate_limit`` requests per second. ``backend``
+    selects per-bill search calls ('search') or bulk session datasets
+    ('dataset'). Responses go through ``cache`` when given; ``offline``
+    answers every call from it. With a ``checkpoint``, each finished state
+    is saved as it completes and states already saved are not fetched.
+    ``states`` restricts the scan to a subset of STATES (e.g. one shard)
+    and ``prefilter`` screens search hits before getBill. Per-state and
+    per-op counters are recorded in ``metrics`` when given. A ``planner``
+    submits the states highest priority first and caps getBill calls to
+    its request budget. States in ``carried`` ({code: bills}) are not
+    fetched; their previous bills are returned as they are. With a
+    ``text_store``, new text documents of relevant bills are downloaded.
+    ``previous_bills`` (the last snapshot) stands in for states and bills
+    that fail, so a failed fetch never looks like a removed bill.
+    """
+    if not LEGISCAN_API_KEY and not offline:
+        log('error', "ERROR: LEGISCAN_API_KEY environment variable not set")
+        return []
     
-    # Sort bills by most recent first
-    bills.sort(key=lambda x: x.get('last_action_date') or x.get('status_date') or '', reverse=True)
+    states = STATES if states is None else states
+    carried = {code: bills for code, bills in (carried or {}).items() if code in states}
+    max_workers = max_workers or LEGISCAN_MAX_WORKERS
+    rate_limit = LEGISCAN_RATE_LIMIT if rate_limit is None else rate_limit
+    max_retries = LEGISCAN_MAX_RETRIES if max_retries is None else max_retries
+    
+    echo("=" * 70)
+    echo(f"Cannabis Legislation Tracker - Fetching {len(states) - len(carried)} Jurisdictions")
+    echo(f"Workers: {max_workers}, rate limit: {rate_limit} requests/sec")
+    echo("=" * 70)
+    echo()
+    log('scan_start', states=len(states) - len(carried), carried=len(carried), workers=max_workers, rate_limit=rate_limit, backend=backend)
+    
+    fetch_state = fetch_bills_from_datasets if backend == 'dataset' else fetch_bills_for_state
+    client = LegiScanClient(LEGISCAN_API_KEY, LEGISCAN_BASE_URL, limiter=TokenBucket(rate_limit),
+                            max_retries=max_retries, pool_size=max_workers * 2,
+                            cache=cache, offline=offline)
+    results = {}
+    failed_states = []
+    previous = {bill.get('id'): bill for bill in previous_bills or []}
+    previous_by_state = {}
+    for bill in previous_bills or []:
+        previous_by_state.setdefault(bill.get('state_code'), []).append(bill)
+    
+    if checkpoint is not None:
+        for state_code in checkpoint.completed_states() & set(states):
+            bills, hashes = checkpoint.load(state_code)
+            if scrape_state is not None:
+                scrape_state.restore(hashes)
+            results[state_code] = bills
+        if results:
+            log('resume', f"Resuming: {len(results)} jurisdictions loaded from checkpoint", states=len(results))
+            echo()
+    
+    for state_code, bills in carried.items():
+        if state_code not in results:
+            if scrape_state is not None:
+                scrape_state.carry(bills)
+            results[state_code] = bills
+    
+    # Scan order only; bills.json keeps the STATES order below
+    scan_order = planner.order(states) if planner is not None else states
+    
+    with client, ThreadPoolExecutor(max_workers=max_workers) as detail_executor, \
+            ThreadPoolExecutor(max_workers=max_workers) as state_executor:
+        futures = {
+            state_executor.submit(fetch_state, state_code, state_name, client,
+                                  detail_executor, scrape_state, prefilter, metrics, planner,
+                                  text_store, previous): state_code
+            for state_code, state_name in scan_order.items()
+            if state_code not in results
+        }
+        for future in as_completed(futures):
+            state_code = futures[future]
+            bills = future.result()
+            if bills is None:
+                # Not checkpointed, so --resume fetches it again; the previous bills stand in until then
+                failed_states.append(state_code)
+                kept = previous_by_state.get(state_code, [])
+                if scrape_state is not None:
+                    scrape_state.carry(kept)
+                results[state_code] = kept
+                continue
+            if checkpoint is not None:
+                hashes = scrape_state.hashes_for(bills) if scrape_state is not None else None
+                checkpoint.save(state_code, bills, hashes)
+            results[state_code] = bills
+    
+    # Deterministic order (state, then bill id) so an unchanged scan writes an identical bills.json
+    all_bills = [
+        bill for state_code in states
+        for bill in sorted(results.get(state_code, []), key=lambda b: b.get('id') or 0)
+    ]
     
-    # Calculate stats
-    total_bills = len(bills)
-    states_with_bills = set(bill['state_name'] for bill in bills)
-    total_states = len(states_with_bills)
+    if failed_states:
+        echo()
+        log('states_failed', f"Warning: {len(failed_states)} jurisdictions failed and were not checkpointed "
+            f"(their previous bills are kept): {', '.join(sorted(failed_states))}", states=sorted(failed_states))
+    
+    api_stats = client.stats_report()
+    if metrics is not None:
+        metrics.set_api_stats(api_stats)
+    echo()
+    echo("API calls:")
+    for op, stats in api_stats.items():
+        log('api_stats', f"  {op}: {stats['calls']} calls, {stats['cache_hits']} cached, "
+            f"{stats['revalidated']} revalidated, {stats['retries']} retries, {stats['errors']} errors, "
+            f"avg {stats['avg_ms']} ms, max {stats['max_ms']} ms, {stats['bytes'] / 1024:,.0f} KB",
+            op=op, **stats)
+    if prefilter is not None and prefilter.saved_calls:
+        log('prefilter_stats', f"  getBill calls saved by pre-filter: {prefilter.saved_calls} "
+            f"(denylist {prefilter.skipped['denylist']}, title {prefilter.skipped['title']})",
+            saved_calls=prefilter.saved_calls, **prefilter.skipped)
+    if planner is not None and planner.deferred:
+        log('budget_stats', f"  getBill calls deferred by the request budget: {planner.deferred} "
+            f"(budget {planner.budget})", deferred=planner.deferred, budget=planner.budget)
+    if text_store is not None:
+        log('text_stats', f"  Bill texts: {text_store.downloaded} downloaded, {text_store.deduplicated} "
+            f"already held under another doc_id", downloaded=text_store.downloaded,
+            deduplicated=text_store.deduplicated)
     
-    active_bills = [
-        b for b in bills 
-        if not any(term in b['status'].lower() for term in ['enacted', 'vetoed', 'failed', 'dead'])
-    ]
-    active_count = len(active_bills)
-    
-    analyzed_bills = [b for b in bills if b.get('analysis_url')]
-    analyzed_count = len(analyzed_bills)
-    
-    # Format last updated
-    last_updated_formatted = datetime.fromisoformat(last_updated.replace('Z', '+00:00')).strftime('%B %d, %Y at %I:%M %p')
-    
-    # Generate bill cards HTML
-    bill_cards_html = '\n'.join(generate_bill_card_html(bill) for bill in bills)
-    
-    # Generate state options for filter
-    sorted_states = sorted([s for s in states_with_bills if s != 'Federal'])
-    state_options_html = '\n'.join(
-        f'<option value="{escape_html(state)}">{escape_html(state)}</option>'
-        for state in sorted_states
-    )
-    
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    
-    <!-- Primary Meta Tags -->
-    <title>Cannabis Legislation Tracker - Real-Time Bills Across All 50 States | Dan K Reports</title>
-    <meta name="title" content="Cannabis Legislation Tracker - Real-Time Bills Across All 50 States | Dan K Reports">
-    <meta name="description" content="Track cannabis legislation in real-time across all 50 states and federal government. Monitor bills, status changes, and legislative progress with data-driven CBDT Framework analysis.">
-    <meta name="keywords" content="cannabis legislation, marijuana bills, cannabis policy tracker, legalization tracker, cannabis reform, state cannabis laws, federal cannabis bills, CBDT Framework, cannabis market analysis">
-    <meta name="author" content="Daniel Kief">
-    <meta name="robots" content="index, follow, max-image-preview:large, max-snippet:-1, max-video-preview:-1">
-    <link rel="canonical" href="https://tracker.dankreports.com/">
-    
-    <!-- Open Graph / Facebook Meta Tags -->
-    <meta property="og:type" content="website">
-    <meta property="og:url" content="https://tracker.dankreports.com/">
-    <meta property="og:title" content="Cannabis Legislation Tracker - Real-Time Bills Across All 50 States">
-    <meta property="og:description" content="Track cannabis legislation in real-time across all 50 states and federal government. Monitor bills, status changes, and legislative progress with data-driven CBDT Framework analysis.">
-    <meta property="og:image" content="https://tracker.dankreports.com/og-image.jpg">
-    <meta property="og:image:width" content="1200">
-    <meta property="og:image:height" content="630">
-    <meta property="og:site_name" content="Dan K Reports - Cannabis Legislation Tracker">
-    
-    <!-- Twitter Card Meta Tags -->
-    <meta name="twitter:card" content="summary_large_image">
-    <meta name="twitter:url" content="https://tracker.dankreports.com/">
-    <meta name="twitter:title" content="Cannabis Legislation Tracker - Real-Time Bills Across All 50 States">
-    <meta name="twitter:description" content="Track cannabis legislation in real-time across all 50 states and federal government with CBDT Framework analysis.">
-    <meta name="twitter:image" content="https://tracker.dankreports.com/og-image.jpg">
-    
-    <!-- Additional SEO Meta Tags -->
-    <meta name="theme-color" content="#2ecc71">
-    <meta name="apple-mobile-web-app-capable" content="yes">
-    <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
-    <meta name="apple-mobile-web-app-title" content="Cannabis Tracker">
-    
-    <!-- Favicon -->
-    <link rel="icon" type="image/png" href="logo.png">
-    <link rel="apple-touch-icon" href="logo.png">
-    
-    <!-- Preconnect for Performance -->
-    <link rel="preconnect" href="https://dankreports.com">
-    <link rel="dns-prefetch" href="https://dankreports.com">
-    
-    <!-- Stylesheet -->
-    <link rel="stylesheet" href="style.css">
-    
-    <!-- Structured Data / Schema.org JSON-LD -->
-    <script type="application/ld+json">
-    {{{{
-      "@context": "https://schema.org",
-      "@graph": [
-        {{{{
-          "@type": "WebApplication",
-          "@id": "https://tracker.dankreports.com/#webapp",
-          "name": "Cannabis Legislation Tracker",
-          "applicationCategory": "GovernmentApplication",
-          "operatingSystem": "Web Browser",
-          "url": "https://tracker.dankreports.com/",
-          "description": "Real-time tracking of cannabis legislation across all 50 states and federal government using LegiScan API with data-driven CBDT Framework analysis.",
-          "offers": {{{{
-            "@type": "Offer",
-            "price": "0",
-            "priceCurrency": "USD"
-          }}}},
-          "author": {{{{
-            "@type": "Person",
-            "name": "Daniel Kief",
-            "url": "https://www.dankreports.com/"
-          }}}},
-          "publisher": {{{{
-            "@type": "Organization",
-            "name": "Dan K Reports",
-            "url": "https://www.dankreports.com/",
-            "logo": {{{{
-              "@type": "ImageObject",
-              "url": "https://www.dankreports.com/content/images/size/w256h256/2025/11/output-onlinegiftools.gif"
-            }}}}
-          }}}},
-          "featureList": [
-            "Real-time cannabis bill tracking across all 50 states",
-            "Federal cannabis legislation monitoring",
-            "LegiScan API integration for up-to-date data",
-            "CBDT Framework analysis integration",
-            "Advanced filtering by state, status, and keywords",
-            "Bill status tracking and legislative progress"
-          ]
-        }}}},
-        {{{{
-          "@type": "WebSite",
-          "@id": "https://tracker.dankreports.com/#website",
-          "url": "https://tracker.dankreports.com/",
-          "name": "Cannabis Legislation Tracker",
-          "description": "Track cannabis legislation across America in real-time",
-          "publisher": {{{{
-            "@id": "https://www.dankreports.com/#organization"
-          }}}},
-          "potentialAction": {{{{
-            "@type": "SearchAction",
-            "target": {{{{
-              "@type": "EntryPoint",
-              "urlTemplate": "https://tracker.dankreports.com/?search={{{{search_term_string}}}}"
-            }}}},
-            "query-input": "required name=search_term_string"
-          }}}}
-        }}}},
-        {{{{
-          "@type": "Organization",
-          "@id": "https://www.dankreports.com/#organization",
-          "name": "Dan K Reports",
-          "url": "https://www.dankreports.com/",
-          "logo": {{{{
-            "@type": "ImageObject",
-            "url": "https://www.dankreports.com/content/images/size/w256h256/2025/11/output-onlinegiftools.gif",
-            "width": 256,
-            "height": 256
-          }}}},
-          "sameAs": [
-            "https://www.cbdttheory.com"
-          ]
-        }}}},
-        {{{{
-          "@type": "BreadcrumbList",
-          "@id": "https://tracker.dankreports.com/#breadcrumb",
-          "itemListElement": [
-            {{{{
-              "@type": "ListItem",
-              "position": 1,
-              "name": "Home",
-              "item": "https://www.dankreports.com/"
-            }}}},
-            {{{{
-              "@type": "ListItem",
-              "position": 2,
-              "name": "Cannabis Legislation Tracker",
-              "item": "https://tracker.dankreports.com/"
-            }}}}
-          ]
-        }}}}
-      ]
-    }}}}
-    </script>
-</head>
-<body>
-    <header>
-        <div class="container">
-            <div class="header-content">
-                <div class="header-title-row">
-                    <img src="logo.png" alt="Dan K Reports Logo" class="header-logo">
-                    <div class="header-text">
-                        <h1>Cannabis Legislation Tracker</h1>
-                        <p class="subtitle">All 50 States + Federal - Real-time tracking with data-driven analysis</p>
-                    </div>
-                </div>
-            </div>
-            <div class="header-meta">
-                <span class="last-updated">Last Updated: <time datetime="{escape_html(last_updated)}">{escape_html(last_updated_formatted)}</time></span>
-                <a href="https://dankreports.com" class="btn-primary" rel="noopener noreferrer">Visit Dan K Reports</a>
-            </div>
-        </div>
-    </header>
+    return all_bills
 
-    <main class="container">
-        <section class="intro">
-            <h2>Track Cannabis Policy Across America</h2>
-            <p>
-                This tracker monitors cannabis legislation across all 50 states and the federal government using the LegiScan API, 
-                providing up-to-date information on bills, status changes, and legislative progress. 
-                For in-depth analysis of significant bills, visit 
-                <a href="https://dankreports.com" rel="noopener noreferrer">Dan K Reports</a> where we apply 
-                the Consumer-Driven Black Market Displacement (CBDT) Framework to predict policy outcomes.
-            </p>
-        </section>
+def parse_shard(spec):
+    """Parse an ``i/N`` shard spec (1-based) into (index, count)"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {spec!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and N, got {spec!r}")
+    return index, count
 
-        <section class="filters">
-            <h3>Filter Bills</h3>
-            <div class="filter-controls">
-                <input type="text" id="searchInput" placeholder="Search bills by title, description, or bill number..." aria-label="Search bills">
-                
-                <select id="stateFilter" aria-label="Filter by state">
-                    <option value="all">All States + Federal</option>
-                    <option value="US">Federal Only</option>
-                    <optgroup label="States">
-                        {state_options_html}
-                    </optgroup>
-                </select>
+def shard_states(index, count, states=None):
+    """Round-robin slice of the jurisdictions handled by shard ``index`` of ``count``"""
+    states = STATES if states is None else states
+    return {code: name for i, (code, name) in enumerate(states.items()) if i % count == index - 1}
 
-                <select id="statusFilter" aria-label="Filter by status">
-                    <option value="all">All Statuses</option>
-                    <option value="introduced">Introduced</option>
-                    <option value="committee">In Committee</option>
-                    <option value="passed">Passed</option>
-                    <option value="enacted">Enacted</option>
-                </select>
+def shard_file(index, count):
+    """Partial result file written by one shard"""
+    return SHARD_FILE_PATTERN.format(index, count)
 
-                <select id="sortOrder" aria-label="Sort order">
-                    <option value="recent">Most Recent</option>
-                    <option value="oldest">Oldest First</option>
-                    <option value="state">By State</option>
-                    <option value="alphabetical">By Bill Number</option>
-                </select>
-            </div>
-        </section>
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Fetch cannabis bills from LegiScan and render index.html')
+    parser.add_argument('--workers', type=int, default=LEGISCAN_MAX_WORKERS,
+                        help='concurrent worker threads (default: %(default)s)')
+    parser.add_argument('--rate-limit', type=float, default=LEGISCAN_RATE_LIMIT,
+                        help='max API requests per second, 0 for unlimited (default: %(default)s)')
+    parser.add_argument('--retries', type=int, default=LEGISCAN_MAX_RETRIES,
+                        help='retries per API call on 429/5xx/connection errors (default: %(default)s)')
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help=f"fetch only shard i of N and write {SHARD_FILE_PATTERN.format('i', 'N')} "
+                             "instead of bills.json/index.html (combine with merge_shards.py)")
+    parser.add_argument('--prefilter', choices=PREFILTER_MODES, default='denylist',
+                        help=f"screen search hits before getBill: 'denylist' skips unchanged bills "
+                             f"already ruled irrelevant ({DENYLIST_FILE}), 'title' also requires the "
+                             f"search title to pass the relevance filter (default: %(default)s)")
+    parser.add_argument('--resume', action='store_true',
+                        help='continue the last unfinished scan, skipping jurisdictions already checkpointed')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help='do not write per-state checkpoints')
+    parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR,
+                        help='directory for per-state checkpoints (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='bypass the on-disk response cache')
+    parser.add_argument('--offline', action='store_true',
+                        help='answer every API call from the response cache, regardless of age')
+    parser.add_argument('--cache-path', default=RESPONSE_CACHE_PATH,
+                        help='response cache database (default: %(default)s)')
+    parser.add_argument('--cache-max-mb', type=int, default=RESPONSE_CACHE_MAX_BYTES // (1024 * 1024),
+                        help='evict least recently used responses beyond this size (default: %(default)s)')
+    parser.add_argument('--cache-ttl', action='append', default=[], metavar='OP=SECONDS',
+                        help='override the cache TTL of one op, e.g. getBill=3600 (repeatable)')
+    parser.add_argument('--backend', choices=['search', 'dataset'], default='search',
+                        help="'search' calls getSearch + getBill per bill; 'dataset' downloads each "
+                             "session's bulk archive once (default: %(default)s)")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'only call getBill for new or changed bills, reusing the rest from '
+                             f'bills.json (hashes kept in {SCRAPE_STATE_FILE})')
+    parser.add_argument('--bill-db', default=BILL_DB_PATH,
+                        help='SQLite bill store the outputs are rendered from (default: %(default)s)')
+    parser.add_argument('--log-format', choices=LOG_FORMATS, default='text',
+                        help="'json' prints one JSON object per progress event instead of text (default: %(default)s)")
+    parser.add_argument('--metrics-report', default=RUN_REPORT_FILE,
+                        help='JSON run report with per-state, per-op and stage metrics (default: %(default)s)')
+    parser.add_argument('--prometheus-file', metavar='PATH',
+                        help='also write the run metrics for the node_exporter textfile collector, '
+                             'e.g. /var/lib/node_exporter/textfile/cannabis_tracker.prom')
+    parser.add_argument('--plan', action='store_true',
+                        help='print the scan plan and its estimated API requests, then exit without calling the API')
+    parser.add_argument('--budget', type=int, metavar='REQUESTS',
+                        help=f"max API requests for this run (default: what is left of the monthly quota "
+                             f"spread over the rest of the month, from {QUOTA_LEDGER_FILE})")
+    parser.add_argument('--no-budget', action='store_true',
+                        help='do not cap getBill calls (the run is still recorded in the ledger)')
+    parser.add_argument('--schedule', action='store_true',
+                        help=f'only scan jurisdictions due for a refresh in {REFRESH_SCHEDULE_FILE} and keep '
+                             'the bills of the others; intervals adapt to how often each one changes')
+    parser.add_argument('--bill-texts', action='store_true',
+                        help=f'also download the full-text documents of relevant bills (getBillText) into '
+                             f'{BILL_TEXT_DIR}/, skipping documents already held')
+    add_output_args(parser)
+    return parser.parse_args(argv)
 
-        <section class="stats">
-            <div class="stat-card">
-                <h4>Total Bills</h4>
-                <p class="stat-number">{total_bills}</p>
-            </div>
-            <div class="stat-card">
-                <h4>States Tracked</h4>
-                <p class="stat-number">{total_states}</p>
-            </div>
-            <div class="stat-card">
-                <h4>Active Bills</h4>
-                <p class="stat-number">{active_count}</p>
-            </div>
-            <div class="stat-card">
-                <h4>With Analysis</h4>
-                <p class="stat-number">{analyzed_count}</p>
-            </div>
-        </section>
+def save_outputs(bills, last_updated, page_size=None, virtual=None, db_path=BILL_DB_PATH, metrics=None):
+    """Sync the bills into the bill store, export bills.json and its columnar copy, and render index.html
 
-        <section class="bills-list">
-            <h2>Current Cannabis Bills</h2>
-            <div id="billsContainer">
-                {bill_cards_html}
-            </div>
-            <div id="noResults" class="no-results" style="display: none;">
-                <p>No bills found matching your criteria.</p>
-            </div>
-        </section>
-    </main>
+    Only new, changed and removed bills are written to the store; the site
+    is rendered from the store and the change feeds from the difference to
+    the previous bills. When the bills are unchanged the previous
+    last_updated is kept, so every output renders to the same bytes and no
+    file is rewritten. Stage timings go to ``metrics`` when given. Returns
+    the last_updated that was used.
+    """
+    metrics = metrics or RunMetrics()
+    with metrics.stage('store'), BillStore(db_path, state_order=STATES) as store:
+        seeded = store.import_snapshot('bills.json')
+        if seeded:
+            log('store_seeded', f"  Info: {db_path} seeded with {seeded} bills from bills.json", bills=seeded)
+        previous = store.bills()
+        result = store.sync(bills, last_updated)
+        if result.changed:
+            log('store_sync', f"  Info: {db_path}: {result}", **vars(result))
+        else:
+            log('store_sync', "  Info: No bill changed since the last run, existing outputs kept", **vars(result))
+        last_updated = store.last_updated
+        bills = store.bills()
+        
+        # Export JSON (for reference/backup)
+        store.export('bills.json')
+        write_columnar(COLUMNAR_FILE, bills, last_updated)
+    
+    with metrics.stage('feeds'):
+        # Nothing to diff against on the very first run: the feeds start empty
+        changes = diff_bills(previous, bills) if previous else []
+        write_feeds(changes, last_updated)
+    if changes:
+        log('feeds', f"  Info: {len(changes)} bill changes added to the {FEED_DIR}/ feeds", changes=len(changes))
+    
+    # Generate and save HTML
+    with metrics.stage('render'):
+        write_frontend(bills, last_updated, page_size=page_size, virtual=virtual)
+    return last_updated
 
-    <footer>
-        <div class="container">
-            <p>&copy; 2025 Dan K Reports. All rights reserved.</p>
-            <p>
-                <a href="https://dankreports.com/about" rel="noopener noreferrer">About</a> | 
-                <a href="https://www.cbdttheory.com" rel="noopener noreferrer">CBDT Framework</a> | 
-                <a href="/sitemap.xml">Sitemap</a>
-            </p>
-        </div>
-    </footer>
+def save_shard(bills, last_updated, index, count, states, scrape_state=None, prefilter=None, quota=None):
+    """Write one shard's partial result file"""
+    path = shard_file(index, count)
+    write_json_atomic(path, {
+        'last_updated': last_updated,
+        'shard': f'{index}/{count}',
+        'states': list(states),
+        'total_bills': len(bills),
+        'bills': bills,
+        'hashes': scrape_state.hashes_for(bills) if scrape_state is not None else {},
+        'denylist': prefilter.added if prefilter is not None else {},
+        'quota': quota or {}
+    }, indent=2, ensure_ascii=False)
+    return path
 
-    <script src="app.js"></script>
-</body>
-</html>
-'''
-    
-    return html
+def write_metrics(metrics, args):
+    """Write the run report (and the Prometheus textfile when asked); return the report"""
+    report = metrics.write_report(args.metrics_report)
+    if args.prometheus_file:
+        metrics.write_prometheus(args.prometheus_file)
+    return report
+
+def quota_usage(report, offline=False):
+    """The run's API requests and the jurisdictions it refreshed, as kept in the quota ledger"""
+    return {
+        'requests': report['api']['requests'],
+        'refreshed': [] if offline else [
+            state_code for state_code, counts in report['states'].items() if not counts.get('failed')
+        ],
+    }
+
+def record_quota(ledger, report, args):
+    """Add the run's requests to the quota ledger (shard runs leave this to merge_shards.py)"""
+    if args.shard:
+        return
+    usage = quota_usage(report, args.offline)
+    ledger.record(usage['requests'], states=usage['refreshed'])
+    ledger.save()
 
-def main():
+def main(argv=None):
     """Main function"""
+    args = parse_args(argv)
+    set_log_format(args.log_format)
+    metrics = RunMetrics()
+    
+    if args.incremental and args.backend == 'dataset':
+        log('info', "Info: --incremental is implied by the dataset backend (archives are cached by hash)")
+        args.incremental = False
+    
+    states = STATES
+    checkpoint_dir = args.checkpoint_dir
+    if args.shard:
+        states = shard_states(*args.shard)
+        checkpoint_dir = os.path.join(checkpoint_dir, 'shard-{}-of-{}'.format(*args.shard))
+    previous_bills = load_previous_bills('bills.json')
+    
+    # With --schedule only the jurisdictions that are due are scanned; the rest keep their bills
+    schedule = None
+    due = states
+    carried = {}
+    if args.schedule:
+        schedule = RefreshSchedule().load()
+        due = schedule.due(states)
+        for bill in previous_bills:
+            if bill.get('state_code') in states and bill.get('state_code') not in due:
+                carried.setdefault(bill.get('state_code'), []).append(bill)
+        log('schedule', f"Info: {len(due)} of {len(states)} jurisdictions due for a refresh "
+            f"({REFRESH_SCHEDULE_FILE})", due=len(due), states=len(states))
+        if not due:
+            upcoming = schedule.next_due(states)
+            log('schedule_idle', f"Info: Nothing to do until {upcoming[1]} ({upcoming[0]} is next)",
+                state=upcoming[0], next_due=upcoming[1])
+            return
+    
+    ledger = QuotaLedger().load()
+    budget = None
+    if not args.no_budget:
+        # Shards run side by side, so each gets its share of the day's allowance
+        budget = args.budget if args.budget is not None else ledger.daily_allowance() // (
+            args.shard[1] if args.shard else 1)
+    planner = None
+    if args.backend == 'search':
+        planner = ScanPlanner(ledger, previous_bills, load_last_report(args.metrics_report), budget)
+    
+    if args.plan:
+        if planner is None:
+            print("Info: --plan estimates the search backend; the dataset backend makes one getDatasetList "
+                  f"call per jurisdiction ({len(due)}) plus one getDataset per changed session")
+            return
+        print_plan(planner.plan(due, args.incremental), ledger, budget)
+        return
     
-    # Fetch bills
-    bills = fetch_all_bills()
+    scrape_state = ScrapeState().load() if args.incremental else None
+    text_store = BillTextStore().load() if args.bill_texts else None
+    prefilter = PreFilter(args.prefilter).load() if args.backend == 'search' else None
     
-    if not bills:
-        print("ERROR: No bills found")
+    cache = None
+    if args.offline or not args.no_cache:
+        ttls = {op: int(seconds) for op, seconds in (item.split('=', 1) for item in args.cache_ttl)}
+        cache = ResponseCache(args.cache_path, ttls=ttls, max_bytes=args.cache_max_mb * 1024 * 1024)
+    
+    checkpoint = None
+    if not args.no_checkpoint:
+        checkpoint = ScanCheckpoint(checkpoint_dir)
+        checkpoint.start(resume=args.resume, backend=args.backend, incremental=args.incremental)
+    
+    # Fetch bills
+    with metrics.stage('fetch'):
+        bills = fetch_all_bills(max_workers=args.workers, rate_limit=args.rate_limit,
+                                scrape_state=scrape_state, backend=args.backend,
+                                max_retries=args.retries, cache=cache, offline=args.offline,
+                                checkpoint=checkpoint, states=states, prefilter=prefilter,
+                                metrics=metrics, planner=planner, carried=carried,
+                                text_store=text_store, previous_bills=previous_bills)
+    if text_store is not None:
+        text_store.save()
+    
+    if not bills and not args.shard:
+        log('error', "ERROR: No bills found")
+        record_quota(ledger, write_metrics(metrics, args), args)
         return
     
     # Get timestamp
     last_updated = datetime.now().isoformat()
     
-    # Save JSON (for reference/backup)
-    with open('bills.json', 'w', encoding='utf-8') as f:
-        json.dump({
-            'last_updated': last_updated,
-            'total_bills': len(bills),
-            'bills': bills
-        }, f, indent=2, ensure_ascii=False)
-    
-    # Generate HTML
-    html_content = generate_html(bills, last_updated)
-    
-    # Save HTML
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print()
-    print("=" * 70)
-    print("SUCCESS!")
-    print("=" * 70)
-    print(f"Total bills: {len(bills)}")
-    print(f"Files generated:")
-    print("  - bills.json (data backup)")
-    print("  - index.html (SEO-optimized with pre-rendered content)")
-    print()
-    print(f"✅ Google can now crawl all {len(bills)} bills immediately!")
-    print()
+    if args.shard:
+        path = save_shard(bills, last_updated, *args.shard, states, scrape_state, prefilter,
+                          dict(quota_usage(metrics.report(), args.offline), scheduled=args.schedule))
+        outputs = [f"{path} (partial result)"]
+    else:
+        save_outputs(bills, last_updated, args.paginate, args.virtualize, args.bill_db, metrics)
+        outputs = [
+            f"{args.bill_db} (bill store and status history)",
+            "bills.json (data backup)",
+            f"{FEED_DIR}/*.atom and {FEED_DIR}/*.json (change feeds, entries kept in {FEED_ENTRIES_FILE})",
+        ] + html_outputs(args.paginate, args.virtualize)
+        if scrape_state is not None:
+            scrape_state.save()
+        if prefilter is not None and prefilter.mode != 'none':
+            prefilter.save()
+            outputs.append(f"{DENYLIST_FILE} (bills ruled irrelevant)")
+    
+    scan_complete = checkpoint is None or set(due) <= checkpoint.completed_states()
+    if checkpoint is not None and scan_complete:
+        checkpoint.finish()
+    
+    metrics.set_total('bills', len(bills))
+    if scrape_state is not None:
+        metrics.set_total('reused_bills', scrape_state.reused)
+    if prefilter is not None:
+        metrics.set_total('prefilter_saved_calls', prefilter.saved_calls)
+    if planner is not None:
+        metrics.set_total('deferred_bill_calls', planner.deferred)
+    if text_store is not None:
+        metrics.set_total('bill_texts_downloaded', text_store.downloaded)
+        outputs.append(f"{BILL_TEXT_DIR}/ ({text_store.stats()['docs']} bill text documents)")
+    report = write_metrics(metrics, args)
+    outputs.append(f"{args.metrics_report} (run metrics)")
+    record_quota(ledger, report, args)
+    outputs.append(f"{QUOTA_LEDGER_FILE} (API requests used this month)")
+    if schedule is not None and not args.shard:
+        schedule.update_all(quota_usage(report, args.offline)['refreshed'], previous_bills, bills)
+        schedule.save()
+        outputs.append(f"{REFRESH_SCHEDULE_FILE} (next refresh per jurisdiction)")
+    
+    echo()
+    echo("=" * 70)
+    echo("SUCCESS!")
+    echo("=" * 70)
+    echo(f"Total bills: {len(bills)}")
+    if scrape_state is not None:
+        echo(f"Unchanged bills reused (getBill calls saved): {scrape_state.reused}")
+    echo(f"API requests: {report['api']['requests']} ({report['api']['quota_percent']}% of the monthly quota, "
+         f"{ledger.used()} used this month)")
+    if planner is not None and planner.deferred:
+        echo(f"getBill calls deferred to a later run (budget {planner.budget}): {planner.deferred}")
+    echo(f"Files generated:")
+    for output in outputs:
+        echo(f"  - {output}")
+    echo()
+    if args.shard:
+        echo("Run merge_shards.py once every shard has finished to build bills.json and index.html")
+    else:
+        echo(f"✅ Google can now crawl all {len(bills)} bills immediately!")
+    if not scan_complete:
+        log('incomplete', "⚠️  Some jurisdictions failed - run again with --resume to fetch only those")
+    echo()
+    log('run_complete', bills=len(bills), complete=scan_complete,
+        duration_seconds=report['duration_seconds'], api_requests=report['api']['requests'])
 
 if __name__ == '__main__':
     main()
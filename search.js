@@ -0,0 +1,114 @@
+// Cannabis Legislation Tracker - Client-side search index
+// Answers searches from search-index.json (built by search_index.py) instead of scanning card text
+
+(function (root) {
+    // Must match tokenize() in search_index.py
+    function tokenize(text) {
+        if (!text) return [];
+        const folded = String(text).normalize('NFKD').replace(/[^\x00-\x7f]/g, '').toLowerCase();
+        return folded.match(/[a-z0-9]+/g) || [];
+    }
+
+    class SearchIndex {
+        constructor(data) {
+            this.ids = data.ids.map(String);
+            this.states = data.states;
+            this.statuses = data.statuses;
+            this.state = data.state;
+            this.status = data.status;
+            this.date = data.date;
+            this.tokens = data.tokens;
+
+            // Postings are shipped delta-encoded; decode once
+            this.postings = data.postings.map(deltas => {
+                const positions = new Uint32Array(deltas.length);
+                let position = 0;
+                for (let i = 0; i < deltas.length; i++) {
+                    position += deltas[i];
+                    positions[i] = position;
+                }
+                return positions;
+            });
+
+            this.positionById = new Map(this.ids.map((id, position) => [id, position]));
+        }
+
+        static async load(url) {
+            const response = await fetch(url);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status} loading ${url}`);
+            }
+            return new SearchIndex(await response.json());
+        }
+
+        get size() {
+            return this.ids.length;
+        }
+
+        // Index of the first token >= prefix
+        lowerBound(prefix) {
+            let lo = 0;
+            let hi = this.tokens.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >>> 1;
+                if (this.tokens[mid] < prefix) {
+                    lo = mid + 1;
+                } else {
+                    hi = mid;
+                }
+            }
+            return lo;
+        }
+
+        // Positions of bills containing every query word as a token prefix, or null for an empty query
+        search(query) {
+            const terms = [...new Set(tokenize(query))];
+            if (terms.length === 0) return null;
+
+            // hits[p] counts the terms matched so far; a bill survives term k only if it matched all before it
+            const hits = new Uint16Array(this.size);
+            for (let k = 0; k < terms.length; k++) {
+                const term = terms[k];
+                for (let t = this.lowerBound(term); t < this.tokens.length && this.tokens[t].startsWith(term); t++) {
+                    const positions = this.postings[t];
+                    for (let i = 0; i < positions.length; i++) {
+                        if (hits[positions[i]] === k) hits[positions[i]] = k + 1;
+                    }
+                }
+            }
+
+            const matches = [];
+            for (let p = 0; p < hits.length; p++) {
+                if (hits[p] === terms.length) matches.push(p);
+            }
+            return matches;
+        }
+
+        // Ids matching the search box and the state/status filters, most recent first
+        filter({ query = '', state = 'all', status = 'all' } = {}) {
+            const allowedState = this.states.map(([code, name]) =>
+                state === 'all' || (state === 'US' && code === 'US') || name === state
+            );
+            const allowedStatus = this.statuses.map(label =>
+                status === 'all' || label.toLowerCase().includes(status)
+            );
+
+            const positions = this.search(query);
+            const ids = [];
+            const count = positions ? positions.length : this.size;
+            for (let i = 0; i < count; i++) {
+                const p = positions ? positions[i] : i;
+                if (allowedState[this.state[p]] && allowedStatus[this.status[p]]) {
+                    ids.push(this.ids[p]);
+                }
+            }
+            return ids;
+        }
+    }
+
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = { SearchIndex, tokenize };
+    } else {
+        root.SearchIndex = SearchIndex;
+    }
+})(this);
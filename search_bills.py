@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Bill search - ranked (BM25) full-text queries against the bill store's FTS5
+index, with state, region, status and date filters. Queries use FTS5
+syntax: words, "exact phrases", OR, NOT, prefix* and column:word.
+
+Usage: python search_bills.py "280E OR banking" --active --region south [--since 2025-01-01]
+"""
+
+import sys
+import json
+import time
+import argparse
+
+from bill_db import BillStore, BILL_DB_PATH
+from quota import TERMINAL_STATUS_CODES
+
+# US Census Bureau regions (DC is not tracked)
+REGIONS = {
+    'northeast': ('CT', 'ME', 'MA', 'NH', 'RI', 'VT', 'NJ', 'NY', 'PA'),
+    'midwest': ('IL', 'IN', 'MI', 'OH', 'WI', 'IA', 'KS', 'MN', 'MO', 'NE', 'ND', 'SD'),
+    'south': ('DE', 'FL', 'GA', 'MD', 'NC', 'SC', 'VA', 'WV', 'AL', 'KY', 'MS', 'TN', 'AR', 'LA', 'OK', 'TX'),
+    'west': ('AZ', 'CO', 'ID', 'MT', 'NV', 'NM', 'UT', 'WY', 'AK', 'CA', 'HI', 'OR', 'WA'),
+}
+
+
+def state_codes(args):
+    """State codes from --state (comma-separated, repeatable) and --region"""
+    codes = [code.strip().upper() for value in args.state for code in value.split(',') if code.strip()]
+    for region in args.region:
+        codes.extend(REGIONS[region])
+    return codes or None
+
+
+def main(argv=None):
+    """Main function - query the full-text index"""
+    parser = argparse.ArgumentParser(description='Search the bill store (SQLite FTS5, BM25 ranking)')
+    parser.add_argument('query', help='FTS5 query, e.g. \'280E OR banking\' or \'"safe harbor" NOT hemp\'')
+    parser.add_argument('--db', default=BILL_DB_PATH, help='bill store (default: %(default)s)')
+    parser.add_argument('--state', action='append', default=[], metavar='CODES',
+                        help='only these state codes, e.g. CA,NY (repeatable)')
+    parser.add_argument('--region', action='append', default=[], choices=sorted(REGIONS),
+                        help='only the states of a Census region (repeatable)')
+    parser.add_argument('--status', action='append', type=int, default=[], metavar='CODE',
+                        help='only this LegiScan status code (repeatable)')
+    parser.add_argument('--active', action='store_true',
+                        help='leave out enacted, vetoed and failed bills')
+    parser.add_argument('--since', metavar='YYYY-MM-DD', help='last action (or status) on or after this day')
+    parser.add_argument('--until', metavar='YYYY-MM-DD', help='last action (or status) on or before this day')
+    parser.add_argument('--limit', type=int, default=20, help='max results (default: %(default)s)')
+    parser.add_argument('--json', action='store_true', help='print the matching bills as JSON')
+    args = parser.parse_args(argv)
+
+    with BillStore(args.db) as store:
+        if not len(store):
+            print(f"❌ ERROR: {args.db} holds no bills - run scraper.py first")
+            return 1
+        start = time.perf_counter()
+        results = store.search(args.query, state_codes(args), args.status or None, args.since, args.until,
+                               sorted(TERMINAL_STATUS_CODES) if args.active else None, args.limit)
+        elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps([dict(bill, score=score) for bill, score, _ in results], indent=2, ensure_ascii=False))
+        return 0
+
+    for bill, score, snippet in results:
+        print(f"{score:>8}  {bill.get('state_code', ''):<3} {bill.get('bill_number', ''):<10} "
+              f"{bill.get('status', ''):<20} {bill.get('last_action_date') or bill.get('status_date') or '':<10}  "
+              f"{bill.get('title', '')[:70]}")
+        print(f"{'':>10}{snippet}")
+    print(f"{len(results)} bills in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
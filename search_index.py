@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Client-side search index - built next to index.html so app.js can answer a
+search from an inverted token -> bill postings list instead of scanning
+every card's textContent. Bills are stored in page order (most recent
+first) with state, status and date as compact columns; search.js holds the
+matching query code.
+"""
+
+import re
+import unicodedata
+
+from output_files import write_json_atomic
+from render import sort_bills
+
+SEARCH_INDEX_FILE = 'search-index.json'
+SEARCH_INDEX_VERSION = 1
+
+# Must match tokenize() in search.js
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Lowercase ASCII-folded alphanumeric runs, e.g. 'Peña H.B. 12' -> pena, h, b, 12"""
+    if not text:
+        return []
+    folded = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return _TOKEN_RE.findall(folded.lower())
+
+
+def bill_tokens(bill):
+    """Distinct tokens of the text shown on a bill card"""
+    sponsors = ' '.join(
+        f"{s.get('name', '')} {s.get('party') or ''}" for s in bill.get('sponsors', [])
+    )
+    tokens = set(tokenize(' '.join(str(bill.get(field) or '') for field in (
+        'state_name', 'state_code', 'bill_number', 'title', 'description', 'status'
+    )) + ' ' + sponsors))
+    # 'HB 1234' and 'H.B.1234' can also be searched as 'hb1234'
+    compact = ''.join(tokenize(bill.get('bill_number')))
+    if compact:
+        tokens.add(compact)
+    return tokens
+
+
+def date_key(bill):
+    """YYYYMMDD of the card date as an int, 0 when unknown"""
+    date = (bill.get('last_action_date') or bill.get('status_date') or '')[:10]
+    digits = date.replace('-', '')
+    return int(digits) if len(digits) == 8 and digits.isdigit() else 0
+
+
+def build_search_index(bills, last_updated=None):
+    """Build the index dict; postings are delta-encoded bill positions"""
+    ordered = sort_bills(bills)
+    state_table, status_table, postings = {}, {}, {}
+    states, statuses, dates = [], [], []
+
+    for position, bill in enumerate(ordered):
+        state = (bill.get('state_code') or '', bill.get('state_name') or '')
+        states.append(state_table.setdefault(state, len(state_table)))
+        statuses.append(status_table.setdefault(bill.get('status') or '', len(status_table)))
+        dates.append(date_key(bill))
+        for token in bill_tokens(bill):
+            postings.setdefault(token, []).append(position)
+
+    tokens = sorted(postings)
+    encoded = []
+    for token in tokens:
+        previous, deltas = 0, []
+        for position in postings[token]:
+            deltas.append(position - previous)
+            previous = position
+        encoded.append(deltas)
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'last_updated': last_updated,
+        'ids': [bill.get('id') for bill in ordered],
+        'states': [list(state) for state in state_table],
+        'statuses': list(status_table),
+        'state': states,
+        'status': statuses,
+        'date': dates,
+        'tokens': tokens,
+        'postings': encoded,
+    }
+
+
+def write_search_index(path, bills, last_updated=None):
+    """Build the index and write it as compact JSON"""
+    index = build_search_index(bills, last_updated)
+    write_json_atomic(path, index, separators=(',', ':'), ensure_ascii=False)
+    return index
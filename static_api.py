@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Static JSON API - the bills split into minified shards under api/v1/, one
+per jurisdiction (states/<code>.json) and one per LegiScan status code
+(status/<code>.json), each with precompressed siblings, plus an index.json
+manifest with every shard's count and sha256. Consumers fetch the manifest
+and only download the shards whose hash changed. Shards hold no timestamp,
+so a shard's bytes (and hash) only change when its bills do.
+"""
+
+import os
+import glob
+import json
+import hashlib
+
+from build_dist import write_with_siblings
+from metrics import log
+from output_files import write_if_changed
+
+API_DIR = 'api/v1'
+API_VERSION = 1
+API_MANIFEST_FILE = 'index.json'
+
+
+def _minified(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def group_bills(bills):
+    """({state_code: [bills]}, {status_code: [bills]}), each list in bills.json order"""
+    by_state, by_status = {}, {}
+    for bill in bills:
+        by_state.setdefault(bill.get('state_code') or 'unknown', []).append(bill)
+        by_status.setdefault(bill.get('status_code') or 0, []).append(bill)
+    return by_state, by_status
+
+
+def api_file(out_dir, url_path):
+    return os.path.join(out_dir, *url_path.split('/'))
+
+
+def write_shard(out_dir, url_path, data):
+    """Write one minified shard and its siblings; return its manifest entry, the files and whether it changed"""
+    payload = _minified(data)
+    path = api_file(out_dir, url_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sizes, changed = write_with_siblings(path, payload)
+    files = [path] + [f'{path}.{ext}' for ext in ('gz', 'br') if sizes[ext] is not None]
+    return {
+        'url': url_path,
+        'count': len(data['bills']),
+        'bytes': len(payload),
+        'sha256': hashlib.sha256(payload).hexdigest(),
+    }, files, changed
+
+
+def remove_stale_api_shards(out_dir, written):
+    """Delete shards and siblings the current bills no longer produce"""
+    removed = 0
+    for folder in ('states', 'status'):
+        for path in glob.glob(os.path.join(api_file(out_dir, API_DIR), folder, '*.json*')):
+            if os.path.abspath(path) not in written:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def write_api(bills, last_updated, out_dir='.'):
+    """Write every shard and the manifest; return the number of shards rewritten"""
+    by_state, by_status = group_bills(bills)
+    manifest = {
+        'version': API_VERSION,
+        'last_updated': last_updated,
+        'total_bills': len(bills),
+        'states': {},
+        'status': {},
+    }
+    written = set()
+    changed = 0
+
+    for code, state_bills in sorted(by_state.items()):
+        url_path = f'{API_DIR}/states/{code.lower()}.json'
+        entry, files, shard_changed = write_shard(out_dir, url_path, {
+            'state_code': code,
+            'state_name': state_bills[0].get('state_name', ''),
+            'bills': state_bills,
+        })
+        manifest['states'][code] = dict(entry, state_name=state_bills[0].get('state_name', ''))
+        written.update(os.path.abspath(path) for path in files)
+        changed += shard_changed
+
+    for code, status_bills in sorted(by_status.items()):
+        url_path = f'{API_DIR}/status/{code}.json'
+        entry, files, shard_changed = write_shard(out_dir, url_path, {
+            'status_code': code,
+            'status': status_bills[0].get('status', 'Unknown'),
+            'bills': status_bills,
+        })
+        manifest['status'][str(code)] = dict(entry, status=status_bills[0].get('status', 'Unknown'))
+        written.update(os.path.abspath(path) for path in files)
+        changed += shard_changed
+
+    removed = remove_stale_api_shards(out_dir, written)
+    if removed:
+        log('stale_removed', f"  Info: Removed {removed} stale API shard files", files=removed)
+
+    # The manifest is small and re-fetched every time, so it has no compressed sibling
+    write_if_changed(api_file(out_dir, f'{API_DIR}/{API_MANIFEST_FILE}'), _minified(manifest))
+    return changed
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+A bill whose getBillText download fails partway must not be marked as
+checked, so the next run fetches its missing documents.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bill_texts import BillTextStore
+from legiscan_client import LegiScanClient, LegiScanError
+from mock_legiscan import MockLegiScan
+
+
+class FailedTextDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.mock = MockLegiScan(latency=0, bills_per_state=1)
+        self.client = LegiScanClient('test', base_url=self.mock.start(), max_retries=0)
+        self.bill_id = min(self.mock.bills)
+        self.texts = self.mock.bills[self.bill_id]['texts']
+
+    def tearDown(self):
+        self.client.close()
+        self.mock.stop()
+        self.workdir.cleanup()
+
+    def test_failed_download_is_retried(self):
+        store = BillTextStore(self.workdir.name).load()
+        # The amended version is not served: getBillText answers with an API error
+        amended = self.texts[-1]['doc_id']
+        held = self.mock.texts.pop(amended)
+        with self.assertRaises(LegiScanError):
+            store.fetch_texts(self.bill_id, self.texts, self.client)
+        store.save()
+
+        store = BillTextStore(self.workdir.name).load()
+        self.assertFalse(store.has_bill(self.bill_id))
+        self.assertEqual(len(store.texts_for(self.bill_id)), 1)
+
+        self.mock.texts[amended] = held
+        self.assertEqual(store.fetch_texts(self.bill_id, self.texts, self.client), 1)
+        store.save()
+
+        store = BillTextStore(self.workdir.name).load()
+        self.assertTrue(store.has_bill(self.bill_id))
+        self.assertEqual([doc['doc_id'] for doc in store.texts_for(self.bill_id)],
+                         [str(doc['doc_id']) for doc in self.texts])
+
+    def test_bill_without_texts_is_checked(self):
+        store = BillTextStore(self.workdir.name).load()
+        self.assertEqual(store.fetch_texts(self.bill_id, [], self.client), 0)
+        self.assertTrue(store.has_bill(self.bill_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
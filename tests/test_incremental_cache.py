@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+A bill that changes between two incremental runs inside the getBill cache
+TTL must be fetched again, not served from the response cache under its
+new change_hash.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from incremental import ScrapeState
+from legiscan_client import LegiScanClient
+from mock_legiscan import MockLegiScan
+from response_cache import ResponseCache
+from scraper import fetch_bills_for_state
+
+
+class ChangedBillTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.mock = MockLegiScan(latency=0, bills_per_state=4)
+        base_url = self.mock.start()
+        # getSearch is not cached, as if its 1h TTL ran out while getBill's 6h did not
+        self.cache = ResponseCache(os.path.join(self.workdir.name, 'cache.sqlite'), ttls={'getSearch': 0})
+        self.client = LegiScanClient('test', base_url=base_url, max_retries=0, cache=self.cache)
+
+    def tearDown(self):
+        self.client.close()
+        self.mock.stop()
+        self.workdir.cleanup()
+
+    def scan(self, scrape_state):
+        bills = fetch_bills_for_state('AL', 'Alabama', self.client, scrape_state=scrape_state)
+        return {bill['id']: bill for bill in bills}
+
+    def test_changed_bill_is_refetched_inside_ttl(self):
+        first_state = ScrapeState(os.path.join(self.workdir.name, 'state.json'),
+                                  os.path.join(self.workdir.name, 'bills.json'))
+        first = self.scan(first_state)
+        bill_calls = self.mock.calls['getBill']
+        bill_id = min(first)
+        self.assertEqual(first[bill_id]['status_code'], 1)
+
+        self.mock.bills[bill_id].update(status=6, change_hash='changed', last_action_date='2025-05-20')
+
+        second_state = ScrapeState(first_state.state_path, first_state.snapshot_path)
+        second_state.hashes = dict(first_state.new_hashes)
+        second_state.previous_bills = {str(key): bill for key, bill in first.items()}
+        second = self.scan(second_state)
+
+        self.assertEqual(second[bill_id]['status_code'], 6)
+        self.assertEqual(second[bill_id]['last_action_date'], '2025-05-20')
+        self.assertEqual(second_state.new_hashes[str(bill_id)], 'changed')
+        # The other bills are still reused or served from the cache
+        self.assertEqual(self.mock.calls['getBill'], bill_calls + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+// Cannabis Legislation Tracker - Virtualized bill list
+// Loaded by app.js when billsContainer has data-virtual: cards are built from the
+// compact payload (card_payload.py) and only blocks near the viewport are mounted
+
+// Cards per block; blocks are mounted and unmounted as a unit
+const VIRTUAL_BLOCK_SIZE = 20;
+
+// Height reserved for a block that has never been mounted
+const ESTIMATED_CARD_HEIGHT = 320;
+
+// How far outside the viewport blocks are kept mounted
+const VIRTUAL_ROOT_MARGIN = '1500px 0px';
+
+function escapeHtml(text) {
+    if (text === null || text === undefined || text === '') return '';
+    return String(text)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
+// Payload rows -> objects keyed by the payload's field names
+function payloadRows(payload) {
+    const fields = payload.fields;
+    return payload.rows.map(values => {
+        const row = {};
+        fields.forEach((field, i) => { row[field] = values[i]; });
+        return row;
+    });
+}
+
+// Same markup as generate_bill_card_html in render.py
+function renderCard(row) {
+    const badgeClass = row.state_code === 'US' ? 'state-badge-federal' : 'state-badge-state';
+
+    let sponsorsHtml = '';
+    if (row.sponsors.length) {
+        const tags = row.sponsors.map(name => `<span class="sponsor-tag">${escapeHtml(name)}</span>`);
+        if (row.more_sponsors) tags.push(`<span class="sponsor-tag">+${row.more_sponsors} more</span>`);
+        sponsorsHtml = `
+            <div class="bill-sponsors">
+                <strong>Sponsors:</strong>
+                <div class="sponsor-list">${tags.join(' ')}</div>
+            </div>`;
+    }
+
+    const analysisBtn = row.analysis_url
+        ? `<a href="${escapeHtml(row.analysis_url)}" target="_blank" rel="noopener noreferrer" class="btn btn-analysis">Read BMDE Analysis</a>`
+        : '<span class="btn btn-disabled" title="Analysis coming soon">Analysis Pending</span>';
+
+    const template = document.createElement('template');
+    template.innerHTML = `
+        <article class="bill-card" data-id="${escapeHtml(row.id)}" data-state="${escapeHtml(row.state_name)}" data-state-code="${escapeHtml(row.state_code)}" data-status="${escapeHtml(row.status)}" data-date="${escapeHtml(row.date)}">
+            <div class="bill-header">
+                <div class="bill-title">
+                    <div class="bill-meta-top">
+                        <span class="state-badge ${badgeClass}">${escapeHtml(row.state_name)}</span>
+                        <span class="bill-number">${escapeHtml(row.bill_number)}</span>
+                    </div>
+                    <h3>${escapeHtml(row.title)}</h3>
+                </div>
+                <div class="bill-status ${row.status_class}">${escapeHtml(row.status)}</div>
+            </div>
+            <p class="bill-description">${escapeHtml(row.description)}</p>
+            <div class="bill-meta">
+                <div class="bill-meta-item">
+                    <strong>Last Action:</strong> ${escapeHtml(row.last_action)}
+                </div>
+            </div>
+            ${sponsorsHtml}
+            <div class="bill-actions">
+                <a href="${escapeHtml(row.url)}" target="_blank" rel="noopener noreferrer" class="btn btn-secondary">View on LegiScan</a>
+                ${analysisBtn}
+            </div>
+        </article>`;
+    return template.content.firstElementChild;
+}
+
+// A filter/sort entry (see createEntry in app.js) whose card is built on first mount
+function entryFromRow(row) {
+    return {
+        card: null,
+        row,
+        id: String(row.id),
+        stateCode: row.state_code,
+        state: row.state_name,
+        status: row.status.toLowerCase(),
+        date: Date.parse(row.date) || 0,
+        number: row.bill_number,
+        text: [row.state_name, row.bill_number, row.title, row.status, row.description,
+            row.last_action, ...row.sponsors].join(' ').toLowerCase()
+    };
+}
+
+class VirtualList {
+    constructor(container) {
+        this.container = container;
+        this.blocks = new Map();  // block element -> block
+        this.observer = new IntersectionObserver(
+            changes => changes.forEach(change => this.update(change)),
+            { rootMargin: VIRTUAL_ROOT_MARGIN }
+        );
+    }
+
+    // Show these entries, in order; only blocks near the viewport get real cards
+    setEntries(entries) {
+        this.observer.disconnect();
+        this.blocks.clear();
+
+        const fragment = document.createDocumentFragment();
+        for (let start = 0; start < entries.length; start += VIRTUAL_BLOCK_SIZE) {
+            const block = {
+                entries: entries.slice(start, start + VIRTUAL_BLOCK_SIZE),
+                element: document.createElement('div'),
+                mounted: false
+            };
+            block.element.className = 'bill-block';
+            block.element.style.height = `${block.entries.length * ESTIMATED_CARD_HEIGHT}px`;
+            this.blocks.set(block.element, block);
+            fragment.appendChild(block.element);
+        }
+        this.container.replaceChildren(fragment);
+        this.blocks.forEach((block, element) => this.observer.observe(element));
+    }
+
+    update(change) {
+        const block = this.blocks.get(change.target);
+        if (!block) return;
+        if (change.isIntersecting && !block.mounted) {
+            const fragment = document.createDocumentFragment();
+            for (const entry of block.entries) {
+                if (!entry.card) entry.card = renderCard(entry.row);
+                fragment.appendChild(entry.card);
+            }
+            block.element.replaceChildren(fragment);
+            block.element.style.height = '';
+            block.mounted = true;
+        } else if (!change.isIntersecting && block.mounted) {
+            // Keep the measured height so the scroll position does not jump
+            block.element.style.height = `${block.element.offsetHeight}px`;
+            block.element.replaceChildren();
+            block.mounted = false;
+        }
+    }
+}